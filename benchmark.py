@@ -0,0 +1,384 @@
+#! /usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Offline benchmarks for c3speakers.py.
+
+Generates synthetic Fahrplans (speakers page + one profile page per
+speaker, every third one linking to Twitter) of increasing size, serves
+them from a local stand-in HTTP server and measures:
+- end-to-end wall time + requests/sec of crawling a congress
+- time per page of find_speakers and parse_speaker_profile
+- time to the first speaker streamed by iter_speakers
+- DB write throughput of db_write
+- time of compare_values
+- peak RSS of each run
+
+Every size is benchmarked in a process of its own so the peak RSS
+belongs to that size only. Results are written as JSON, so runs for
+different commits can be compared.
+
+Usage:
+python3 benchmark.py [-s] <size[,size...]> [-o] <file> [-w] <workers>
+"""
+
+import sys
+import getopt
+import os
+import json
+import time
+import shutil
+import socket
+import tempfile
+import platform
+import resource
+import subprocess
+import threading
+import contextlib
+import multiprocessing
+from queue import Empty
+from datetime import datetime
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import c3speakers
+
+# no. of speakers of the Fahrplans benchmarked by default
+SIZES = (100, 1000, 10000)
+# max. no. of profiles fetched one by one to time parse_speaker_profile
+PROFILE_SAMPLE = 1000
+
+SPEAKERS_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>32C3: Speakers</title>
+</head>
+<body>
+<div id="main">
+<h2>Speakers</h2>
+<table class="list">
+{rows}
+</table>
+</div>
+</body>
+</html>
+"""
+
+SPEAKER_ROW = """<tr>
+<td><a href="/2015/Fahrplan/speakers/{id}.html"><img alt="Speaker {id}" \
+src="/2015/Fahrplan/system/people/avatars/{id}.png"></a></td>
+<td><a href="/2015/Fahrplan/speakers/{id}.html">Speaker {id}</a></td>
+</tr>"""
+
+PROFILE_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>32C3: Speaker {id}</title>
+</head>
+<body>
+<div id="main">
+<h2>Speaker {id}</h2>
+<p>Speaker {id} hacks things.</p>
+<h3>Links:</h3>
+<ul class="links">
+<li><a href="https://speaker{id}.example.org/">Blog</a></li>
+{twitter}</ul>
+</div>
+</body>
+</html>
+"""
+
+TWITTER_LINK = """<li><a href="https://twitter.com/speaker{id}">Twitter</a>\
+</li>
+"""
+
+
+def usage():
+    howto = ("Usage: python3 {} "
+             "[-s] <size[,size...]> "
+             "[-o] <file> "
+             "[-w] <workers>".format(sys.argv[0]))
+    return howto
+
+
+def make_fahrplan(root, size, twitter_every=3):
+    """Write a synthetic Fahrplan with the given no. of speakers.
+    :param root: directory to write the Fahrplan to
+    :param size: no. of speakers
+    :param twitter_every: every how-many-th speaker links to Twitter
+    :return: path of the Fahrplan directory
+    """
+    fahrplan = os.path.join(root, '2015', 'Fahrplan')
+    speakers_dir = os.path.join(fahrplan, 'speakers')
+    os.makedirs(speakers_dir, exist_ok=True)
+    speaker_ids = range(1, size + 1)
+    with open(os.path.join(fahrplan, 'speakers.html'), 'w',
+              encoding='utf-8') as page:
+        page.write(SPEAKERS_PAGE.format(rows="\n".join(
+            SPEAKER_ROW.format(id=speaker_id) for speaker_id in speaker_ids)))
+    for speaker_id in speaker_ids:
+        twitter = ''
+        if speaker_id % twitter_every == 0:
+            twitter = TWITTER_LINK.format(id=speaker_id)
+        with open(os.path.join(speakers_dir, '{}.html'.format(speaker_id)),
+                  'w', encoding='utf-8') as page:
+            page.write(PROFILE_PAGE.format(id=speaker_id, twitter=twitter))
+    return fahrplan
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Serves the synthetic Fahrplan over kept-alive connections."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # headers and body are sent separately; without this, every
+        # response waits for the client's delayed ACK
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def fahrplan_server(root):
+    """Serve a directory on a free local port for the duration of a with.
+    :param root: directory to serve
+    :return: base URL of the server
+    """
+    def handler(*args, **kwargs):
+        return QuietHandler(*args, directory=root, **kwargs)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield "http://127.0.0.1:{}/".format(server.server_port)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def timed(func, *args, **kwargs):
+    """Call a function without its output.
+    :return: the function's result + seconds the call took
+    """
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        return result, time.perf_counter() - started
+
+
+def bench_size(size, workers=8):
+    """Run all benchmarks for a Fahrplan of the given size.
+    :param size: no. of speakers
+    :param workers: no. of profiles fetched at the same time
+    :return: dictionary of results
+    """
+    root = tempfile.mkdtemp(prefix='c3bench')
+    results = {'speakers': size}
+    try:
+        make_fahrplan(root, size)
+        dir_path = "{}/".format(root)
+        with fahrplan_server(root) as base_url:
+            speakers_base_url = "{}2015/Fahrplan/".format(base_url)
+            client = c3speakers.FetchClient(pool_size=workers)
+            limiter = c3speakers.RateLimiter(0)
+
+            # find_speakers: parse the speakers page
+            html, _ = timed(c3speakers.open_website,
+                            "{}speakers.html".format(speakers_base_url),
+                            client=client)
+            speakers, seconds = timed(c3speakers.find_speakers, html)
+            assert len(speakers) == size
+            results['find_speakers'] = {'seconds': seconds}
+
+            # iter_speakers: first speaker while the page is downloaded
+            with open(os.devnull, 'w') as devnull, \
+                    contextlib.redirect_stdout(devnull):
+                started = time.perf_counter()
+                records = c3speakers.iter_speakers(
+                    c3speakers.open_website(
+                        "{}speakers.html".format(speakers_base_url),
+                        client=client, stream=True))
+                next(records)
+                first = time.perf_counter() - started
+                listed = 1 + sum(1 for record in records)
+                seconds = time.perf_counter() - started
+            assert listed == size
+            results['iter_speakers'] = {'seconds': seconds,
+                                        'first_speaker_seconds': first}
+
+            # parse_speaker_profile: fetch + parse profiles one by one
+            started = time.perf_counter()
+            parsed = 0
+            with open(os.devnull, 'w') as devnull, \
+                    contextlib.redirect_stdout(devnull):
+                for speaker_id in list(speakers)[:PROFILE_SAMPLE]:
+                    c3speakers.parse_speaker_profile(
+                        "{}speakers/{}.html".format(speakers_base_url,
+                                                    speaker_id),
+                        client=client)
+                    parsed += 1
+            seconds = time.perf_counter() - started
+            results['parse_speaker_profile'] = {
+                'pages': parsed, 'seconds': seconds,
+                'seconds_per_page': seconds / parsed}
+
+            # end to end: crawl the congress with concurrent fetchers
+            c3speakers.metrics().reset()
+            requests_before = client.requests
+            crawler = c3speakers.Crawler(dir_path, 'speakers', 'speakers',
+                                         client, limiter, workers=workers,
+                                         source='html')
+            summary, seconds = timed(crawler.congress, 2015, 32,
+                                     speakers_base_url=speakers_base_url,
+                                     file_ending='.html')
+            requests = client.requests - requests_before
+            parse = c3speakers.metrics().to_dict()['histograms'].get(
+                'parse_seconds{page="profile"}', {'sum': 0, 'count': 0})
+            results['end_to_end'] = {
+                'seconds': seconds, 'requests': requests,
+                'requests_per_second': requests / seconds,
+                'twitters': summary['twitters'],
+                'parse_seconds_per_page':
+                    parse['sum'] / parse['count'] if parse['count'] else None}
+            client.close()
+            c3speakers.db_close()
+
+        # db_write: speakers + handles into a new DB
+        twitters = {speaker_id: "speaker{}".format(speaker_id)
+                    for speaker_id in speakers}
+        db = c3speakers.db_connect(dir_path, 'bench', 'speakers', 2015)
+        _, seconds_speakers = timed(c3speakers.db_write, dir_path, db,
+                                    'speakers', speakers=speakers)
+        _, seconds_twitters = timed(c3speakers.db_write, dir_path, db,
+                                    'speakers', twitter=twitters)
+        rows = len(speakers) + len(twitters)
+        results['db_write'] = {
+            'rows': rows, 'seconds': seconds_speakers + seconds_twitters,
+            'rows_per_second': rows / (seconds_speakers + seconds_twitters)}
+
+        # compare_values: DB values against a changed Fahrplan
+        db_values = c3speakers.db_query(dir_path, db, 'speakers',
+                                        column='name')
+        new_values = {speaker_id: name for speaker_id, name
+                      in speakers.items() if int(speaker_id) % 10}
+        new_values.update({speaker_id: name + ' (renamed)' for speaker_id,
+                           name in speakers.items()
+                           if int(speaker_id) % 10 == 5})
+        _, seconds = timed(c3speakers.compare_values, db_values, new_values)
+        results['compare_values'] = {'seconds': seconds}
+        c3speakers.db_close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    # peak RSS of this process (KB on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak //= 1024
+    results['peak_rss_kb'] = peak
+    return results
+
+
+def bench_worker(size, workers, queue):
+    # a size which fails is reported instead of leaving run() waiting
+    try:
+        results = bench_size(size, workers=workers)
+    except Exception as err:
+        results = {'speakers': size,
+                   'error': "{}: {}".format(type(err).__name__, err)}
+    queue.put(results)
+
+
+def bench_result(size, process, queue):
+    """Wait for the results of a size, unless its process died first.
+    :param size: no. of speakers of the Fahrplan benchmarked
+    :param process: process benchmarking the size (see bench_worker)
+    :param queue: queue the process puts its results on
+    """
+    while True:
+        try:
+            return queue.get(timeout=1)
+        except Empty:
+            if not process.is_alive():
+                return {'speakers': size,
+                        'error': "Benchmark process exited with code "
+                                 "{}".format(process.exitcode)}
+
+
+def run(sizes=SIZES, workers=8):
+    """Benchmark all sizes, each in a fresh process.
+    :param sizes: no. of speakers of the Fahrplans to benchmark
+    :param workers: no. of profiles fetched at the same time
+    :return: dictionary of results, incl. the commit benchmarked
+    """
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    runs = []
+    for size in sizes:
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=bench_worker,
+                                          args=(size, workers, queue))
+        process.start()
+        runs.append(bench_result(size, process, queue))
+        process.join()
+    return {'commit': commit, 'python': platform.python_version(),
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'workers': workers, 'runs': runs}
+
+
+def main():
+    sizes = SIZES
+    output = None
+    workers = 8
+
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], 's:o:w:h',
+                                   ['sizes=', 'output=', 'workers=', 'help'])
+    except getopt.GetoptError as err:
+        print(err)
+        print(usage())
+        sys.exit(1)
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):
+            print(usage())
+            sys.exit(1)
+        elif opt in ('-s', '--sizes'):
+            try:
+                sizes = [int(size) for size in arg.split(',')]
+            except ValueError:
+                print("ERROR: Sizes need to be comma-separated integers:\n"
+                      "{}".format(arg))
+                sys.exit(1)
+        elif opt in ('-o', '--output'):
+            output = arg
+        elif opt in ('-w', '--workers'):
+            try:
+                workers = int(arg)
+                if workers < 1:
+                    raise ValueError(arg)
+            except ValueError:
+                print("ERROR: Number of workers needs to be a positive "
+                      "integer:\n{}".format(arg))
+                sys.exit(1)
+
+    results = json.dumps(run(sizes, workers=workers), indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as results_file:
+            results_file.write(results + "\n")
+    else:
+        print(results)
+
+
+if __name__ == "__main__":
+    main()
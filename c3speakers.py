@@ -29,16 +29,145 @@ https://en.wikipedia.org/wiki/Chaos_Communication_Congress
 
 import sys
 import getopt
-import requests
+import codecs
+import importlib.util
 import re
 import os.path
+import json
 import sqlite3
 import configparser
-from urllib.request import urlopen
 import urllib.error
+import urllib.parse
 import time
+import random
+import functools
+import itertools
+import collections
+import collections.abc
+import array
+import contextlib
+import threading
+import types
 from datetime import date
-from bs4 import BeautifulSoup, SoupStrainer
+from html.parser import HTMLParser
+
+
+# modules imported lazily may be used by several threads at once
+_lazy_import_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module which imports it on first use of one of its
+    attributes. Unlike importlib's LazyLoader (before Python 3.12), this is
+    safe when several threads use the module for the first time at once.
+    """
+
+    def __getattr__(self, attr):
+        module = self.__dict__.get('_module')
+        if module is None:
+            with _lazy_import_lock:
+                module = importlib.import_module(self.__name__)
+            self._module = module
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """
+    Import a module on first use of one of its attributes.
+
+    HTTP, html parsing and asyncio take most of the time of starting the
+    script; this way, paths like -h or checking a year never load them.
+    :param name: name of the module
+    :return: the module (loaded on first use), or None if not installed
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    try:
+        spec = importlib.util.find_spec(name)
+    # the module's parent package isn't installed
+    except ImportError:
+        return None
+    if spec is None:
+        return None
+    return LazyModule(name)
+
+
+requests = lazy_import('requests')
+urllib3 = lazy_import('urllib3')
+urllib_request = lazy_import('urllib.request')
+bs4 = lazy_import('bs4')
+asyncio = lazy_import('asyncio')
+ElementTree = lazy_import('xml.etree.ElementTree')
+concurrent_futures = lazy_import('concurrent.futures')
+email_utils = lazy_import('email.utils')
+# lxml is optional; it's the fastest html extraction engine if installed
+lxml_html = lazy_import('lxml.html')
+
+# Fahrplan URLs/files need to:
+# - contain a year YYYY or C3 shortcut
+# - contain the folder /Fahrplan/
+# - end in .html
+FAHRPLAN_URL_REGEX = re.compile(
+    r"(.+/)((((19|20)([0-9]{2}))|(([1-9][0-9]){1}[Cc]3))"
+    r".*/Fahrplan.*/)[A-Za-z]+(\.[A-Za-z.]*html)")
+# charset declared in a Content-Type header or an html page's <meta> tag
+CHARSET_REGEX = re.compile(r"charset\s*=\s*[\"']?([A-Za-z0-9_.:-]+)",
+                           re.IGNORECASE)
+META_CHARSET_REGEX = re.compile(
+    rb"<meta[^>]+charset\s*=\s*[\"']?([A-Za-z0-9_.:-]+)", re.IGNORECASE)
+# speaker pages are called .../speakers/1234.html etc.
+# where 1234 is the speaker ID
+SPEAKER_URL_REGEX = re.compile(r".+/speakers/([0-9]+)(\..*[.html])")
+# twitter handles are formatted http(s)://twitter.com/the_name
+# or http(s)://x.com/the_name
+# (1-15 letters, digits or underscores, optionally prefixed with @ or #!/);
+# paths of Twitter's own pages (share buttons, searches, ...) aren't handles
+TWITTER_RESERVED = ('about', 'explore', 'hashtag', 'home', 'i', 'intent',
+                    'login', 'messages', 'notifications', 'privacy',
+                    'search', 'settings', 'share', 'signup', 'tos',
+                    'widgets')
+TWITTER_PATTERN = (
+    r"(?<![A-Za-z0-9-])(?:twitter|x)\.com/(?:#!/)?@?(?!(?:{})\b)"
+    r"(?P<twitter>[_A-Za-z0-9]{{1,15}})(?![_A-Za-z0-9])".format(
+        '|'.join(TWITTER_RESERVED)))
+TWITTER_URL_REGEX = re.compile(r".*" + TWITTER_PATTERN, re.IGNORECASE)
+# paths of GitHub's own pages
+GITHUB_RESERVED = ('about', 'explore', 'features', 'login', 'marketplace',
+                   'orgs', 'pricing', 'settings', 'sponsors', 'topics')
+# hosts whose links aren't speakers' websites: the platforms above
+# + the CCC's own pages (Fahrplan, recordings, ...)
+WEBSITE_IGNORED = ('twitter.com', 'x.com', 'github.com', 'bsky.app', 'ccc.de')
+# hosts with https://host/@the_name pages which aren't fediverse instances
+# (links to these are websites)
+FEDIVERSE_IGNORED = ('medium.com', 'substack.com', 'threads.com',
+                     'threads.net', 'tiktok.com', 'youtube.com')
+# links to speakers' accounts + websites, one named group per platform:
+# - Twitter handles (see above)
+# - GitHub users: github.com/the_name
+# - Bluesky handles: bsky.app/profile/the.name
+# - fediverse (Mastodon etc.) accounts: https://instance/@the_name or
+#   @the_name@instance (e.g. as the text of a link), except for the hosts
+#   above
+# - websites: all other http(s) links
+SOCIAL_LINK_REGEX = re.compile(
+    r"(?:https?://)?(?:www\.|mobile\.)?" + TWITTER_PATTERN +
+    r"|(?:https?://)?(?:www\.)?github\.com/(?!(?:{})\b)"
+    r"(?P<github>[A-Za-z0-9][A-Za-z0-9-]{{0,38}})(?![A-Za-z0-9-])"
+    r"|(?:https?://)?(?:www\.)?bsky\.app/profile/"
+    r"(?P<bluesky>[A-Za-z0-9][A-Za-z0-9.:-]*[A-Za-z0-9])"
+    r"|https?://(?![^/?#]*(?<![A-Za-z0-9-])(?:{})/)"
+    r"(?P<instance>[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+)/@"
+    r"(?P<fediverse>[_A-Za-z0-9]+)(?![_A-Za-z0-9@])"
+    r"|@(?P<fediverse_user>[_A-Za-z0-9]+)@"
+    r"(?P<fediverse_instance>[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+)"
+    r"|(?P<website>https?://(?![^/?#]*(?<![A-Za-z0-9-])(?:{})(?:[/?#:]|$))"
+    r"[^\s\"'<>]+)".format(
+        '|'.join(GITHUB_RESERVED),
+        '|'.join(re.escape(host) for host in FEDIVERSE_IGNORED),
+        '|'.join(re.escape(host) for host in WEBSITE_IGNORED)),
+    re.IGNORECASE)
 
 
 def hello_world():
@@ -51,7 +180,24 @@ def usage():
     howto = ("Usage: python3 {} "
              "[-y] <year> "
              "[-u] <url> "
-             "[-c] <xxC3>".format(sys.argv[0]))
+             "[-c] <xxC3[,xxC3...]> "
+             "[--range] <YYYY-YYYY> "
+             "[--parallel] <congresses> "
+             "[-w] <workers> "
+             "[-r] <requests/sec> "
+             "[-i] [--max-age] <hours> "
+             "[--pipeline] "
+             "[--processes] <processes> "
+             "[--resume] "
+             "[--metrics] <file> "
+             "[--metrics-format] <json|prometheus> "
+             "[-s] <auto|schedule|html> "
+             "[-e] <auto|soup|lxml|stream> "
+             "[--no-cache] "
+             "[--clear-cache] "
+             "[--bulk] "
+             "[--archive] "
+             "[--import-archive]".format(sys.argv[0]))
     return howto
 
 
@@ -72,10 +218,8 @@ def foreign_url(url):
     # - contain a year YYYY or C3 shortcut
     # - contain the folder /Fahrplan/
     # - end in .html
-    fahrplan_regex = "(.+/)((((19|20)([0-9]{2}))|(([1-9][0-9]){1}[Cc]3))" \
-                     ".*/Fahrplan.*/)[A-Za-z]+(\.[A-Za-z.]*html)"
     try:
-        fahrplan_data = re.match(fahrplan_regex, url)
+        fahrplan_data = FAHRPLAN_URL_REGEX.match(url)
         speakers_base_url = fahrplan_data.group(1) + fahrplan_data.group(2)
         year = fahrplan_data.group(4)
         c3_no = fahrplan_data.group(7)
@@ -168,17 +312,899 @@ def custom_headers():
     return headers
 
 
-def open_website(url):
+class Metrics(object):
+    """
+    Timers, counters and histograms collected during a run.
+
+    Metrics are identified by name plus optional labels (e.g. the page
+    type parsed) and can be dumped as JSON or in the Prometheus text
+    format at the end of a run.
+    """
+
+    # upper bounds (seconds) of the histogram buckets
+    buckets = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5,
+               10)
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        """Add to a counter.
+        :param name: name of the counter
+        :param value: amount to add
+        :param labels: labels of the counter
+        """
+        key = (name, tuple(sorted((label, str(value))
+                                  for label, value in labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Record a value (e.g. a duration) in a histogram.
+        :param name: name of the histogram
+        :param value: value observed
+        :param labels: labels of the histogram
+        """
+        key = (name, tuple(sorted((label, str(value))
+                                  for label, value in labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {
+                    'buckets': [0] * len(self.buckets), 'sum': 0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    @contextlib.contextmanager
+    def timer(self, name, **labels):
+        """Record the duration of a with block in a histogram.
+        :param name: name of the histogram
+        :param labels: labels of the histogram
+        """
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - started, **labels)
+
+    def reset(self):
+        """Forget all metrics collected so far."""
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    @staticmethod
+    def series(name, labels, extra=()):
+        """Return the name of a metric together with its labels.
+        :param name: name of the metric
+        :param labels: labels of the metric as tuple of (label, value)
+        :param extra: additional labels
+        """
+        labels = tuple(labels) + tuple(extra)
+        if not labels:
+            return name
+        return "{}{{{}}}".format(name, ",".join(
+            '{}="{}"'.format(label, value) for label, value in labels))
+
+    def to_dict(self):
+        """Return all metrics as a dictionary."""
+        with self.lock:
+            counters = {self.series(name, labels): value
+                        for (name, labels), value
+                        in sorted(self.counters.items())}
+            histograms = {}
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                histograms[self.series(name, labels)] = {
+                    'count': histogram['count'],
+                    'sum': round(histogram['sum'], 6),
+                    'buckets': dict(zip((str(bound) for bound in self.buckets),
+                                        histogram['buckets']))}
+        return {'counters': counters, 'histograms': histograms}
+
+    def to_json(self):
+        """Return all metrics as JSON."""
+        return json.dumps(self.to_dict(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix='c3speakers'):
+        """Return all metrics in the Prometheus text format.
+        :param prefix: prefix for all metric names
+        """
+        lines = []
+        with self.lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                name = "{}_{}".format(prefix, name)
+                if name not in typed:
+                    lines.append("# TYPE {} counter".format(name))
+                    typed.add(name)
+                lines.append("{} {}".format(self.series(name, labels), value))
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                name = "{}_{}".format(prefix, name)
+                if name not in typed:
+                    lines.append("# TYPE {} histogram".format(name))
+                    typed.add(name)
+                for bound, count in zip(self.buckets, histogram['buckets']):
+                    lines.append("{} {}".format(self.series(
+                        name + '_bucket', labels, (('le', bound),)), count))
+                lines.append("{} {}".format(self.series(
+                    name + '_bucket', labels, (('le', '+Inf'),)),
+                    histogram['count']))
+                lines.append("{} {}".format(self.series(name + '_sum', labels),
+                                            round(histogram['sum'], 6)))
+                lines.append("{} {}".format(
+                    self.series(name + '_count', labels), histogram['count']))
+        return "\n".join(lines) + "\n"
+
+    def dump(self, file_path, fmt='json'):
+        """Write all metrics to a file.
+        :param file_path: path of the file to write
+        :param fmt: json or prometheus
+        """
+        with open(file_path, 'w', encoding='utf-8') as metrics_file:
+            if fmt == 'prometheus':
+                metrics_file.write(self.to_prometheus())
+            else:
+                metrics_file.write(self.to_json())
+
+
+# metrics of the current run
+_metrics = Metrics()
+
+
+def metrics():
+    """Return the metrics of the current run."""
+    return _metrics
+
+
+def timed(name, **labels):
+    """Decorator recording the duration of each call in a histogram.
+    :param name: name of the histogram
+    :param labels: labels of the histogram
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _metrics.timer(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class RateLimiter(object):
+    """
+    Politeness budget shared by all fetchers of a run.
+
+    A token bucket per host allows at most `rate` requests per second
+    (plus short bursts of up to `burst` requests) to any one host;
+    requests to different hosts (and local files) don't hold each other up.
+
+    In adaptive mode, the rate follows the server's feedback: it grows
+    slowly while responses are fast, and is cut back on slow responses
+    and on 429/5xx errors. A Retry-After header pauses the host entirely.
+    """
+
+    # responses telling us to slow down
+    throttle_codes = (429, 503)
+
+    def __init__(self, rate=1.0, burst=1, adaptive=False, min_rate=None,
+                 max_rate=None, target_latency=1.0):
+        """
+        :param rate: max. requests per second per host (0 = unlimited)
+        :param burst: max. no. of requests sent at once after idle periods
+        :param adaptive: adjust the rate to the server's responses
+        :param min_rate: lowest rate the adaptive rate drops to
+        :param max_rate: highest rate the adaptive rate grows to
+        :param target_latency: response time (seconds) above which the
+        adaptive rate is lowered
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.adaptive = adaptive and rate > 0
+        self.min_rate = min_rate or rate / 10
+        self.max_rate = max_rate or rate
+        self.target_latency = target_latency
+        # per host: tokens left + time of last refill, current rate,
+        # time until which the host asked us to pause
+        self.buckets = {}
+        self.rates = {}
+        self.paused = {}
+        self.throttles = 0
+        self.lock = threading.Lock()
+
+    def wait(self, url):
+        """Block until the next request to the host of url is allowed.
+        :param url: the URL about to be requested
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        # no politeness needed for local files
+        if not host or not self.rate:
+            return
+
+        # take a token for this host (going into debt if there is none),
+        # then sleep outside the lock so fetchers for other hosts
+        # aren't blocked
+        with self.lock:
+            now = time.monotonic()
+            rate = self.rates.get(host, self.rate)
+            tokens, refilled = self.buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - refilled) * rate) - 1
+            self.buckets[host] = (tokens, now)
+            delay = -tokens / rate if tokens < 0 else 0
+            delay = max(delay, self.paused.get(host, now) - now)
+        _metrics.observe('ratelimit_wait_seconds', max(0, delay))
+        if delay > 0:
+            time.sleep(delay)
+
+    def feedback(self, url, status, latency, retry_after=None):
+        """Adjust the host's rate to a response.
+        :param url: the URL requested
+        :param status: status code of the response
+        :param latency: seconds the response took
+        :param retry_after: seconds the server asked us to wait, if any
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        if not host or not self.rate:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            rate = self.rates.get(host, self.rate)
+            throttled = status in self.throttle_codes or status // 100 == 5
+            if throttled:
+                self.throttles += 1
+                _metrics.inc('throttles_total')
+                if retry_after:
+                    self.paused[host] = max(self.paused.get(host, now),
+                                            now + retry_after)
+            if not self.adaptive:
+                return
+            # multiplicative decrease on errors and slow responses,
+            # additive increase while the server keeps up
+            if throttled:
+                rate = rate / 2
+            elif latency > self.target_latency:
+                rate = rate * 0.8
+            elif latency < self.target_latency / 2:
+                rate = rate + self.rate / 10
+            self.rates[host] = min(self.max_rate, max(self.min_rate, rate))
+
+    def stats(self):
+        """Return a line stating the current rate(s) + throttles so far."""
+        if not self.rate:
+            return "unlimited"
+        rates = ", ".join("{:.2f} req/s ({})".format(rate, host)
+                          for host, rate in sorted(self.rates.items()))
+        return "{}, {} throttle(s)".format(
+            rates or "{:.2f} req/s".format(self.rate), self.throttles)
+
+
+def retry_after(response):
+    """Return the no. of seconds a response's Retry-After header asks for.
+    :param response: the response received
+    """
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # Retry-After can also be an http date
+    try:
+        retry_date = email_utils.parsedate_to_datetime(value)
+        return max(0.0, retry_date.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def BeautifulSoup(*args, **kwargs):
+    """bs4.BeautifulSoup (bs4 is only imported once a soup is needed)."""
+    return bs4.BeautifulSoup(*args, **kwargs)
+
+
+def SoupStrainer(*args, **kwargs):
+    """bs4.SoupStrainer (bs4 is only imported once a soup is needed)."""
+    return bs4.SoupStrainer(*args, **kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def counting_adapter():
+    """Return the CountingAdapter class, built on first use (as it
+    derives from a class of requests)."""
+
+    class CountingAdapter(requests.adapters.HTTPAdapter):
+        """
+        Transport adapter that counts the connections it actually opens,
+        including reconnects of dropped keep-alive connections.
+        """
+
+        def __init__(self, *args, **kwargs):
+            self.connects = 0
+            self.lock = threading.Lock()
+            super().__init__(*args, **kwargs)
+
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            adapter = self
+
+            # wrap the connection classes of both pool types so every
+            # (re)connect gets counted
+            def counting_pool(pool_cls):
+                class CountingConnection(pool_cls.ConnectionCls):
+                    def connect(self):
+                        with adapter.lock:
+                            adapter.connects += 1
+                        return super().connect()
+
+                return type(pool_cls.__name__, (pool_cls,),
+                            {'ConnectionCls': CountingConnection})
+
+            self.poolmanager.pool_classes_by_scheme = {
+                'http': counting_pool(urllib3.HTTPConnectionPool),
+                'https': counting_pool(urllib3.HTTPSConnectionPool)}
+
+    return CountingAdapter
+
+
+class FetchClient(object):
+    """
+    Long-lived HTTP client shared by all Fahrplan requests of a run.
+
+    Keeps connections to the Fahrplan host alive and pooled, so consecutive
+    requests don't pay for a new TCP/TLS handshake each, and retries
+    requests that failed on connection errors or server errors.
+    """
+
+    # responses worth asking for again
+    retry_codes = (429, 500, 502, 503, 504)
+    # longest pause a server can ask for (seconds)
+    max_retry_after = 120
+
+    def __init__(self, pool_size=10, retries=3, backoff=0.5, timeout=5,
+                 limiter=None):
+        """
+        :param pool_size: max. number of connections kept open per host
+        :param retries: max. number of retries for a failed request
+        :param backoff: backoff factor (seconds) between retries
+        :param timeout: timeout (seconds) for connecting/reading
+        :param limiter: RateLimiter told about every response (and waited
+        for before every retry)
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.limiter = limiter
+        self.requests = 0
+        self.retried = 0
+        self.lock = threading.Lock()
+
+        # retry connection errors with exponential backoff;
+        # server errors are retried by get() (so the limiter sees them)
+        retry = urllib3.util.retry.Retry(total=retries,
+                                         backoff_factor=backoff,
+                                         respect_retry_after_header=False,
+                                         raise_on_status=False)
+        self.adapter = counting_adapter()(pool_connections=pool_size,
+                                          pool_maxsize=pool_size,
+                                          max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update(custom_headers())
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+
+    def get(self, url, **kwargs):
+        """Send a GET request over the shared session.
+
+        Responses asking to slow down (429) and server errors are retried
+        with jittered exponential backoff, or after the time asked for in
+        their Retry-After header; after the last retry the response is
+        returned as is.
+        :param url: the URL to request
+        """
+        attempt = 0
+        while True:
+            with self.lock:
+                self.requests += 1
+            started = time.monotonic()
+            r = self.session.get(url, verify=True, timeout=self.timeout,
+                                 **kwargs)
+            latency = time.monotonic() - started
+            _metrics.observe('request_seconds', latency, method='GET')
+            _metrics.inc('responses_total', status=r.status_code)
+            wait = retry_after(r)
+            if wait is not None:
+                wait = min(wait, self.max_retry_after)
+            if self.limiter:
+                self.limiter.feedback(url, r.status_code, latency,
+                                      retry_after=wait)
+            if r.status_code not in self.retry_codes \
+                    or attempt >= self.retries:
+                return r
+
+            # full jitter keeps fetchers from retrying in lockstep
+            delay = random.uniform(0, self.backoff * 2 ** attempt)
+            r.close()
+            with self.lock:
+                self.retried += 1
+            _metrics.inc('retries_total')
+            attempt += 1
+            time.sleep(max(delay, wait or 0))
+            if self.limiter:
+                self.limiter.wait(url)
+
+    def head(self, url, **kwargs):
+        """Send a HEAD request over the shared session.
+        :param url: the URL to request
+        """
+        with self.lock:
+            self.requests += 1
+        started = time.monotonic()
+        r = self.session.head(url, verify=True, timeout=self.timeout,
+                              allow_redirects=True, **kwargs)
+        _metrics.observe('request_seconds', time.monotonic() - started,
+                         method='HEAD')
+        _metrics.inc('responses_total', status=r.status_code)
+        return r
+
+    def connections(self):
+        """Return the no. of connections opened so far (across all hosts)."""
+        return self.adapter.connects
+
+    def stats(self):
+        """Return a line stating requests made vs. connections opened."""
+        return "{} request(s) over {} connection(s), {} retried".format(
+            self.requests, self.connections(), self.retried)
+
+    def close(self):
+        self.session.close()
+
+
+# fetch client used when no client is passed explicitly
+_fetch_client = None
+_fetch_client_lock = threading.Lock()
+
+
+def fetch_client():
+    """Return the module's shared fetch client (created on first use)."""
+    global _fetch_client
+    # workers may ask for it at the same time
+    with _fetch_client_lock:
+        if _fetch_client is None:
+            _fetch_client = FetchClient()
+    return _fetch_client
+
+
+class ResponseCache(object):
+    """
+    Persistent (SQLite) cache of Fahrplan responses, keyed by URL.
+
+    Stores each page's body together with its ETag/Last-Modified headers
+    so the next run can revalidate pages instead of re-downloading them,
+    plus the result (Twitter handle) extracted from the page, so pages
+    which haven't changed don't need to be parsed again either.
+    """
+
+    def __init__(self, db_file, max_size=50, ttl=30):
+        """
+        :param db_file: path to the sqlite file holding the cache
+        :param max_size: max. size (MB) of all cached bodies combined
+        :param ttl: no. of days after which cached pages are evicted
+        """
+        self.max_size = int(max_size * 1024 * 1024)
+        self.ttl = ttl * 24 * 60 * 60
+        # responses revalidated (304) during this run
+        self.revalidated = {}
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_file, check_same_thread=False)
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS responses "
+                            "(url TEXT PRIMARY KEY, body TEXT, etag TEXT, "
+                            "last_modified TEXT, result TEXT, "
+                            "stored REAL, size INTEGER)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS responses_stored "
+                            "ON responses (stored)")
+
+    def lookup(self, url):
+        """Return the cached (non-expired) response for url, if any.
+        :param url: the URL to look up
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT body, etag, last_modified, result FROM responses "
+                "WHERE url = ? AND stored > ?",
+                (url, time.time() - self.ttl)).fetchone()
+        if row:
+            return {'body': row[0], 'etag': row[1], 'last_modified': row[2],
+                    'result': row[3]}
+
+    def store(self, url, body, etag=None, last_modified=None):
+        """Save a freshly downloaded response (invalidates its old result).
+        :param url: the URL requested
+        :param body: the decoded response body (the raw bytes of UTF-8
+        pages, see open_website)
+        :param etag: value of the ETag header
+        :param last_modified: value of the Last-Modified header
+        """
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO responses "
+                            "(url, body, etag, last_modified, result, "
+                            "stored, size) VALUES (?, ?, ?, ?, NULL, ?, ?)",
+                            (url, body, etag, last_modified, time.time(),
+                             len(body)))
+
+    def store_result(self, url, result):
+        """Save the result extracted from a cached response.
+        :param url: the URL of the parsed page
+        :param result: the extracted value ('' if there was none)
+        """
+        with self.lock, self.db:
+            self.db.execute("UPDATE responses SET result = ? WHERE url = ?",
+                            (result, url))
+
+    def touch(self, url, cached):
+        """Mark a cached response as still valid (server answered 304).
+        :param url: the URL requested
+        :param cached: the cached response as returned by lookup()
+        """
+        self.revalidated[url] = cached
+        with self.lock, self.db:
+            self.db.execute("UPDATE responses SET stored = ? WHERE url = ?",
+                            (time.time(), url))
+
+    def evict(self):
+        """Remove expired responses, then the oldest ones above max. size."""
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM responses WHERE stored <= ?",
+                            (time.time() - self.ttl,))
+            total = self.db.execute(
+                "SELECT coalesce(sum(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_size:
+                rows = self.db.execute(
+                    "SELECT url, size FROM responses ORDER BY stored")
+                evicted = []
+                for url, size in rows:
+                    if total <= self.max_size:
+                        break
+                    evicted.append((url,))
+                    total -= size
+                self.db.executemany("DELETE FROM responses WHERE url = ?",
+                                    evicted)
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM responses")
+        self.db.execute("VACUUM")
+
+    def close(self):
+        self.evict()
+        self.db.close()
+
+
+class EndingIndex(object):
+    """
+    Persistent (SQLite) index of the file ending each Fahrplan uses for
+    its pages (.html, .en.html, .de.html), keyed by the Fahrplan's base URL,
+    so the ending only needs to be probed once.
+    """
+
+    def __init__(self, db_file):
+        """
+        :param db_file: path to the sqlite file holding the index
+        """
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_file, check_same_thread=False)
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS endings "
+                            "(base_url TEXT PRIMARY KEY, ending TEXT, "
+                            "stored REAL)")
+
+    def get(self, base_url):
+        """Return the file ending known for a Fahrplan, if any.
+        :param base_url: URL of the Fahrplan
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT ending FROM endings WHERE base_url = ?",
+                (base_url,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, base_url, ending):
+        """Remember the file ending of a Fahrplan.
+        :param base_url: URL of the Fahrplan
+        :param ending: file ending of the Fahrplan's pages
+        """
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO endings "
+                            "(base_url, ending, stored) VALUES (?, ?, ?)",
+                            (base_url, ending, time.time()))
+
+    def forget(self, base_url):
+        """Drop the file ending of a Fahrplan (e.g. when it became invalid).
+        :param base_url: URL of the Fahrplan
+        """
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM endings WHERE base_url = ?",
+                            (base_url,))
+
+    def close(self):
+        self.db.close()
+
+
+class HandleCache(object):
+    """
+    Persistent (SQLite) cache of whether Twitter handles belong to existing
+    accounts, as looked up via Twitter's users/lookup (see twittering.py):
+    handle -> (user id, status, last verified). Entries older than ttl days
+    are evicted, so accounts get verified again once in a while.
+    """
+
+    # status of handles of existing accounts / of non-existent, suspended
+    # or deactivated ones
+    VALID = 'valid'
+    INVALID = 'invalid'
+
+    def __init__(self, db_file, ttl=7):
+        """
+        :param db_file: path to the sqlite file holding the cache
+        :param ttl: no. of days a handle's status is kept
+        """
+        self.ttl = ttl * 24 * 60 * 60
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_file, check_same_thread=False)
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS handles "
+                            "(handle TEXT PRIMARY KEY COLLATE NOCASE, "
+                            "user_id TEXT, status TEXT, last_verified REAL)")
+        self.evict()
+
+    def get(self, handles):
+        """Look up the status of handles verified within the TTL.
+        :param handles: Twitter handles
+        :return: dictionary of handle: (user id, status) of known handles
+        """
+        handles = list(handles)
+        known = {}
+        oldest = time.time() - self.ttl
+        with self.lock:
+            # stay below SQLite's limit of variables per statement
+            for i in range(0, len(handles), 500):
+                chunk = handles[i:i + 500]
+                rows = self.db.execute(
+                    "SELECT handle, user_id, status FROM handles "
+                    "WHERE last_verified > ? AND handle IN ({})".format(
+                        ', '.join('?' * len(chunk))),
+                    [oldest] + chunk).fetchall()
+                known.update({handle.lower(): (user_id, status)
+                              for handle, user_id, status in rows})
+        return {handle: known[handle.lower()] for handle in handles
+                if handle.lower() in known}
+
+    def invalid(self, handles):
+        """Return the handles known to not belong to existing accounts.
+        :param handles: Twitter handles
+        """
+        return {handle for handle, (user_id, status)
+                in self.get(handles).items() if status == self.INVALID}
+
+    def set(self, entries):
+        """Remember the status of handles.
+        :param entries: iterable of (handle, user id or None, status)
+        """
+        now = time.time()
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO handles "
+                "(handle, user_id, status, last_verified) VALUES (?, ?, ?, ?)",
+                [(handle, user_id, status, now)
+                 for handle, user_id, status in entries])
+
+    def evict(self):
+        """Drop handles not verified within the TTL."""
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM handles WHERE last_verified <= ?",
+                            (time.time() - self.ttl,))
+
+    def close(self):
+        self.db.close()
+
+
+def probe_file_ending(speakers_base_url, file_endings, client=None,
+                      limiter=None):
+    """Find out which file ending a Fahrplan's speakers page uses.
+
+    All candidate URLs are probed concurrently with HEAD requests (each
+    within the host's politeness budget); the most common ending (earliest
+    in file_endings) which exists wins.
+    :param speakers_base_url: URL of the Fahrplan
+    :param file_endings: candidate file endings, most common first
+    :param client: FetchClient to send the requests with
+    :param limiter: RateLimiter waited for before every probe
+    :return: the file ending, or None if no speakers page was found
+    """
+    if not client:
+        client = fetch_client()
+    urls = ["{}speakers{}".format(speakers_base_url, ending)
+            for ending in file_endings]
+
+    # local files: no need to ask a server
+    if not urllib.parse.urlparse(speakers_base_url).netloc:
+        for ending, url in zip(file_endings, urls):
+            if os.path.isfile(url):
+                return ending
+        return None
+
+    def probe(url):
+        try:
+            if limiter:
+                limiter.wait(url)
+            r = client.head(url)
+            # some servers don't answer HEAD requests, ask for the page then
+            # (without downloading its body)
+            if r.status_code in (405, 501):
+                if limiter:
+                    limiter.wait(url)
+                r = client.get(url, stream=True)
+                r.close()
+            return r.status_code // 100 == 2
+        except requests.exceptions.RequestException:
+            return False
+
+    found = {}
+    executor = concurrent_futures.ThreadPoolExecutor(max_workers=len(urls))
+    try:
+        futures = {executor.submit(probe, url): ending
+                   for ending, url in zip(file_endings, urls)}
+        for future in concurrent_futures.as_completed(futures):
+            found[futures[future]] = future.result()
+            # the winner is the first existing ending for which all more
+            # common endings are known not to exist
+            for ending in file_endings:
+                if ending not in found:
+                    break
+                if found[ending]:
+                    return ending
+        return None
+    finally:
+        # don't wait for probes of less common endings
+        executor.shutdown(wait=False)
+
+
+def wire_bytes(response):
+    """Return the no. of bytes of a response's body read so far, as they
+    were transferred (i.e. compressed, if the server compressed them).
+    :param response: requests response
+    """
+    try:
+        return response.raw.tell()
+    # responses not read over a connection (e.g. in tests)
+    except AttributeError:
+        return len(response.content)
+
+
+def count_bytes(chunks, response):
+    """Pass on downloaded chunks while counting the bytes transferred.
+    :param chunks: iterable of bytes
+    :param response: requests response the chunks are read from
+    """
+    counted = 0
+    for chunk in chunks:
+        transferred = wire_bytes(response)
+        _metrics.inc('download_bytes_total', transferred - counted)
+        counted = transferred
+        yield chunk
+
+
+def cache_chunks(chunks, cache, url, etag=None, last_modified=None,
+                 charset=None):
+    """Pass on downloaded chunks, then cache the whole body.
+
+    Only bodies read to their end are cached, as bytes; streamed bodies are
+    read as UTF-8, so pages declaring another charset aren't cached.
+    :param chunks: iterable of bytes
+    :param cache: ResponseCache to store the body in
+    :param url: the URL requested
+    :param etag: value of the ETag header
+    :param last_modified: value of the Last-Modified header
+    :param charset: charset declared in the Content-Type header, if any
+    """
+    body = []
+    for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+    body = b''.join(body)
+    if not charset:
+        declared = META_CHARSET_REGEX.search(body[:1024])
+        charset = declared and charset_name(declared.group(1).decode('ascii'))
+    if charset in (None, 'utf-8', 'ascii'):
+        cache.store(url, body, etag, last_modified)
+
+
+# charsets detected for hosts whose pages don't declare any
+_charsets = {}
+
+
+def charset_name(charset):
+    """Return the canonical name of a charset (None if it is unknown).
+    :param charset: name of the charset, e.g. as declared by a page
+    """
+    try:
+        return codecs.lookup(charset).name
+    except (LookupError, TypeError):
+        return None
+
+
+def response_charset(response):
+    """
+    Return the charset to decode a response's body with.
+
+    The charset declared in the Content-Type header or, failing that,
+    in one of the page's first <meta> tags is used. Only pages which
+    declare none have their charset detected (statistically, over the
+    whole body), once per host.
+    :param response: requests response
+    """
+    declared = CHARSET_REGEX.search(response.headers.get('Content-Type', ''))
+    if declared:
+        charset = charset_name(declared.group(1))
+    else:
+        # browsers only look for <meta> tags in the first 1024 bytes, too
+        declared = META_CHARSET_REGEX.search(response.content[:1024])
+        charset = declared and charset_name(declared.group(1).decode('ascii'))
+    if charset:
+        return charset
+
+    host = urllib.parse.urlparse(response.url or '').netloc
+    charset = _charsets.get(host)
+    if not charset:
+        charset = charset_name(response.apparent_encoding) or 'utf-8'
+        _charsets[host] = charset
+        _metrics.inc('charset_detections_total')
+    return charset
+
+
+def open_website(url, client=None, cache=None, stream=False, raw=False):
     """Open a website or file and return its HTML contents.
     :param url: the website/file to be opened
+    :param client: FetchClient to send the request with (default: shared one)
+    :param cache: ResponseCache to revalidate/store the response with
+    :param stream: return the body as chunks of bytes while it is downloaded
+    (unless the page is cached and didn't change)
+    :param raw: return the body of UTF-8 pages as bytes, so parsers get it
+    without decoding it first (pages in other charsets are decoded)
     """
 
-    session = requests.Session()
-    headers = custom_headers()
+    if not client:
+        client = fetch_client()
+
+    # ask the server to only send the page if it changed since it was cached
+    headers = {}
+    cached = cache.lookup(url) if cache else None
+    if cached:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
 
     # connect to the (assumed) website
     try:
-        r = session.get(url, headers=headers, verify=True, timeout=5)
+        r = client.get(url, headers=headers, stream=stream)
+        # page didn't change since the last run: use the cached copy
+        if r.status_code == 304 and cached:
+            print(u"\u2713 Not modified {}".format(url))
+            _metrics.inc('cache_hits_total')
+            cache.touch(url, cached)
+            # bodies of UTF-8 pages fetched with raw are cached as bytes
+            if not raw and isinstance(cached['body'], bytes):
+                return cached['body'].decode('utf-8', 'replace')
+            return cached['body']
+        if cache:
+            _metrics.inc('cache_misses_total')
         # check the status code returned by the web request
         # only status 200 (OK) signifies the request was successful
         if not r.status_code // 100 == 2:
@@ -191,8 +1217,32 @@ def open_website(url):
             return None
         else:
             print(u"\u2713 Opening {}".format(url))
-            r.encoding = r.apparent_encoding
-            html = r.text
+            # large documents are handed over piece by piece
+            if stream:
+                chunks = count_bytes(r.iter_content(chunk_size=64 * 1024),
+                                     r)
+                etag = r.headers.get('ETag')
+                last_modified = r.headers.get('Last-Modified')
+                if cache and (etag or last_modified):
+                    declared = CHARSET_REGEX.search(
+                        r.headers.get('Content-Type', ''))
+                    chunks = cache_chunks(
+                        chunks, cache, url, etag, last_modified,
+                        charset=declared and charset_name(declared.group(1)))
+                return chunks
+            # (the body is read before its transferred bytes are counted)
+            content = r.content
+            _metrics.inc('download_bytes_total', wire_bytes(r))
+            charset = response_charset(r)
+            if raw and charset in ('utf-8', 'ascii'):
+                html = content
+            else:
+                html = content.decode(charset, 'replace')
+            # only pages which can be revalidated are worth caching
+            etag = r.headers.get('ETag')
+            last_modified = r.headers.get('Last-Modified')
+            if cache and (etag or last_modified):
+                cache.store(url, html, etag, last_modified)
             return html
     # connection timeout
     except requests.exceptions.ConnectTimeout:
@@ -205,7 +1255,7 @@ def open_website(url):
             file_path = "file:///{}".format(url)
             # check if url is actually a local file
             try:
-                html = urlopen(file_path)
+                html = urllib_request.urlopen(file_path)
                 print(u"\u2713 Opening {}".format(file_path))
                 return html
             # if the local file cannot be opened/does not exist
@@ -230,183 +1280,1295 @@ def open_website(url):
         print(err)
 
 
-def find_speakers(html_obj):
+def social_link(url):
     """
-    Find URLs to individual speakers pages in speakers.html
-    :param html_obj: the html object to parse with Beautiful Soup
+    Tell which platform a link (or @user@instance) points to.
+    :param url: URL of the link
+    :return: tuple of platform (twitter, github, bluesky, fediverse or
+    website) + account (the URL for websites), or None
     """
-    speakers = {}
+    social_data = SOCIAL_LINK_REGEX.match(url.strip())
+    if not social_data:
+        return None
+    platform = social_data.lastgroup
+    if platform == 'fediverse':
+        return 'fediverse', "{}@{}".format(
+            social_data.group('fediverse'),
+            social_data.group('instance').lower())
+    if platform == 'fediverse_instance':
+        return 'fediverse', "{}@{}".format(
+            social_data.group('fediverse_user'),
+            social_data.group('fediverse_instance').lower())
+    if platform == 'bluesky':
+        return 'bluesky', social_data.group('bluesky').lower()
+    if platform == 'website':
+        return 'website', social_data.group('website').rstrip('/')
+    return platform, social_data.group(platform)
 
-    # only look for <a> tags
-    parse_links = SoupStrainer('a')
-    # look for the string /speakers/
-    filter_links = re.compile("(/speakers/)")
-    # match any text – except tags! (tags won't get matched by this)
-    filter_contents = re.compile(".*")
-    soup = BeautifulSoup(html_obj, 'html.parser', parse_only=parse_links)
-
-    # find all URLs that match the defined criteria
-    for item in soup.find_all('a', href=filter_links, string=filter_contents):
-        # filter out speaker IDs from all valid URLs
-        # speaker files are called .../speakers/1234.html etc.
-        # where 1234 is the speaker ID
-        regex = ".+/speakers/([0-9]+)(\..*[.html])"
-        href = item['href']
 
-        # try to match speaker URL
-        try:
-            speaker_id = re.match(regex, href).group(1)
-            value = item.get_text()
-            # debug
-            # print("{} : {}".format(speaker_id, value))
-            # save all speaker IDs and speaker names into a dictionary
-            speakers[speaker_id] = value
-        # account for malformed speaker URLs
-        except Exception as err:
-            print("Faulty URL for speaker: {}".format(href))
-            print(err)
-            return None
+def collect_links(links):
+    """
+    Collect the accounts + websites of a speaker's links.
+    :param links: (URL, text) of each link
+    :return: list of (platform, account) in order of appearance, each once
+    """
+    found = []
+    seen = set()
+    for url, text in links:
+        link = social_link(url) if url else None
+        # fediverse accounts are often linked as e.g. /users/the_name,
+        # with @the_name@instance as the link's text
+        text_link = social_link(text) if text else None
+        if text_link and text_link[0] == 'fediverse':
+            link = text_link
+        if link and (link[0], link[1].lower()) not in seen:
+            seen.add((link[0], link[1].lower()))
+            found.append(link)
+    return found
 
-    return speakers
+
+def first_account(links, platform='twitter'):
+    """Return the first account of a platform among a speaker's links.
+    :param links: list of (platform, account)
+    :param platform: platform to return the account of
+    """
+    for link_platform, account in links or ():
+        if link_platform == platform:
+            return account
+    return None
 
 
-def parse_speaker_profile(url):
+def encode_links(links):
+    """Turn a speaker's links into a string (to cache them)."""
+    return json.dumps(links)
+
+
+def decode_links(result):
+    """Turn a cached result back into a speaker's links.
+    :param result: string made by encode_links (or, by older versions,
+    the Twitter handle found)
+    :return: list of (platform, account)
     """
-    Parse a C3 speaker profile for a link to a Twitter account.
-    :param url: url to an individual speaker profile
+    if result.startswith('['):
+        return [tuple(link) for link in json.loads(result)]
+    return [('twitter', result)] if result else []
+
+
+def twitter_from_links(links):
     """
+    Return the Twitter handle from a list of links, if there is one.
+    :param links: list of URLs or of dictionaries with a 'url' key
+    """
+    for link in links or ():
+        if isinstance(link, dict):
+            link = link.get('url') or link.get('href') or ''
+        twitter_data = TWITTER_URL_REGEX.match(link)
+        if twitter_data:
+            return twitter_data.group(1)
+    return None
 
-    # try to open a speaker's profile page/file
-    html_obj = open_website(url)
-    if html_obj:
-        # look for <a> tags
-        parse_links = SoupStrainer('a')
-        # look for the string twitter.com
-        filter_links = re.compile("(twitter.com)")
-        soup = BeautifulSoup(html_obj, 'html.parser', parse_only=parse_links)
-
-        # find all URLs that match the defined criteria
-        for twitter_account in soup.find_all('a', href=filter_links):
-            # filter out twitter handles from all valid URLs
-            # twitter handles are formatted http(s)://twitter.com/the_name
-            regex = ".*twitter.com/([@_A-Za-z0-9]+)"
-            href = twitter_account['href']
-            # try to find proper Twitter accounts
-            try:
-                twitter_handle = re.match(regex, href).group(1)
-                return twitter_handle
-            # account for malformed Twitter URLs
-            except Exception as err:
-                print("Faulty URL for Twitter account: {}".format(href))
-                print(err)
-                return None
 
+class SpeakerRecord(object):
+    """A speaker's ID, name + Twitter handle (or None)."""
 
-def db_connect(dir_path, db_name, table, year):
-    """Create / connect to SQLite database.
-    :param dir_path: path to the directory containing the sqlite db
-    :param db_name: name of the DB to connect to
-    :param table: name of the table to create for speakers' data
-    :param year: year YYYY
-    """
-    db_file = "{}{}.sqlite".format(db_name, year)
+    __slots__ = ('id', 'name', 'twitter')
 
-    # try to connect to the sqlite database;
-    # if the path is writeable and the file doesn't exist yet,
-    # a sqlite db with the requested name be created
-    try:
-        db = sqlite3.connect(dir_path + db_file)
-    except sqlite3.OperationalError:
-        print("ERROR: Cannot connect to database.")
-        return None
+    def __init__(self, speaker_id, name=None, twitter=None):
+        """
+        :param speaker_id: the speaker's ID, as int or str
+        :param name: the speaker's name
+        :param twitter: the speaker's Twitter handle
+        """
+        self.id = int(speaker_id)
+        self.name = name
+        self.twitter = twitter
 
-    # create table for speakers if there is none yet
-    try:
-        cur = db.cursor()
-        cur.execute("CREATE TABLE IF NOT EXISTS {} "
-                    "(id INTEGER PRIMARY KEY, name TEXT, twitter TEXT)"
-                    .format(table))
-        cur.execute("SELECT Count(*) FROM {}".format(table))
-        db.commit()
-    except sqlite3.OperationalError as err:
-        # rollback on problems with db statement
-        print("Could not query the database as requested.")
-        print(str(err))
-        db.rollback()
-    finally:
-        db.close()
+    def __eq__(self, other):
+        if not isinstance(other, SpeakerRecord):
+            return NotImplemented
+        return ((self.id, self.name, self.twitter) ==
+                (other.id, other.name, other.twitter))
 
-    return db_file
+    def __repr__(self):
+        return "SpeakerRecord({!r}, {!r}, {!r})".format(self.id, self.name,
+                                                        self.twitter)
 
 
-def db_query(dir_path, db_name, table, column=None):
-    """Query table in DB.
-    :param dir_path: path to the directory containing the sqlite db
-    :param db_name: name of the DB to operate on
-    :param table: name of the to-be-modified table holding speakers' data
-    :param column: table column to query
+class Speakers(collections.abc.MutableMapping):
     """
-    results = {}
+    Speakers of a congress, kept compactly enough to hold many congresses
+    in memory at once.
 
-    # try to connect to the sqlite database;
-    # as the connect was already checked, this should not result in a new file
-    try:
-        db = sqlite3.connect(dir_path + db_name)
-    except sqlite3.OperationalError:
-        print("ERROR: Cannot connect to database.")
-        return None
+    IDs are stored as integers in an array, names + Twitter handles in
+    lists next to it (handles interned, as they recur across congresses).
+    Speakers are looked up in O(1) by ID and by Twitter handle.
 
-    # check for validity of table column provided by user
-    if not column:
-        select = '*'
-        column = 'id'
-    elif column == 'name' or column == 'twitter':
-        select = "id, {}".format(column)
-    else:
-        print("ERROR: The provided table column is not valid. Exiting.")
-        sys.exit(1)
+    As a mapping, the collection maps IDs to one field of the speakers'
+    records (names by default), so it can be used wherever dictionaries
+    of names or handles are; IDs may be given as int or str. view()
+    returns the same speakers mapped to another field.
+    """
 
-    # query table for provided column
-    try:
-        cur = db.cursor()
-        cur.execute(
-            "SELECT count(id) FROM {} WHERE {} != '' ".format(table, column)
-        )
-        rows = cur.fetchone()
-        # if there are any results, put them into a dictionary and return it
-        if rows[0] > 0:
-            cur.execute("SELECT {} FROM {} "
-                        "WHERE {} != '' ".format(select, table, column)
-                        )
-            rows = cur.fetchall()
-            # ids have to be converted to str as parsed vals are strings
-            for row in rows:
-                speaker_id = str(row[0])
-                results[speaker_id] = row[1]
-            db.commit()
-            return results
-    except sqlite3.OperationalError as err:
-        # rollback on problems with db statement
-        print("Could not query the database as requested.")
-        print(str(err))
-        db.rollback()
-    finally:
-        db.close()
+    __slots__ = ('field', '_ids', '_values', '_index', '_handles', '_counts')
 
+    FIELDS = ('name', 'twitter')
 
-def db_write(dir_path, db_name, table, speakers=None, twitter=None):
-    """Update table in DB.
-    :param dir_path: path to the directory containing the sqlite db
-    :param db_name: name of the DB to operate on
-    :param table: name of the to-be-modified table holding speakers' data
-    :param speakers: dictionary containing speakers IDs and names
-    :param twitter: dictionary containing speakers IDs and twitter handles
-    """
+    def __init__(self, values=None, field='name'):
+        """
+        :param values: dictionary (or Speakers) of speaker IDs + values
+        :param field: field the IDs are mapped to, name or twitter
+        """
+        if field not in self.FIELDS:
+            raise ValueError("ERROR: Field needs to be one of {}:\n"
+                             "{}".format(', '.join(self.FIELDS), field))
+        self.field = field
+        self._ids = array.array('q')
+        self._values = {'name': [], 'twitter': []}
+        # position of each speaker by ID + by (lower case) handle
+        self._index = {}
+        self._handles = {}
+        # no. of speakers with a value, per field
+        self._counts = {'name': 0, 'twitter': 0}
+        if values:
+            self.update(values)
 
-    # try to connect to the sqlite database;
+    def _position(self, speaker_id):
+        try:
+            return self._index[int(speaker_id)]
+        except (TypeError, ValueError):
+            raise KeyError(speaker_id)
+
+    def _set(self, position, field, value):
+        values = self._values[field]
+        old = values[position]
+        if field == 'twitter':
+            if old and self._handles.get(old.lower()) == position:
+                del self._handles[old.lower()]
+            if value:
+                value = sys.intern(value)
+                self._handles[value.lower()] = position
+        self._counts[field] += (value is not None) - (old is not None)
+        values[position] = value
+
+    def add(self, speaker_id, name=None, twitter=None):
+        """Add a speaker, or set the name/handle of one added before.
+        :param speaker_id: the speaker's ID, as int or str
+        :param name: the speaker's name (None: leave as it is)
+        :param twitter: the speaker's Twitter handle (None: leave as it is)
+        """
+        speaker_id = int(speaker_id)
+        position = self._index.get(speaker_id)
+        if position is None:
+            position = len(self._ids)
+            self._ids.append(speaker_id)
+            self._values['name'].append(None)
+            self._values['twitter'].append(None)
+            self._index[speaker_id] = position
+        if name is not None:
+            self._set(position, 'name', name)
+        if twitter is not None:
+            self._set(position, 'twitter', twitter)
+
+    def record(self, speaker_id):
+        """Return the record of a speaker.
+        :param speaker_id: the speaker's ID, as int or str
+        """
+        position = self._position(speaker_id)
+        return SpeakerRecord(self._ids[position],
+                             self._values['name'][position],
+                             self._values['twitter'][position])
+
+    def records(self):
+        """Yield the records of all speakers, in the order they were added."""
+        for speaker_id, name, twitter in zip(self._ids, self._values['name'],
+                                             self._values['twitter']):
+            yield SpeakerRecord(speaker_id, name, twitter)
+
+    def by_handle(self, handle):
+        """Return the record of the speaker with a Twitter handle, if any.
+        :param handle: Twitter handle (case-insensitive, @ is optional)
+        """
+        position = self._handles.get(handle.lstrip('@').lower())
+        if position is None:
+            return None
+        return self.record(self._ids[position])
+
+    def subset(self, speaker_ids, exclude=False):
+        """Return some of the speakers as a new collection.
+        :param speaker_ids: IDs of the speakers, as int or str
+        :param exclude: return all speakers but these instead
+        """
+        wanted = set(int(speaker_id) for speaker_id in speaker_ids)
+        subset = Speakers(field=self.field)
+        for record in self.records():
+            if (record.id in wanted) != exclude:
+                subset.add(record.id, record.name, record.twitter)
+        return subset
+
+    def view(self, field):
+        """Return the same speakers (changes show in both), mapped to
+        another field.
+        :param field: field the IDs are mapped to, name or twitter
+        """
+        view = Speakers(field=field)
+        for attr in self.__slots__[1:]:
+            setattr(view, attr, getattr(self, attr))
+        return view
+
+    def __getitem__(self, speaker_id):
+        value = self._values[self.field][self._position(speaker_id)]
+        if value is None:
+            raise KeyError(speaker_id)
+        return value
+
+    def __setitem__(self, speaker_id, value):
+        self.add(speaker_id, **{self.field: value})
+
+    def __delitem__(self, speaker_id):
+        position = self._position(speaker_id)
+        if self._values[self.field][position] is None:
+            raise KeyError(speaker_id)
+        self._set(position, self.field, None)
+
+    def __iter__(self):
+        for speaker_id, value in zip(self._ids, self._values[self.field]):
+            if value is not None:
+                yield speaker_id
+
+    def __len__(self):
+        return self._counts[self.field]
+
+    def __eq__(self, other):
+        # dictionaries with IDs as str are equal to the same IDs as int
+        if not isinstance(other, collections.abc.Mapping):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        for speaker_id, value in other.items():
+            try:
+                if self[speaker_id] != value:
+                    return False
+            except KeyError:
+                return False
+        return True
+
+    def __repr__(self):
+        return "Speakers({!r}, field={!r})".format(dict(self.items()),
+                                                   self.field)
+
+
+def speaker_rows(values):
+    """Return (int ID, value) of speakers, e.g. to write them to the DB.
+    :param values: Speakers or dictionary of speaker IDs + values
+    """
+    # a Speakers collection's IDs are integers already
+    if isinstance(values, Speakers):
+        return values.items()
+    return ((int(speaker_id), value) for speaker_id, value in values.items())
+
+
+def add_schedule_person(person, speakers, twitters, links=None):
+    """
+    Add a person listed in a machine-readable Fahrplan to the results.
+    :param person: dictionary with the person's data
+    :param speakers: Speakers (or dictionary) of speakers IDs and names
+    :param twitters: Speakers (or dictionary) of speakers IDs and twitter
+    handles
+    :param links: dictionary to add the person's links to (see
+    collect_links), if they are listed
+    """
+    # IDs are saved as integers, like the ones parsed from speakers.html
+    speaker_id = str(person.get('id', ''))
+    if not speaker_id.isdigit():
+        print("Faulty ID for speaker: {}".format(person))
+        return
+    speaker_id = int(speaker_id)
+    speakers[speaker_id] = (person.get('public_name') or
+                            person.get('full_name') or
+                            person.get('name') or '')
+    twitter_handle = twitter_from_links(person.get('links'))
+    if twitter_handle:
+        twitters[speaker_id] = twitter_handle
+    if links is not None and 'links' in person:
+        links[speaker_id] = collect_links(
+            (link.get('url') or link.get('href') or '', link.get('title'))
+            if isinstance(link, dict) else (link, None)
+            for link in person['links'] or ())
+
+
+@timed('parse_seconds', page='schedule')
+def parse_speakers_json(data, links=None):
+    """
+    Find speakers + Twitter handles in a Fahrplan's speakers.json.
+    :param data: the decoded JSON document
+    :param links: dictionary to add the speakers' links to
+    :return: Speakers, their Twitter handles (view of the Speakers),
+    whether links are listed
+    """
+    speakers = Speakers()
+    twitters = speakers.view('twitter')
+    persons = data['schedule_speakers']['speakers']
+    for person in persons:
+        add_schedule_person(person, speakers, twitters, links=links)
+    return speakers, twitters, True
+
+
+@timed('parse_seconds', page='schedule')
+def parse_schedule_json(data, links=None):
+    """
+    Find speakers (+ Twitter handles, if listed) in a Fahrplan's schedule.json.
+    :param data: the decoded JSON document
+    :param links: dictionary to add the speakers' links to, if listed
+    :return: Speakers, their Twitter handles (view of the Speakers),
+    whether links are listed
+    """
+    speakers = Speakers()
+    twitters = speakers.view('twitter')
+    has_links = False
+    for day in data['schedule']['conference']['days']:
+        for events in day['rooms'].values():
+            for event in events:
+                for person in event.get('persons', ()):
+                    has_links = has_links or 'links' in person
+                    add_schedule_person(person, speakers, twitters,
+                                        links=links)
+    return speakers, twitters, has_links
+
+
+@timed('parse_seconds', page='schedule')
+def parse_schedule_xml(chunks):
+    """
+    Find speakers in a Fahrplan's schedule.xml.
+
+    The document is parsed as it comes in and each <person> element is
+    discarded right after reading it, so the full tree is never built.
+    :param chunks: iterable of bytes or a file-like object
+    :return: Speakers, their Twitter handles (view of the Speakers),
+    whether links are listed
+    """
+    speakers = Speakers()
+    twitters = speakers.view('twitter')
+    parser = ElementTree.XMLPullParser(events=('end',))
+
+    if hasattr(chunks, 'read'):
+        chunks = iter(lambda: chunks.read(64 * 1024), b'')
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if element.tag == 'person':
+                add_schedule_person({'id': element.get('id'),
+                                     'name': (element.text or '').strip()},
+                                    speakers, twitters)
+            # events hold all persons; they can go once they are read
+            if element.tag in ('person', 'event', 'room', 'day'):
+                element.clear()
+    parser.close()
+    return speakers, twitters, False
+
+
+def find_speakers_schedule(speakers_base_url, client=None, cache=None,
+                           limiter=None, links=None):
+    """
+    Find speakers in the machine-readable version of a Fahrplan.
+
+    Tries speakers.json (lists speakers' links), schedule.json and
+    schedule.xml, in that order; one request and one parse
+    replace scraping speakers.html.
+    :param speakers_base_url: URL of the Fahrplan
+    :param client: FetchClient to send the requests with
+    :param cache: ResponseCache to revalidate/store the JSON documents with
+    :param limiter: RateLimiter for the requests
+    :param links: dictionary to add the speakers' links to, if listed
+    :return: speakers dictionary, twitters dictionary, whether links are
+    listed – or None if there is no machine-readable Fahrplan
+    """
+    for doc in ('speakers.json', 'schedule.json', 'schedule.xml'):
+        url = "{}{}".format(speakers_base_url, doc)
+        if limiter:
+            limiter.wait(url)
+        is_xml = doc.endswith('.xml')
+        data = open_website(url, client=client, cache=cache, stream=is_xml)
+        if not data:
+            continue
+
+        try:
+            if is_xml:
+                results = parse_schedule_xml(data)
+            else:
+                if hasattr(data, 'read'):
+                    data = data.read()
+                data = json.loads(data)
+                if doc == 'speakers.json':
+                    results = parse_speakers_json(data, links=links)
+                else:
+                    results = parse_schedule_json(data, links=links)
+        # account for documents in a different (older/newer) format
+        except (ValueError, KeyError, TypeError, AttributeError,
+                ElementTree.ParseError) as err:
+            print("Cannot read speakers from {}:".format(url))
+            print(err)
+            continue
+
+        if results[0]:
+            return results
+    return None
+
+
+def read_html(html_obj):
+    """Return the contents of an html object as a string.
+    :param html_obj: html string, bytes, file-like object (local files) or
+    iterable of bytes (see open_website's stream)
+    """
+    if hasattr(html_obj, 'read'):
+        html_obj = html_obj.read()
+    # chunks of a page handed over while it is downloaded
+    elif not isinstance(html_obj, (str, bytes)):
+        html_obj = b''.join(html_obj)
+    if isinstance(html_obj, bytes):
+        html_obj = html_obj.decode('utf-8', 'replace')
+    return html_obj
+
+
+def link_matches(href, needle):
+    """Check whether a link is one looked for.
+    :param href: URL of the link
+    :param needle: string the URL needs to contain, or compiled regex it
+    needs to match
+    """
+    if hasattr(needle, 'match'):
+        return needle.match(href) is not None
+    return needle in href
+
+
+class LinkScanner(HTMLParser):
+    """
+    Streaming scanner for <a> tags whose href contains a given string
+    (or matches a given regex).
+
+    Collects (href, text) of all matching anchors; with first_only set,
+    scanning stops right at the first matching anchor.
+    """
+
+    def __init__(self, needle, first_only=False):
+        """
+        :param needle: string the href of an anchor needs to contain,
+        or compiled regex it needs to match
+        :param first_only: stop after the first matching anchor
+        """
+        super().__init__(convert_charrefs=True)
+        self.needle = needle
+        self.first_only = first_only
+        self.links = []
+        self.done = False
+        # href + text of the matching anchor currently open
+        self.href = None
+        self.text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'a' or self.done:
+            return
+        href = dict(attrs).get('href')
+        if href and link_matches(href, self.needle):
+            if self.first_only:
+                self.links.append((href, ''))
+                self.done = True
+            else:
+                self.href = href
+                self.text = []
+
+    def handle_data(self, data):
+        if self.href is not None:
+            self.text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self.href is not None:
+            self.links.append((self.href, ''.join(self.text)))
+            self.href = None
+
+
+def links_soup(html_obj, needle, first_only=False):
+    """Find (href, text) of <a> tags with Beautiful Soup (html.parser)."""
+    # only look for <a> tags
+    parse_links = SoupStrainer('a')
+    # bytes are UTF-8, like for the other engines (instead of guessing)
+    encoding = 'utf-8' if isinstance(html_obj, bytes) else None
+    soup = BeautifulSoup(html_obj, 'html.parser', parse_only=parse_links,
+                         from_encoding=encoding)
+    links = []
+    for item in soup.find_all('a', href=True):
+        if link_matches(item['href'], needle):
+            links.append((item['href'], item.get_text()))
+            if first_only:
+                break
+    return links
+
+
+@functools.lru_cache(maxsize=None)
+def lxml_utf8_parser():
+    """Return an lxml html parser for UTF-8 bytes, built on first use."""
+    return lxml_html.HTMLParser(encoding='utf-8')
+
+
+def links_lxml(html_obj, needle, first_only=False):
+    """Find (href, text) of <a> tags with lxml."""
+    # bytes are parsed as they are instead of being decoded first
+    if isinstance(html_obj, bytes):
+        html = html_obj
+        parser = lxml_utf8_parser()
+    else:
+        html = read_html(html_obj)
+        parser = None
+    if not html.strip():
+        return []
+    links = []
+    for item in lxml_html.fromstring(html, parser=parser).iter('a'):
+        href = item.get('href')
+        if href and link_matches(href, needle):
+            links.append((href, item.text_content()))
+            if first_only:
+                break
+    return links
+
+
+def html_chunks(html_obj, size=8 * 1024):
+    """Return the contents of an html object piece by piece as strings.
+    :param html_obj: html string, bytes, file-like object (local files) or
+    iterable of bytes (see open_website's stream)
+    :param size: max. size of the pieces read at once
+    """
+    if isinstance(html_obj, str):
+        for i in range(0, len(html_obj), size):
+            yield html_obj[i:i + size]
+        return
+    if isinstance(html_obj, bytes):
+        html_obj = [html_obj]
+    elif hasattr(html_obj, 'read'):
+        html_obj = iter(functools.partial(html_obj.read, size), b'')
+    # characters may be split between two pieces
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    for chunk in html_obj:
+        if isinstance(chunk, str):
+            yield chunk
+        elif chunk:
+            yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+def stream_links(html_obj, needle, first_only=False):
+    """
+    Yield (href, text) of <a> tags with the streaming LinkScanner, as soon
+    as each of them is read; the page is never held in memory as a whole.
+    :param html_obj: html string, bytes, file-like object (local files) or
+    iterable of bytes (see open_website's stream)
+    :param needle: string the href of an anchor needs to contain,
+    or compiled regex it needs to match
+    :param first_only: stop after the first matching anchor
+    """
+    scanner = LinkScanner(needle, first_only=first_only)
+    # feed the page piece by piece so scanning can stop early
+    for chunk in html_chunks(html_obj):
+        scanner.feed(chunk)
+        # hand over what was found so far, and forget about it
+        yield from scanner.links
+        scanner.links.clear()
+        if scanner.done:
+            return
+    scanner.close()
+    yield from scanner.links
+
+
+def links_stream(html_obj, needle, first_only=False):
+    """Find (href, text) of <a> tags with the streaming LinkScanner."""
+    return list(stream_links(html_obj, needle, first_only=first_only))
+
+
+# html extraction engines
+ENGINES = {'soup': links_soup, 'lxml': links_lxml, 'stream': links_stream}
+
+
+def extraction_engine(engine=None):
+    """Return the function finding links for the requested engine.
+    :param engine: auto (lxml if installed, stream otherwise), soup,
+    lxml or stream
+    """
+    if not engine or engine == 'auto':
+        engine = 'lxml' if lxml_html else 'stream'
+    if engine == 'lxml' and not lxml_html:
+        raise ValueError("ERROR: The lxml engine requires lxml to be "
+                         "installed.")
+    try:
+        return ENGINES[engine]
+    except KeyError:
+        raise ValueError("ERROR: Engine needs to be one of auto, {}:\n"
+                         "{}".format(', '.join(sorted(ENGINES)), engine))
+
+
+@timed('parse_seconds', page='speakers')
+def find_speakers(html_obj, engine=None):
+    """
+    Find URLs to individual speakers pages in speakers.html
+    :param html_obj: the html object to parse
+    :param engine: html extraction engine to use (see extraction_engine)
+    :return: Speakers with their names
+    """
+    speakers = Speakers()
+    find_links = extraction_engine(engine)
+
+    # find all URLs that contain the string /speakers/
+    for href, value in find_links(html_obj, '/speakers/'):
+        # skip links without text (e.g. speakers' pictures)
+        if not value:
+            continue
+        # try to match speaker URL
+        try:
+            speaker_id = SPEAKER_URL_REGEX.match(href).group(1)
+            # debug
+            # print("{} : {}".format(speaker_id, value))
+            # save all speaker IDs and speaker names
+            speakers[speaker_id] = value
+        # account for malformed speaker URLs
+        except Exception as err:
+            print("Faulty URL for speaker: {}".format(href))
+            print(err)
+            return None
+
+    return speakers
+
+
+def iter_speakers(html_obj, engine=None, base_url=None):
+    """
+    Yield the speakers listed in speakers.html one by one, as soon as their
+    links are read, so later stages can start on the first speaker while
+    the listing is still being read. Malformed speaker URLs are skipped.
+    :param html_obj: the html object to parse; an iterable of bytes (see
+    open_website's stream) is read piece by piece
+    :param engine: html extraction engine to use (see extraction_engine);
+    only the stream engine (and auto) doesn't read the whole listing first
+    :param base_url: URL of the listing, to make profile URLs absolute
+    :return: generator of (speaker ID, name, profile URL)
+    """
+    if not engine or engine in ('auto', 'stream'):
+        links = stream_links(html_obj, '/speakers/')
+    else:
+        links = extraction_engine(engine)(html_obj, '/speakers/')
+
+    for href, value in links:
+        # skip links without text (e.g. speakers' pictures)
+        if not value:
+            continue
+        match = SPEAKER_URL_REGEX.match(href)
+        # skip malformed speaker URLs, the rest of the listing is still fine
+        if not match:
+            print(u"\u2717 Skipping faulty URL for speaker: {}".format(href))
+            continue
+        if base_url:
+            href = urllib.parse.urljoin(base_url, href)
+        yield int(match.group(1)), value, href
+
+
+@timed('parse_seconds', page='profile')
+def find_twitter_handle(html_obj, engine=None):
+    """
+    Find the Twitter handle linked to on a speaker profile.
+    :param html_obj: the html object to parse
+    :param engine: html extraction engine to use (see extraction_engine)
+    """
+    find_links = extraction_engine(engine)
+
+    # only the first link to a Twitter account is of interest
+    # (links to share buttons etc. are skipped)
+    for href, value in find_links(html_obj, TWITTER_URL_REGEX,
+                                  first_only=True):
+        return TWITTER_URL_REGEX.match(href).group(1)
+    return None
+
+
+@timed('parse_seconds', page='profile')
+def find_social_links(html_obj, engine=None):
+    """
+    Find all links to accounts (Twitter, GitHub, Bluesky, fediverse) and
+    websites on a speaker profile, in a single pass over the page.
+    :param html_obj: the html object to parse
+    :param engine: html extraction engine to use (see extraction_engine)
+    :return: list of (platform, account) in order of appearance
+    """
+    find_links = extraction_engine(engine)
+    return collect_links(find_links(html_obj, SOCIAL_LINK_REGEX))
+
+
+def parse_speaker_profile(url, client=None, cache=None, engine=None,
+                          links=None):
+    """
+    Parse a C3 speaker profile for a link to a Twitter account.
+    :param url: url to an individual speaker profile
+    :param client: FetchClient to send the request with (default: shared one)
+    :param cache: ResponseCache holding the results of previous runs
+    :param engine: html extraction engine to use (see extraction_engine)
+    :param links: list to add all links found on the profile to
+    (see find_social_links)
+    """
+
+    # try to open a speaker's profile page/file
+    html_obj, result = fetch_speaker_profile(url, client=client, cache=cache)
+
+    # profile didn't change since the last run:
+    # skip parsing and reuse the links found back then
+    if result is not None:
+        found = decode_links(result)
+    elif html_obj:
+        found = find_social_links(html_obj, engine=engine)
+
+        # remember the result for revalidated runs
+        if cache:
+            cache.store_result(url, encode_links(found))
+    else:
+        found = []
+
+    if links is not None:
+        links.extend(found)
+    return first_account(found)
+
+
+def fetch_speaker_profile(url, client=None, cache=None):
+    """
+    Download a C3 speaker profile (without parsing it).
+    :param url: url to an individual speaker profile
+    :param client: FetchClient to send the request with (default: shared one)
+    :param cache: ResponseCache holding the results of previous runs
+    :return: the profile's html (or None) and, if the profile didn't change
+    since the last run, the links found back then (see decode_links)
+    """
+    html_obj = open_website(url, client=client, cache=cache, raw=True)
+    result = None
+    if cache and url in cache.revalidated:
+        result = cache.revalidated[url]['result']
+        if result is not None:
+            _metrics.inc('cached_results_total')
+    return html_obj, result
+
+
+def crawl_speaker_profiles(speakers, speakers_base_url, file_ending,
+                           workers=4, limiter=None, client=None, cache=None,
+                           engine=None, callback=None, links=None):
+    """
+    Fetch speaker profiles concurrently and collect their Twitter handles.
+    :param speakers: dictionary containing speakers IDs and names, or
+    iterable of (speaker ID, name, profile URL) (see iter_speakers), whose
+    profiles are fetched while it is still being read
+    :param speakers_base_url: URL of the Fahrplan containing the speaker pages
+    :param file_ending: file ending used for speaker pages, e.g. .en.html
+    :param workers: max. number of profiles fetched at the same time
+    :param limiter: RateLimiter shared by all fetchers
+    :param client: FetchClient shared by all fetchers
+    :param cache: ResponseCache shared by all fetchers
+    :param engine: html extraction engine to use (see extraction_engine)
+    :param callback: function called with speaker ID + twitter handle (or
+    None) for every profile parsed
+    :param links: dictionary to add the links found on each profile to
+    :return: dictionary containing speakers IDs and twitter handles
+    """
+    twitters = {}
+    count_speakers = 1
+
+    if isinstance(speakers, collections.abc.Mapping):
+        total_speakers = len(speakers)
+        records = ((speaker_id, name, None)
+                   for speaker_id, name in speakers.items())
+    # no. of speakers not known until the listing is read
+    else:
+        total_speakers = None
+        records = speakers
+
+    if not limiter:
+        limiter = RateLimiter()
+
+    def fetch_profile(speaker_id, speaker_url):
+        if not speaker_url:
+            speaker_url = "{}speakers/{}{}".format(speakers_base_url,
+                                                   speaker_id, file_ending)
+        # wait for a free slot in the politeness budget
+        limiter.wait(speaker_url)
+        # return speaker's twitter handle if applicable
+        if links is None:
+            return parse_speaker_profile(speaker_url, client=client,
+                                         cache=cache, engine=engine)
+        profile_links = []
+        twitter_handle = parse_speaker_profile(
+            speaker_url, client=client, cache=cache, engine=engine,
+            links=profile_links)
+        links[speaker_id] = profile_links
+        return twitter_handle
+
+    def profile_done(future, speaker_id):
+        nonlocal count_speakers
+        # display the how-many-th speaker was queried
+        if total_speakers is None:
+            print("Speaker #{}".format(count_speakers))
+        else:
+            print("Speaker #{} of {}".format(count_speakers, total_speakers))
+        count_speakers += 1
+        try:
+            twitter_handle = future.result()
+        # a single failing profile must not take down the whole crawl
+        except Exception as err:
+            print("Could not parse profile of speaker {}:".format(
+                speaker_id))
+            print(err)
+            return
+        # and add it to the twitters dictionary
+        if twitter_handle:
+            print("Twitter: {}".format(twitter_handle))
+            twitters[speaker_id] = twitter_handle
+        if callback:
+            callback(speaker_id, twitter_handle)
+
+    workers = max(1, workers)
+    executor = concurrent_futures.ThreadPoolExecutor(max_workers=workers)
+    # speakers listed more than once are only fetched once
+    submitted = set()
+    futures = {}
+    try:
+        for speaker_id, name, speaker_url in records:
+            if speaker_id in submitted:
+                continue
+            submitted.add(speaker_id)
+            futures[executor.submit(fetch_profile, speaker_id,
+                                    speaker_url)] = speaker_id
+            # a long listing doesn't pile up profiles waiting to be fetched
+            if len(futures) < workers * 2:
+                continue
+            done, _ = concurrent_futures.wait(
+                futures, return_when=concurrent_futures.FIRST_COMPLETED)
+            for future in done:
+                profile_done(future, futures.pop(future))
+        for future in concurrent_futures.as_completed(futures):
+            profile_done(future, futures[future])
+    # interrupted: don't fetch the profiles still waiting in the queue
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+    return twitters
+
+
+def local_mirror(speakers_base_url):
+    """Return the speakers/ directory of a local Fahrplan mirror, if any.
+    :param speakers_base_url: URL (or path) of the Fahrplan
+    """
+    if urllib.parse.urlparse(speakers_base_url).netloc:
+        return None
+    speakers_dir = os.path.join(speakers_base_url, 'speakers')
+    if os.path.isdir(speakers_dir):
+        return speakers_dir
+    return None
+
+
+def parse_profile_file(path, engine=None):
+    """
+    Parse a speaker profile saved on disk for links to accounts + websites.
+    :param path: path to the profile file
+    :param engine: html extraction engine to use (see extraction_engine)
+    :return: list of (platform, account) (see find_social_links)
+    """
+    with open(path, 'rb') as profile:
+        return find_social_links(profile.read(), engine=engine)
+
+
+def crawl_local_mirror(speakers, speakers_dir, file_ending, processes=None,
+                       engine=None, callback=None, links=None):
+    """
+    Parse the speaker profiles of a local Fahrplan mirror in several
+    processes at once and collect their Twitter handles.
+    :param speakers: dictionary containing speakers IDs and names
+    :param speakers_dir: path to the mirror's speakers/ directory
+    :param file_ending: file ending used for speaker pages, e.g. .en.html
+    :param processes: no. of processes parsing profiles (default: no. of CPUs)
+    :param engine: html extraction engine to use (see extraction_engine)
+    :param callback: function called with speaker ID + twitter handle (or
+    None) for every profile parsed
+    :param links: dictionary to add the links found on each profile to
+    :return: dictionary containing speakers IDs and twitter handles
+    """
+    twitters = {}
+    processes = processes or os.cpu_count() or 1
+
+    # walk the directory once instead of opening each profile by its URL
+    # (file names hold the IDs as str, speakers may have them as int)
+    speaker_ids = {str(speaker_id): speaker_id for speaker_id in speakers}
+    profiles = {}
+    with os.scandir(speakers_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(file_ending):
+                speaker_id = entry.name[:-len(file_ending)]
+                if speaker_id in speaker_ids:
+                    profiles[speaker_ids[speaker_id]] = entry.path
+    for speaker_id in speakers:
+        if speaker_id not in profiles:
+            print(u"\u2717 No profile file for speaker {}".format(speaker_id))
+
+    speaker_ids = list(profiles)
+    paths = [profiles[speaker_id] for speaker_id in speaker_ids]
+    started = time.monotonic()
+    # hand the files to the processes in chunks to keep the overhead low
+    chunksize = max(1, len(paths) // (processes * 4))
+    with concurrent_futures.ProcessPoolExecutor(
+            max_workers=processes) as executor:
+        results = executor.map(parse_profile_file, paths,
+                               [engine] * len(paths), chunksize=chunksize)
+        for speaker_id, profile_links in zip(speaker_ids, results):
+            twitter_handle = first_account(profile_links)
+            if links is not None:
+                links[speaker_id] = profile_links
+            if twitter_handle:
+                print("Twitter: {}".format(twitter_handle))
+                twitters[speaker_id] = twitter_handle
+            if callback:
+                callback(speaker_id, twitter_handle)
+    elapsed = time.monotonic() - started
+
+    # throughput of the mirror crawl
+    print("{} profile file(s) parsed in {:.2f}s by {} process(es) "
+          "({:.0f} files/sec)".format(len(paths), elapsed, processes,
+                                      len(paths) / elapsed if elapsed else 0))
+    return twitters
+
+
+async def crawl_pipeline(speakers, speakers_base_url, file_ending, dir_path,
+                         db, table, workers=4, parsers=2, batch_size=50,
+                         flush_interval=1.0, limiter=None, client=None,
+                         cache=None, engine=None, callback=None,
+                         links=None):
+    """
+    Fetch, parse and save speaker profiles as overlapping stages.
+
+    Fetchers hand downloaded profiles to parsers (run in an executor),
+    which hand the Twitter handles + links found to a single DB writer.
+    The queues between the stages are bounded, so fetchers wait for slow
+    parsers and parsers for a slow writer instead of piling up pages in
+    memory. The writer commits handles in batches as they come in, so an
+    interrupted run keeps what it found so far (and can resume from its
+    checkpoint). Only the writer thread uses the db connection.
+    :param speakers: dictionary containing speakers IDs and names
+    :param speakers_base_url: URL of the Fahrplan containing the speaker pages
+    :param file_ending: file ending used for speaker pages, e.g. .en.html
+    :param dir_path: path to the directory containing the sqlite db
+    :param db: name of the DB to save the handles in
+    :param table: name of the table holding speakers' data
+    :param workers: max. number of profiles fetched at the same time
+    :param parsers: max. number of profiles parsed at the same time
+    :param batch_size: max. number of handles committed at once
+    :param flush_interval: max. no. of seconds handles wait to be committed
+    :param limiter: RateLimiter shared by all fetchers
+    :param client: FetchClient shared by all fetchers
+    :param cache: ResponseCache shared by all fetchers
+    :param engine: html extraction engine to use (see extraction_engine)
+    :param callback: function called with speaker ID + twitter handle (or
+    None) for every profile parsed
+    :param links: dictionary to add the links found on each profile to
+    :return: dictionary containing speakers IDs and twitter handles
+    """
+    twitters = {}
+    total_speakers = len(speakers)
+    workers = max(1, workers)
+    parsers = max(1, parsers)
+
+    if not limiter:
+        limiter = RateLimiter()
+
+    loop = asyncio.get_running_loop()
+    # blocking requests/parsing/sqlite calls run in their own threads;
+    # a single writer thread keeps all writes in order
+    fetch_pool = concurrent_futures.ThreadPoolExecutor(max_workers=workers)
+    parse_pool = concurrent_futures.ThreadPoolExecutor(max_workers=parsers)
+    write_pool = concurrent_futures.ThreadPoolExecutor(max_workers=1)
+    # pages waiting to be parsed, handles waiting to be saved
+    pages = asyncio.Queue(maxsize=workers * 2)
+    results = asyncio.Queue(maxsize=batch_size * 2)
+    speaker_ids = iter(list(speakers))
+
+    def fetch(speaker_url):
+        # wait for a free slot in the politeness budget
+        limiter.wait(speaker_url)
+        return fetch_speaker_profile(speaker_url, client=client, cache=cache)
+
+    async def fetcher():
+        # fetchers take turns taking the next speaker
+        for speaker_id in speaker_ids:
+            speaker_url = "{}speakers/{}{}".format(speakers_base_url,
+                                                   speaker_id, file_ending)
+            try:
+                html_obj, result = await loop.run_in_executor(
+                    fetch_pool, fetch, speaker_url)
+            # a single failing profile must not take down the whole crawl
+            except Exception as err:
+                print("Could not fetch profile of speaker {}:".format(
+                    speaker_id))
+                print(err)
+                continue
+            await pages.put((speaker_id, speaker_url, html_obj, result))
+
+    async def parser():
+        while True:
+            page = await pages.get()
+            if page is None:
+                break
+            speaker_id, speaker_url, html_obj, result = page
+            # profile didn't change since the last run
+            if result is not None:
+                profile_links = decode_links(result)
+            elif not html_obj:
+                profile_links = []
+            else:
+                try:
+                    profile_links = await loop.run_in_executor(
+                        parse_pool, find_social_links, html_obj, engine)
+                except Exception as err:
+                    print("Could not parse profile of speaker {}:".format(
+                        speaker_id))
+                    print(err)
+                    continue
+                # remember the result for revalidated runs
+                if cache:
+                    cache.store_result(speaker_url,
+                                       encode_links(profile_links))
+            await results.put((speaker_id, first_account(profile_links),
+                               profile_links))
+
+    def write(batch):
+        db_write(dir_path, db, table,
+                 twitter={speaker_id: twitter_handle
+                          for speaker_id, twitter_handle, profile_links
+                          in batch if twitter_handle})
+        db_write_links(dir_path, db, table,
+                       {speaker_id: profile_links
+                        for speaker_id, twitter_handle, profile_links
+                        in batch})
+        db_checked(dir_path, db, table,
+                   [speaker_id for speaker_id, twitter_handle, profile_links
+                    in batch], speakers=speakers)
+        # progress of the run, to resume it if it is interrupted
+        db_checkpoint(dir_path, db, table,
+                      [(speaker_id, twitter_handle)
+                       for speaker_id, twitter_handle, profile_links
+                       in batch],
+                      links={speaker_id: profile_links
+                             for speaker_id, twitter_handle, profile_links
+                             in batch})
+
+    async def writer():
+        count_speakers = 1
+        batch = []
+        done = False
+        while not done:
+            try:
+                result = await asyncio.wait_for(results.get(),
+                                                timeout=flush_interval)
+            except asyncio.TimeoutError:
+                result = False
+            # interrupted: keep what came in since the last commit
+            except asyncio.CancelledError:
+                if batch:
+                    write(batch)
+                raise
+            if result is None:
+                done = True
+            elif result:
+                speaker_id, twitter_handle, profile_links = result
+                # display the how-many-th speaker was queried
+                print("Speaker #{} of {}".format(count_speakers,
+                                                 total_speakers))
+                count_speakers += 1
+                if twitter_handle:
+                    print("Twitter: {}".format(twitter_handle))
+                    twitters[speaker_id] = twitter_handle
+                if links is not None:
+                    links[speaker_id] = profile_links
+                if callback:
+                    callback(speaker_id, twitter_handle)
+                batch.append(result)
+            # commit full batches, and whatever came in when things are slow
+            if batch and (done or result is False
+                          or len(batch) >= batch_size):
+                await loop.run_in_executor(write_pool, write, batch)
+                batch = []
+
+    fetchers = [asyncio.ensure_future(fetcher()) for i in range(workers)]
+    parse_tasks = [asyncio.ensure_future(parser()) for i in range(parsers)]
+    write_task = asyncio.ensure_future(writer())
+    try:
+        await asyncio.gather(*fetchers)
+        for i in range(parsers):
+            await pages.put(None)
+        await asyncio.gather(*parse_tasks)
+        await results.put(None)
+        await write_task
+    finally:
+        for task in fetchers + parse_tasks + [write_task]:
+            task.cancel()
+        for pool in (fetch_pool, parse_pool, write_pool):
+            pool.shutdown(wait=True)
+
+    return twitters
+
+
+def run_pipeline(*args, **kwargs):
+    """Run crawl_pipeline() to completion (see there for parameters)."""
+    return asyncio.run(crawl_pipeline(*args, **kwargs))
+
+
+# sqlite connections kept open for the whole run, one per db file
+_db_connections = {}
+_db_lock = threading.Lock()
+
+# pragmas applied to new connections, by profile
+# -> bulk trades durability on power loss for faster bulk imports
+DB_PRAGMAS = {
+    'default': (),
+    'bulk': ("PRAGMA journal_mode=WAL",
+             "PRAGMA synchronous=NORMAL",
+             "PRAGMA temp_store=MEMORY"),
+}
+
+
+def db_connection(dir_path, db_name, profile='default'):
+    """Return the run's connection to a DB, opening it on first use.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to connect to
+    :param profile: pragma profile for new connections (default or bulk)
+    """
+    db_path = dir_path + db_name
+    with _db_lock:
+        db = _db_connections.get(db_path)
+        if db is None:
+            db = sqlite3.connect(db_path, check_same_thread=False)
+            for pragma in DB_PRAGMAS[profile]:
+                db.execute(pragma)
+            _db_connections[db_path] = db
+    return db
+
+
+def db_close():
+    """Close all DB connections opened during the run."""
+    with _db_lock:
+        for db in _db_connections.values():
+            db.close()
+        _db_connections.clear()
+
+
+def db_connect(dir_path, db_name, table, year, profile='default'):
+    """Create / connect to SQLite database.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to connect to
+    :param table: name of the table to create for speakers' data
+    :param year: year YYYY
+    :param profile: pragma profile for the connection (default or bulk)
+    """
+    db_file = "{}{}.sqlite".format(db_name, year)
+
+    # try to connect to the sqlite database;
+    # if the path is writeable and the file doesn't exist yet,
+    # a sqlite db with the requested name be created
+    try:
+        db = db_connection(dir_path, db_file, profile=profile)
+    except sqlite3.OperationalError:
+        print("ERROR: Cannot connect to database.")
+        return None
+
+    # create table for speakers if there is none yet
+    try:
+        with db:
+            db.execute("CREATE TABLE IF NOT EXISTS {} "
+                       "(id INTEGER PRIMARY KEY, name TEXT, twitter TEXT, "
+                       "last_checked TEXT, checked_name TEXT)".format(table))
+            # tables created by older versions lack the date of the last check
+            columns = [row[1] for row in
+                       db.execute("PRAGMA table_info({})".format(table))]
+            if 'last_checked' not in columns:
+                db.execute("ALTER TABLE {} ADD COLUMN last_checked TEXT"
+                           .format(table))
+            # ... and the name listed when the profile was last checked
+            if 'checked_name' not in columns:
+                db.execute("ALTER TABLE {} ADD COLUMN checked_name TEXT"
+                           .format(table))
+            # profiles done by the current run (to resume interrupted runs)
+            db.execute("CREATE TABLE IF NOT EXISTS {}_checkpoint "
+                       "(id INTEGER PRIMARY KEY, twitter TEXT, links TEXT)"
+                       .format(table))
+            # checkpoints of older versions lack the links found
+            columns = [row[1] for row in db.execute(
+                "PRAGMA table_info({}_checkpoint)".format(table))]
+            if 'links' not in columns:
+                db.execute("ALTER TABLE {}_checkpoint ADD COLUMN links TEXT"
+                           .format(table))
+            # all accounts + websites linked to on speakers' profiles
+            db.execute("CREATE TABLE IF NOT EXISTS {}_links "
+                       "(id INTEGER, platform TEXT, account TEXT, "
+                       "PRIMARY KEY (id, platform, account))".format(table))
+    except sqlite3.OperationalError as err:
+        # changes are rolled back on problems with db statement
+        print("Could not query the database as requested.")
+        print(str(err))
+
+    return db_file
+
+
+@timed('db_read_seconds', op='query')
+def db_query(dir_path, db_name, table, column=None):
+    """Query table in DB.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to operate on
+    :param table: name of the to-be-modified table holding speakers' data
+    :param column: table column to query
+    :return: Speakers mapped to the column's values (both names and
+    Twitter handles are read), or None if there are none
+    """
+    results = Speakers(field=column or 'name')
+
+    # reuse the run's connection to the sqlite database;
     # as the connect was already checked, this should not result in a new file
     try:
-        db = sqlite3.connect(dir_path + db_name)
+        db = db_connection(dir_path, db_name)
+    except sqlite3.OperationalError:
+        print("ERROR: Cannot connect to database.")
+        return None
+
+    # check for validity of table column provided by user
+    if not column:
+        column = 'id'
+    elif column != 'name' and column != 'twitter':
+        print("ERROR: The provided table column is not valid. Exiting.")
+        sys.exit(1)
+
+    # query table for provided column
+    try:
+        rows = db.execute("SELECT id, name, twitter FROM {} "
+                          "WHERE {} != '' ".format(table, column))
+        for speaker_id, name, twitter in rows:
+            results.add(speaker_id, name, twitter)
+        # if there are any results, return them as a dictionary
+        if results:
+            return results
+    except sqlite3.OperationalError as err:
+        print("Could not query the database as requested.")
+        print(str(err))
+
+
+@timed('db_write_seconds', op='write')
+def db_write(dir_path, db_name, table, speakers=None, twitter=None):
+    """Update table in DB.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to operate on
+    :param table: name of the to-be-modified table holding speakers' data
+    :param speakers: Speakers (or dictionary) of speakers IDs and names
+    :param twitter: Speakers (or dictionary) of speakers IDs and twitter
+    handles
+    """
+
+    # reuse the run's connection to the sqlite database;
+    # as the connect was already checked, this should not result in a new file
+    try:
+        db = db_connection(dir_path, db_name)
     except sqlite3.OperationalError:
         print("ERROR: Cannot connect to database.")
         return None
@@ -414,83 +2576,1154 @@ def db_write(dir_path, db_name, table, speakers=None, twitter=None):
     # insert data into table for speakers
     # -> existing speakers and twitter handles are not auto-removed!!
     # but they are printed out
+    # all rows of a call are written in one transaction, with one
+    # (cached, prepared) statement per kind of write
+    try:
+        with db:
+            # if speakers dict was provided, insert IDs and names of speakers
+            # if speaker already exists, their name isn't updated/reinserted
+            if speakers:
+                db.executemany("INSERT OR IGNORE INTO {} (id, name) "
+                               "VALUES (?, ?)".format(table),
+                               speaker_rows(speakers))
+            # if twitter dict was provided, insert twitter handles of speakers
+            # if speaker already has a twitter handle, it doesn't get updated
+            if twitter:
+                db.executemany("UPDATE {} SET twitter=? "
+                               "WHERE id=? AND twitter is NULL".format(table),
+                               ((twitter_handle, speaker_id)
+                                for speaker_id, twitter_handle
+                                in speaker_rows(twitter)))
+    except sqlite3.OperationalError as err:
+        # changes are rolled back on problems with db statement
+        print("Could not query the database as requested.")
+        print(str(err))
+
+
+@timed('db_read_seconds', op='count')
+def db_count(dir_path, db_name, table, column='name'):
+    """Count speakers in DB with a value for the given column.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to operate on
+    :param table: name of the table holding speakers' data
+    :param column: table column to count values of (name or twitter)
+    """
+    if column not in ('name', 'twitter'):
+        print("ERROR: The provided table column is not valid. Exiting.")
+        sys.exit(1)
+
+    try:
+        db = db_connection(dir_path, db_name)
+        return db.execute("SELECT count(id) FROM {} "
+                          "WHERE {} != ''".format(table, column)).fetchone()[0]
+    except sqlite3.OperationalError as err:
+        print("Could not query the database as requested.")
+        print(str(err))
+        return 0
+
+
+def db_stage(db, table, speakers, twitters=None, checked=None):
+    """Load new values into a temporary staging table next to table.
+    :param db: connection to the DB
+    :param table: name of the table holding speakers' data
+    :param speakers: dictionary containing (new) speakers IDs and names
+    :param twitters: dictionary containing (new) speakers IDs + twitter handles
+    :param checked: IDs of speakers whose profiles were checked (default: all)
+    :return: name of the staging table
+    """
+    staging = "staging_{}".format(table)
+    twitters = twitters or {}
+    with db:
+        db.execute("CREATE TEMP TABLE IF NOT EXISTS {} "
+                   "(id INTEGER PRIMARY KEY, name TEXT, twitter TEXT, "
+                   "checked INTEGER)".format(staging))
+        db.execute("DELETE FROM {}".format(staging))
+        db.executemany("INSERT INTO {} (id, name, twitter, checked) "
+                       "VALUES (?, ?, ?, ?)".format(staging),
+                       ((int(speaker_id), name, twitters.get(speaker_id),
+                         checked is None or speaker_id in checked)
+                        for speaker_id, name in speakers.items()))
+    return staging
+
+
+@timed('db_diff_seconds')
+def db_diff(dir_path, db_name, table, speakers, twitters, checked=None):
+    """
+    Compare DB values with new values, inside the DB.
+
+    The new values are loaded into a temporary staging table and all
+    differences are found by joining it with the speakers table, so only
+    the changes (not the whole table) end up in Python's memory.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to operate on
+    :param table: name of the table holding speakers' data
+    :param speakers: dictionary containing (new) speakers IDs and names
+    :param twitters: dictionary containing (new) speakers IDs + twitter handles
+    :param checked: IDs of speakers whose profiles were checked (default: all);
+    Twitter handles of other speakers aren't compared
+    :return: changed speakers {id: (db name, new name)},
+    deleted speakers {id: db name}, new speakers {id: new name},
+    changed Twitter handles {id: (db handle, new handle)},
+    deleted Twitter handles {id: db handle}
+    """
+    s_changed = {}
+    s_deleted = {}
+    s_new = {}
+    t_changed = {}
+    t_deleted = {}
+
+    try:
+        db = db_connection(dir_path, db_name)
+        staging = db_stage(db, table, speakers, twitters, checked)
+
+        # one pass over both tables:
+        # speakers in DB which differ from/are missing in the new values
+        # + new speakers not in DB yet
+        rows = db.execute(
+            "SELECT s.id, s.name, s.twitter, n.id, n.name, n.twitter, "
+            "n.checked "
+            "FROM {table} AS s LEFT JOIN {staging} AS n ON n.id = s.id "
+            "WHERE s.name != '' AND (n.id IS NULL OR s.name IS NOT n.name "
+            "OR (s.twitter != '' AND n.checked "
+            "AND s.twitter IS NOT n.twitter)) "
+            "UNION ALL "
+            "SELECT NULL, NULL, NULL, n.id, n.name, n.twitter, n.checked "
+            "FROM {staging} AS n WHERE NOT EXISTS "
+            "(SELECT 1 FROM {table} AS s WHERE s.id = n.id)"
+            .format(table=table, staging=staging))
+
+        for (db_id, db_name_, db_twitter,
+             new_id, new_name, new_twitter, new_checked) in rows:
+            if db_id is None:
+                s_new[new_id] = new_name
+                continue
+            speaker_id = db_id
+            # IDs in DB that are not listed in the Fahrplan anymore
+            if new_id is None:
+                s_deleted[speaker_id] = db_name_
+            # name changes
+            elif db_name_ != new_name:
+                s_changed[speaker_id] = (db_name_, new_name)
+            if db_twitter and (new_id is None or new_checked):
+                # speakers which used to have a Twitter handle but don't anymore
+                if not new_twitter:
+                    t_deleted[speaker_id] = db_twitter
+                # Twitter handle changes
+                elif db_twitter != new_twitter:
+                    t_changed[speaker_id] = (db_twitter, new_twitter)
+
+        db.execute("DELETE FROM {}".format(staging))
+    except sqlite3.OperationalError as err:
+        print("Could not query the database as requested.")
+        print(str(err))
+
+    return s_changed, s_deleted, s_new, t_changed, t_deleted
+
+
+@timed('db_read_seconds', op='stale')
+def db_stale(dir_path, db_name, table, speakers, max_age=24):
+    """Find speakers whose profiles need to be (re)checked.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to operate on
+    :param table: name of the table holding speakers' data
+    :param speakers: dictionary containing (new) speakers IDs and names
+    :param max_age: no. of hours after which a profile is checked again
+    :return: set of IDs of new or renamed speakers, and speakers whose
+    profiles haven't been checked within max_age hours
+    (renamed: listed under another name than when last checked, as the
+    name saved first is kept, see db_checked)
+    """
+    stale = set(int(speaker_id) for speaker_id in speakers)
+    try:
+        db = db_connection(dir_path, db_name)
+        staging = db_stage(db, table, speakers)
+        rows = db.execute(
+            "SELECT n.id FROM {staging} AS n "
+            "LEFT JOIN {table} AS s ON s.id = n.id "
+            "WHERE s.id IS NULL "
+            "OR COALESCE(s.checked_name, s.name) IS NOT n.name "
+            "OR s.last_checked IS NULL OR s.last_checked <= datetime('now', ?)"
+            .format(table=table, staging=staging),
+            ("-{} hours".format(max_age),))
+        stale = set(row[0] for row in rows)
+        db.execute("DELETE FROM {}".format(staging))
+    except sqlite3.OperationalError as err:
+        print("Could not query the database as requested.")
+        print(str(err))
+    return stale
+
+
+@timed('db_write_seconds', op='checked')
+def db_checked(dir_path, db_name, table, speaker_ids, speakers=None):
+    """Record that speakers' profiles were checked just now.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to operate on
+    :param table: name of the table holding speakers' data
+    :param speaker_ids: IDs of the checked speakers
+    :param speakers: Speakers (or dictionary) with the names the checked
+    speakers are listed under, so renamed speakers aren't due for a check
+    again on the next run (see db_stale)
+    """
+    speakers = speakers or {}
+    try:
+        db = db_connection(dir_path, db_name)
+        with db:
+            db.executemany("UPDATE {} SET last_checked = datetime('now'), "
+                           "checked_name = ? WHERE id = ?".format(table),
+                           ((speakers.get(speaker_id), int(speaker_id))
+                            for speaker_id in speaker_ids))
+    except sqlite3.OperationalError as err:
+        print("Could not query the database as requested.")
+        print(str(err))
+
+
+@timed('db_write_seconds', op='links')
+def db_write_links(dir_path, db_name, table, links):
+    """Save the links found on speakers' profiles.
+
+    A speaker's links replace the ones saved before, so links removed
+    from a profile are removed from the DB as well.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to operate on
+    :param table: name of the table holding speakers' data
+    :param links: dictionary with speaker IDs + lists of (platform, account)
+    """
+    if not links:
+        return
+    try:
+        db = db_connection(dir_path, db_name)
+        with db:
+            db.executemany("DELETE FROM {}_links WHERE id = ?".format(table),
+                           ((int(speaker_id),) for speaker_id in links))
+            db.executemany("INSERT OR IGNORE INTO {}_links "
+                           "(id, platform, account) VALUES (?, ?, ?)"
+                           .format(table),
+                           ((int(speaker_id), platform, account)
+                            for speaker_id, profile_links in links.items()
+                            for platform, account in profile_links))
+    except sqlite3.OperationalError as err:
+        print("Could not query the database as requested.")
+        print(str(err))
+
+
+@timed('db_read_seconds', op='links')
+def db_query_links(dir_path, db_name, table, platform=None):
+    """Return the links saved for speakers.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to operate on
+    :param table: name of the table holding speakers' data
+    :param platform: only return the accounts of this platform
+    :return: dictionary with speaker IDs + lists of (platform, account)
+    """
+    links = {}
+    query = "SELECT id, platform, account FROM {}_links".format(table)
+    params = ()
+    if platform:
+        query += " WHERE platform = ?"
+        params = (platform,)
+    try:
+        db = db_connection(dir_path, db_name)
+        for speaker_id, link_platform, account in db.execute(
+                query + " ORDER BY id, rowid", params):
+            links.setdefault(speaker_id, []).append(
+                (link_platform, account))
+    except sqlite3.OperationalError as err:
+        print("Could not query the database as requested.")
+        print(str(err))
+    return links
+
+
+@timed('db_write_seconds', op='checkpoint')
+def db_checkpoint(dir_path, db_name, table, results, links=None):
+    """Record profiles done by the current run.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to operate on
+    :param table: name of the table holding speakers' data
+    :param results: speaker IDs + Twitter handles (None if there is none)
+    :param links: dictionary with the speakers' lists of (platform,
+    account), saved along with their handles
+    """
+    links = links or {}
+    try:
+        db = db_connection(dir_path, db_name)
+        with db:
+            db.executemany("INSERT OR REPLACE INTO {}_checkpoint "
+                           "(id, twitter, links) VALUES (?, ?, ?)"
+                           .format(table),
+                           ((int(speaker_id), twitter_handle,
+                             encode_links(links[speaker_id])
+                             if speaker_id in links else None)
+                            for speaker_id, twitter_handle in results))
+    except sqlite3.OperationalError as err:
+        print("Could not query the database as requested.")
+        print(str(err))
+
+
+@timed('db_read_seconds', op='resume')
+def db_resume(dir_path, db_name, table, links=None):
+    """Return the profiles done by an interrupted run.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to operate on
+    :param table: name of the table holding speakers' data
+    :param links: dictionary to add the links found on the profiles to
+    (profiles checkpointed without their links are left out, so that
+    they are fetched again)
+    :return: dictionary with speaker IDs + Twitter handles (or None)
+    """
+    done = {}
+    try:
+        db = db_connection(dir_path, db_name)
+        for speaker_id, twitter_handle, result in db.execute(
+                "SELECT id, twitter, links FROM {}_checkpoint".format(table)):
+            if links is not None:
+                if result is None:
+                    continue
+                links[speaker_id] = decode_links(result)
+            done[speaker_id] = twitter_handle
+        return done
+    except sqlite3.OperationalError as err:
+        print("Could not query the database as requested.")
+        print(str(err))
+        return {}
+
+
+def db_checkpoint_clear(dir_path, db_name, table):
+    """Forget the profiles done by the previous run.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB to operate on
+    :param table: name of the table holding speakers' data
+    """
+    try:
+        db = db_connection(dir_path, db_name)
+        with db:
+            db.execute("DELETE FROM {}_checkpoint".format(table))
+    except sqlite3.OperationalError as err:
+        print("Could not query the database as requested.")
+        print(str(err))
+
+
+def compare_values(db_values, new_values):
+    """
+    Compare DB values with new values.
+    :param db_values: values in the database (Speakers or dictionary)
+    :param new_values: new values retrieved by (re)parsing website
+    (Speakers or dictionary)
+    :return: Speakers with all changed values + Speakers with all deleted
+    values
+    """
+
+    field = getattr(db_values, 'field', 'name')
+    changed = Speakers(field=field)
+    deleted = Speakers(field=field)
+    # NoneType on empty dictionaries
+    if db_values is None or new_values is None:
+        return changed, deleted
+    try:
+        # speakers are looked up by ID, as int or str alike
+        if not isinstance(new_values, Speakers):
+            new_values = Speakers(new_values, field=field)
+        for speaker_id, value_db in speaker_rows(db_values):
+            value = new_values.get(speaker_id)
+
+            # IDs in DB that are
+            # - not listed in the Fahrplan anymore
+            # - which used to have a Twitter handle but don't anymore
+            # (one warning per ID, to avoid duplicate msgs for missing
+            # Twitter handles of speakers who were removed from Fahrplan)
+            if value is None:
+                deleted[speaker_id] = value_db
+
+            # DB values that differ from retrieved values
+            # (applies to name changes, Twitter handle changes)
+            elif value != value_db:
+                changed[speaker_id] = value
+        return changed, deleted
+    # unforseen exception
+    except Exception as err:
+        print("An unexpected error occurred on line {}:".format(
+            sys.exc_info()[-1].tb_lineno))
+        print(err)
+        sys.exit(1)
+
+
+def archive_connect(dir_path, archive_name, profile='default'):
+    """Create / connect to the archive DB holding all congresses.
+    :param dir_path: path to the directory containing the sqlite db
+    :param archive_name: name of the archive DB
+    :param profile: pragma profile for the connection (default or bulk)
+    """
+    archive_file = "{}.sqlite".format(archive_name)
+
+    try:
+        db = db_connection(dir_path, archive_file, profile=profile)
+    except sqlite3.OperationalError:
+        print("ERROR: Cannot connect to archive database.")
+        return None
+
+    # speakers + handles per congress, with the dates they were first/last
+    # seen in its Fahrplan; the primary keys start with the year so
+    # year-based queries only touch one congress's rows
+    try:
+        with db:
+            db.execute("CREATE TABLE IF NOT EXISTS congresses "
+                       "(year INTEGER PRIMARY KEY, c3_no INTEGER)")
+            db.execute("CREATE TABLE IF NOT EXISTS speakers "
+                       "(year INTEGER, speaker_id INTEGER, name TEXT, "
+                       "first_seen TEXT, last_seen TEXT, "
+                       "PRIMARY KEY (year, speaker_id)) WITHOUT ROWID")
+            db.execute("CREATE TABLE IF NOT EXISTS handles "
+                       "(year INTEGER, speaker_id INTEGER, handle TEXT, "
+                       "first_seen TEXT, last_seen TEXT, "
+                       "PRIMARY KEY (year, speaker_id, handle)) WITHOUT ROWID")
+            # cross-year lookups by speaker + by handle
+            db.execute("CREATE INDEX IF NOT EXISTS speakers_speaker_id "
+                       "ON speakers (speaker_id, year)")
+            db.execute("CREATE INDEX IF NOT EXISTS handles_speaker_id "
+                       "ON handles (speaker_id, year)")
+            db.execute("CREATE INDEX IF NOT EXISTS handles_handle "
+                       "ON handles (handle COLLATE NOCASE, year)")
+    except sqlite3.OperationalError as err:
+        print("Could not query the database as requested.")
+        print(str(err))
+
+    return archive_file
+
+
+def archive_write(dir_path, archive_db, year, c3_no, speakers=None,
+                  twitter=None, seen=None):
+    """Record speakers + Twitter handles of a congress in the archive.
+    :param dir_path: path to the directory containing the sqlite db
+    :param archive_db: name of the archive DB
+    :param year: year YYYY of the congress
+    :param c3_no: no. of the congress
+    :param speakers: dictionary containing speakers IDs and names
+    :param twitter: dictionary containing speakers IDs and twitter handles
+    :param seen: date the values were found (default: today)
+    """
+    seen = seen or date.today().isoformat()
+    year = int(year)
+
+    try:
+        db = db_connection(dir_path, archive_db)
+        with db:
+            db.execute("INSERT OR IGNORE INTO congresses (year, c3_no) "
+                       "VALUES (?, ?)", (year, int(c3_no)))
+            if speakers:
+                db.executemany(
+                    "INSERT INTO speakers "
+                    "(year, speaker_id, name, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (year, speaker_id) DO UPDATE SET "
+                    "name = excluded.name, "
+                    "first_seen = min(first_seen, excluded.first_seen), "
+                    "last_seen = max(last_seen, excluded.last_seen)",
+                    ((year, int(speaker_id), name, seen, seen)
+                     for speaker_id, name in speakers.items()))
+            if twitter:
+                db.executemany(
+                    "INSERT INTO handles "
+                    "(year, speaker_id, handle, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (year, speaker_id, handle) DO UPDATE SET "
+                    "first_seen = min(first_seen, excluded.first_seen), "
+                    "last_seen = max(last_seen, excluded.last_seen)",
+                    ((year, int(speaker_id), handle, seen, seen)
+                     for speaker_id, handle in twitter.items()))
+    except sqlite3.OperationalError as err:
+        print("Could not query the database as requested.")
+        print(str(err))
+
+
+def archive_import(dir_path, db_name, table, archive_db):
+    """Bulk-load all per-year speaker DBs into the archive.
+    :param dir_path: path to the directory containing the sqlite dbs
+    :param db_name: name of the per-year DBs (without year)
+    :param table: name of the table holding speakers' data
+    :param archive_db: name of the archive DB
+    :return: dictionary with the no. of speakers imported per year
+    """
+    imported = {}
+    db_file_regex = re.compile(r"^{}((19|20)[0-9]{{2}})\.sqlite$".format(
+        re.escape(db_name)))
+    db = db_connection(dir_path, archive_db)
+
+    for db_file in sorted(os.listdir(dir_path)):
+        db_file_data = db_file_regex.match(db_file)
+        if not db_file_data:
+            continue
+        # DBs named after years without a congress are left out
+        try:
+            year, c3_no = congress_data(year=db_file_data.group(1))
+        except ValueError:
+            print(u"\u2717 Skipping {}: not a congress year".format(db_file))
+            continue
+        # the per-year DBs don't know when values were found;
+        # their last modification is the best guess
+        seen = date.fromtimestamp(
+            os.path.getmtime(dir_path + db_file)).isoformat()
+
+        # copy each DB's rows in one go, without going through Python
+        try:
+            db.execute("ATTACH DATABASE ? AS year_db", (dir_path + db_file,))
+            try:
+                with db:
+                    db.execute("INSERT OR IGNORE INTO congresses "
+                               "(year, c3_no) VALUES (?, ?)", (year, c3_no))
+                    db.execute(
+                        "INSERT INTO speakers "
+                        "(year, speaker_id, name, first_seen, last_seen) "
+                        "SELECT ?, id, name, ?, ? FROM year_db.{} "
+                        "WHERE name != '' "
+                        "ON CONFLICT (year, speaker_id) DO UPDATE SET "
+                        "first_seen = min(first_seen, excluded.first_seen), "
+                        "last_seen = max(last_seen, excluded.last_seen)"
+                        .format(table), (year, seen, seen))
+                    db.execute(
+                        "INSERT INTO handles "
+                        "(year, speaker_id, handle, first_seen, last_seen) "
+                        "SELECT ?, id, twitter, ?, ? FROM year_db.{} "
+                        "WHERE twitter != '' "
+                        "ON CONFLICT (year, speaker_id, handle) DO UPDATE SET "
+                        "first_seen = min(first_seen, excluded.first_seen), "
+                        "last_seen = max(last_seen, excluded.last_seen)"
+                        .format(table), (year, seen, seen))
+                imported[year] = db.execute(
+                    "SELECT count(*) FROM year_db.{}".format(table)
+                ).fetchone()[0]
+            finally:
+                db.execute("DETACH DATABASE year_db")
+        except sqlite3.OperationalError as err:
+            print("Could not import {}:".format(db_file))
+            print(str(err))
+
+    return imported
+
+
+def archive_returning(dir_path, archive_db, since_year):
+    """Find speakers who spoke at more than one congress since a given year.
+    :param dir_path: path to the directory containing the sqlite db
+    :param archive_db: name of the archive DB
+    :param since_year: first year YYYY to consider
+    :return: dictionary {speaker ID: list of years}
+    """
+    returning = {}
+    db = db_connection(dir_path, archive_db)
+    rows = db.execute("SELECT speaker_id, group_concat(year) FROM "
+                      "(SELECT speaker_id, year FROM speakers "
+                      "WHERE year >= ? ORDER BY speaker_id, year) "
+                      "GROUP BY speaker_id HAVING count(*) > 1",
+                      (int(since_year),))
+    for speaker_id, years in rows:
+        returning[speaker_id] = [int(year) for year in years.split(',')]
+    return returning
+
+
+def archive_churn(dir_path, archive_db):
+    """Count Twitter handles per congress which are new/gone since the last.
+    :param dir_path: path to the directory containing the sqlite db
+    :param archive_db: name of the archive DB
+    :return: list of (year, no. of handles, new handles, dropped handles)
+    """
+    db = db_connection(dir_path, archive_db)
+    # compare each congress's handles with the ones of the previous
+    # archived congress
+    rows = db.execute(
+        "WITH years AS (SELECT year, lag(year) OVER (ORDER BY year) AS prev "
+        "FROM congresses) "
+        "SELECT y.year, "
+        "(SELECT count(*) FROM handles h WHERE h.year = y.year), "
+        "(SELECT count(*) FROM handles h WHERE h.year = y.year AND "
+        "y.prev IS NOT NULL AND NOT EXISTS (SELECT 1 FROM handles p "
+        "WHERE p.year = y.prev AND p.handle = h.handle COLLATE NOCASE)), "
+        "(SELECT count(*) FROM handles p WHERE p.year = y.prev AND "
+        "NOT EXISTS (SELECT 1 FROM handles h "
+        "WHERE h.year = y.year AND h.handle = p.handle COLLATE NOCASE)) "
+        "FROM years y ORDER BY y.year")
+    return rows.fetchall()
+
+
+def congress_range(value):
+    """Return year + congress no. of all congresses in a range.
+    :param value: range of years or c3 shortcuts, e.g. 2010-2015 or 27c3-32c3
+    """
     try:
-        cur = db.cursor()
-        # if speakers dict was provided, insert IDs and names of speakers
-        # if speaker already exists, their name isn't updated/reinserted
-        if speakers:
-            for speaker_id, speaker_name in speakers.items():
-                cur.execute("INSERT INTO {} (id, name) "
-                            "SELECT ?, ? WHERE NOT EXISTS "
-                            "(SELECT * FROM {} WHERE id = ?)".format(table,
-                                                                     table),
-                            (int(speaker_id), speaker_name, int(speaker_id))
-                            )
-            cur.execute("SELECT Count(*) FROM {}".format(table))
-            db.commit()
-        # if twitter dict was provided, insert IDs and twitter handles of speakers
-        # if speaker already has a witter handle, it doesn't get updated/reinserted
-        elif twitter:
-            for speaker_id, twitter in twitter.items():
-                cur.execute("UPDATE {} SET twitter=? "
-                            "WHERE id=? AND twitter is NULL".format(table),
-                            (twitter, int(speaker_id))
-                            )
-            cur.execute(
-                "SELECT Count(twitter) FROM {} WHERE twitter is not NULL".format(
-                    table))
-            db.commit()
-    except sqlite3.OperationalError as err:
-        # rollback on problems with db statement
-        print("Could not query the database as requested.")
-        print(str(err))
-        db.rollback()
-    finally:
-        db.close()
+        first, last = value.split('-')
+    except ValueError:
+        raise ValueError("ERROR: Range needs to be given as "
+                         "YYYY-YYYY or xxC3-xxC3:\n{}".format(value))
+    congresses = []
+    for boundary in (first, last):
+        if 'c3' in boundary.lower():
+            congresses.append(congress_data(c3_shortcut=boundary))
+        else:
+            congresses.append(congress_data(year=boundary))
+    (first_year, first_c3_no), (last_year, last_c3_no) = congresses
+    if first_year > last_year:
+        raise ValueError("ERROR: Range needs to start with the earlier "
+                         "congress:\n{}".format(value))
+    return [(first_year + n, first_c3_no + n)
+            for n in range(last_year - first_year + 1)]
 
 
-def compare_values(db_values, new_values):
+def summary_table(summaries):
+    """Return a table (list of lines) summing up the crawled congresses.
+    :param summaries: list of dictionaries as returned by Crawler.congress
     """
-    Compare DB values with new values.
-    :param db_values: values in the database
-    :param new_values: new values retrieved by (re)parsing website
-    :return: list with all changed values + list with all deleted values
+    lines = ["Congress\tSpeakers\tNew\tTwitter\tChanges\tSeconds"]
+    for summary in summaries:
+        if summary.get('failed'):
+            lines.append("{}C3 ({})\tfailed".format(summary['c3_no'],
+                                                  summary['year']))
+            continue
+        lines.append("{}C3 ({})\t{}\t{}\t{}\t{}\t{:.1f}".format(
+            summary['c3_no'], summary['year'], summary['speakers'],
+            summary['new'], summary['twitters'], summary['changes'],
+            summary['seconds']))
+    return lines
+
+
+class Crawler(object):
     """
+    Fetch pipeline + DB settings shared by all congresses crawled in a run.
 
-    changed = {}
-    deleted = {}
-    try:
-        compare_sets = set(db_values.items()) - set(new_values.items())
-        if len(compare_sets) > 0:
-            for item in compare_sets:
-                key = item[0]
-                value_db = item[1]
+    All congresses go through the same http client (connection pool),
+    politeness budget and response cache, and reuse the run's DB
+    connections.
+    """
+
+    # file endings used for prev. c3 websites (.html being the most common)
+    file_endings = ('.html', '.en.html', '.de.html')
+    # default URL to use for CCC Fahrplan requests
+    base_url = "https://events.ccc.de/congress/"
+
+    def __init__(self, dir_path, db_name, table, client, limiter, cache=None,
+                 workers=4, source='auto', engine=None, db_profile='default',
+                 archive_name=None, incremental=False, max_age=24,
+                 index=None, pipeline=False, processes=None,
+                 resume=False, handles=None):
+        """
+        :param dir_path: path to the directory containing the sqlite dbs
+        :param db_name: name of the per-year DBs (without year)
+        :param table: name of the table holding speakers' data
+        :param client: FetchClient shared by all requests
+        :param limiter: RateLimiter shared by all requests
+        :param cache: ResponseCache shared by all requests
+        :param workers: max. no. of profiles fetched at once per congress
+        :param source: where to find speakers: auto, schedule or html
+        :param engine: html extraction engine to use (see extraction_engine)
+        :param db_profile: pragma profile for the DBs (default or bulk)
+        :param archive_name: name of the archive DB to record results in
+        :param incremental: only fetch profiles of new or renamed speakers
+        and of speakers not checked within max_age hours
+        :param max_age: no. of hours after which a profile is checked again
+        :param index: EndingIndex remembering the Fahrplans' file endings
+        :param pipeline: fetch, parse and save profiles as overlapping
+        stages (see crawl_pipeline)
+        :param processes: no. of processes parsing the profiles of local
+        Fahrplan mirrors (default: no. of CPUs)
+        :param resume: skip the profiles done by an interrupted run
+        :param handles: HandleCache of Twitter handles verified before
+        """
+        self.dir_path = dir_path
+        self.db_name = db_name
+        self.table = table
+        self.client = client
+        self.limiter = limiter
+        self.cache = cache
+        self.workers = workers
+        self.source = source
+        self.engine = engine
+        self.db_profile = db_profile
+        self.archive_name = archive_name
+        self.incremental = incremental
+        self.max_age = max_age
+        self.index = index
+        self.pipeline = pipeline
+        self.processes = processes
+        self.resume = resume
+        self.handles = handles
+        # the archive connection is shared by all congresses
+        self.archive_lock = threading.Lock()
+        # speakers' links listed in machine-readable Fahrplans, by Fahrplan
+        self.schedule_links = {}
+        # speakers pages still being read (see read_listing), by Fahrplan
+        self.listings = {}
+
+    def streams_listing(self, speakers_base_url):
+        """Tell if profiles can be fetched while the speakers page is read.
+
+        Incremental runs, the pipeline and local mirrors need all speakers
+        before the first profile, as do engines which read the whole page.
+        :param speakers_base_url: URL of the Fahrplan
+        """
+        return (self.engine in (None, 'auto', 'stream')
+                and not self.incremental and not self.pipeline
+                and not local_mirror(speakers_base_url))
+
+    def read_listing(self, html_obj, speakers):
+        """Read the speakers of a speakers page as it is downloaded.
+        :param html_obj: the speakers page (see open_website's stream)
+        :param speakers: Speakers to add the speakers to as they are read
+        :return: generator of (speaker ID, name, None) (see iter_speakers),
+        for crawl_speaker_profiles to build the profile URLs
+        """
+        try:
+            for speaker_id, name, speaker_url in iter_speakers(
+                    html_obj, engine=self.engine):
+                speakers.add(speaker_id, name)
+                yield speaker_id, name, None
+        # unforseen exception (e.g. the connection broke off)
+        except Exception as err:
+            print("ERROR: Cannot fetch speakers from file.")
+            print("An unexpected error occurred on line {}:"
+                  .format(sys.exc_info()[-1].tb_lineno))
+            print(err)
+            sys.exit(1)
+
+    def find_speakers(self, speakers_base_url, file_ending=None,
+                      stream=False):
+        """Find speakers in a Fahrplan, either source.
+        :param speakers_base_url: URL of the Fahrplan
+        :param file_ending: file ending of the Fahrplan's pages, if known
+        :param stream: only read a speakers page up to its first speaker;
+        the rest is left in listings, to be read while profiles are fetched
+        :return: speakers dictionary, twitters dictionary (if listed in the
+        machine-readable Fahrplan, otherwise None), file ending
+        """
+        urls = []
+        speakers = {}
+
+        # try the machine-readable Fahrplan first: it lists all speakers
+        # (and possibly their links) in a single document
+        if self.source in ('auto', 'schedule'):
+            links = {}
+            results = find_speakers_schedule(speakers_base_url,
+                                             client=self.client,
+                                             cache=self.cache,
+                                             limiter=self.limiter,
+                                             links=links)
+            if results:
+                speakers, twitters, schedule_links = results
+                if schedule_links:
+                    self.schedule_links[speakers_base_url] = links
+                # Fahrplans with a machine-readable version use .html pages
+                if not file_ending:
+                    file_ending = self.file_endings[0]
+                return speakers, twitters if schedule_links else None, \
+                    file_ending
+            elif self.source == 'schedule':
+                print("ERROR: No machine-readable Fahrplan found.")
+                sys.exit(1)
+            else:
+                print("No machine-readable Fahrplan found, "
+                      "looking for speakers page instead.")
+
+        # make sure to account for possible different file endings
+        # used for previous congresses
+        endings = self.file_endings
+        indexed = None
+        if file_ending:
+            endings = (file_ending,)
+        else:
+            # file ending found on a previous run
+            if self.index:
+                indexed = self.index.get(speakers_base_url)
+            if indexed:
+                endings = (indexed,)
+            else:
+                # probe all candidates at once instead of one after another
+                try:
+                    probed = probe_file_ending(speakers_base_url,
+                                               self.file_endings,
+                                               client=self.client,
+                                               limiter=self.limiter)
+                except ValueError:
+                    probed = None
+                if probed:
+                    endings = (probed,)
+                    if self.index:
+                        self.index.set(speakers_base_url, probed)
+        for ending in endings:
+            urls.append((ending,
+                         "{}speakers{}".format(speakers_base_url, ending)))
+        # an indexed ending which doesn't work anymore is probed again
+        if indexed:
+            urls.extend(
+                (ending, "{}speakers{}".format(speakers_base_url, ending))
+                for ending in self.file_endings if ending != indexed)
+
+        # loop through possible URLs for speakers site until a match is found
+        for ending, url in urls:
+            try:
+                # time delay to appear less bot-like
+                self.limiter.wait(url)
+                # try to open speakers file/website
+                html_obj = open_website(url, client=self.client,
+                                        cache=self.cache, stream=stream,
+                                        raw=True)
+                if html_obj:
+                    # fetch speaker IDs from valid URL
+                    try:
+                        if stream:
+                            # the rest is read while profiles are fetched
+                            speakers = Speakers()
+                            records = self.read_listing(html_obj, speakers)
+                            first = next(records, None)
+                            if first:
+                                self.listings[speakers_base_url] = \
+                                    itertools.chain([first], records)
+                        else:
+                            speakers = find_speakers(html_obj,
+                                                     engine=self.engine)
+                        # determine file ending if it's not yet known
+                        if not file_ending:
+                            file_ending = ending
+                            print(file_ending)
+                            if self.index and ending != indexed:
+                                self.index.set(speakers_base_url, ending)
+                    # unforseen exception
+                    except Exception as err:
+                        print("ERROR: Cannot fetch speakers from file.")
+                        print("An unexpected error occurred on line {}:"
+                              .format(sys.exc_info()[-1].tb_lineno))
+                        print(err)
+                        sys.exit(1)
+                    break
+                elif ending == indexed:
+                    self.index.forget(speakers_base_url)
+            except ValueError as err:
+                print("ERROR: Value entered is not a valid URL.")
+                print(err)
+            except TypeError as err:
+                print(err)
+                sys.exit(1)
+
+        return speakers, None, file_ending
+
+    def congress(self, year, c3_no, speakers_base_url=None, file_ending=None):
+        """Crawl the Fahrplan of one congress and save the results.
+        :param year: year YYYY of the congress
+        :param c3_no: no. of the congress
+        :param speakers_base_url: URL of the Fahrplan (default: CCC's)
+        :param file_ending: file ending of the Fahrplan's pages, if known
+        :return: dictionary summing up the results
+        """
+        started = time.monotonic()
+        dir_path = self.dir_path
+        table = self.table
+        twitters = {}
+        # accounts + websites linked to on the profiles checked in this run
+        links = {}
+        # IDs of speakers whose profiles were checked in this run
+        checked = set()
+
+        # create base URL for Fahrplan page (which contains speaker page)
+        if not speakers_base_url:
+            speakers_base_url = "{}{}/Fahrplan/".format(self.base_url, year)
+
+        with _metrics.timer('phase_seconds', phase='speakers'):
+            speakers, schedule_twitters, file_ending = self.find_speakers(
+                speakers_base_url, file_ending,
+                stream=self.streams_listing(speakers_base_url))
+        # account for malformed speaker URLs;
+        # names + handles of all speakers are kept in one collection
+        if not isinstance(speakers, Speakers):
+            speakers = Speakers(speakers)
+        # rest of the speakers page, if it is read while profiles are fetched
+        listing = self.listings.pop(speakers_base_url, None)
+
+        # variables for speakers/twitters before any inserts
+        count_s_b4 = 0
+        count_s_aft = 0
+        count_t_b4 = 0
+        changes = 0
+        db = None
+
+        # total no. of speakers
+        total_speakers = len(speakers)
 
-                # DB values that differ from retrieved values
-                # (applies to name changes, Twitter handle changes)
+        # DB – SPEAKERS BLOCK
+        if total_speakers > 0:
+            # display no. of speakers found
+            if listing is None:
+                print("{} speaker(s) found".format(total_speakers))
+            else:
+                print("Reading speakers while their profiles are fetched")
+            print("---")
+
+            # connect to the DB / create it if doesn't exist
+            try:
+                # connect to the DB / create it if doesn't exist
+                db = db_connect(dir_path, self.db_name, table, year,
+                                profile=self.db_profile)
+
+                # count speakers + Twitter handles in DB before any writes
+                count_s_b4 = db_count(dir_path, db, table, column='name')
+                count_t_b4 = db_count(dir_path, db, table, column='twitter')
+
+                # try to update db with new values
                 try:
-                    value = new_values[key]
-                    changed[key] = value
-
-                # IDs in DB that are
-                # - not listed in the Fahrplan anymore
-                # - which used to have a Twitter handle but don't anymore
-                except KeyError:
-                    # save all affected (removed) IDs into a dictionary
-                    # so there is only one warning per ID
-                    # to avoid duplicate msgs for missing Twitter handles
-                    # of speakers who were removed from Fahrplan
-                    deleted[key] = value_db
-        return changed, deleted
-    # NoneType on empty dictionaries
-    except AttributeError:
-        return changed, deleted
-    # unforseen exception
-    except Exception as err:
-        print("An unexpected error occurred on line {}:".format(
-            sys.exc_info()[-1].tb_lineno))
-        print(err)
-        sys.exit(1)
+                    # fill table for speakers with IDs + name
+                    db_write(dir_path, db, table, speakers=speakers)
+                # unforseen exception
+                except Exception as err:
+                    print("An unexpected error occurred on line {}:".format(
+                        sys.exc_info()[-1].tb_lineno))
+                    print(err)
+                    sys.exit(1)
+
+            # unforseen exception
+            except Exception as err:
+                print("An unexpected error occurred on line {}:".format(
+                    sys.exc_info()[-1].tb_lineno))
+                print(err)
+                sys.exit(1)
+
+        # parse individual speaker pages
+        if total_speakers > 0:
+            # speakers' links were listed in the machine-readable Fahrplan
+            if schedule_twitters is not None:
+                twitters = speakers.view('twitter')
+                twitters.update(schedule_twitters)
+                links = self.schedule_links.pop(speakers_base_url, {})
+                checked.update(speakers)
+                print("Twitter handles taken from machine-readable Fahrplan.")
+            # otherwise parse all speakers' profiles
+            # (concurrently, within the politeness budget)
+            else:
+                to_fetch = speakers
+                # incremental mode: skip profiles checked recently
+                if self.incremental and db:
+                    stale = db_stale(dir_path, db, table, speakers,
+                                     max_age=self.max_age)
+                    to_fetch = speakers.subset(stale)
+                    print("{} of {} speaker profile(s) new, changed or due "
+                          "for a check".format(len(to_fetch), total_speakers))
+
+                # profiles done by an interrupted run aren't fetched again
+                done = {}
+                done_links = {}
+                if db and self.resume:
+                    done = db_resume(dir_path, db, table, links=done_links)
+                    if listing is None:
+                        to_fetch = to_fetch.subset(done, exclude=True)
+                    print("Resuming: {} speaker profile(s) done by the "
+                          "previous run".format(len(done)))
+                elif db:
+                    db_checkpoint_clear(dir_path, db, table)
+
+                profiles_started = time.monotonic()
+
+                speakers_dir = local_mirror(speakers_base_url)
+                # the pipeline's writer thread saves progress itself,
+                # as only that thread may use the db connection meanwhile
+                pipelined = self.pipeline and db and not speakers_dir
+
+                def profile_checked(speaker_id, twitter_handle):
+                    checked.add(speaker_id)
+                    # save progress (incl. the links found) as it is made
+                    if db and not pipelined:
+                        db_checkpoint(dir_path, db, table,
+                                      [(speaker_id, twitter_handle)],
+                                      links=links)
+
+                # local mirror: parse the profile files in several processes
+                if speakers_dir:
+                    found = crawl_local_mirror(
+                        to_fetch, speakers_dir, file_ending,
+                        processes=self.processes, engine=self.engine,
+                        callback=profile_checked, links=links)
+                # handles are saved while profiles are still being fetched
+                elif pipelined:
+                    found = run_pipeline(
+                        to_fetch, speakers_base_url, file_ending, dir_path,
+                        db, table, workers=self.workers,
+                        limiter=self.limiter, client=self.client,
+                        cache=self.cache, engine=self.engine,
+                        callback=profile_checked, links=links)
+                else:
+                    # the first profiles are fetched while the speakers page
+                    # is still being read
+                    if listing is not None:
+                        to_fetch = (record for record in listing
+                                    if record[0] not in done)
+                    found = crawl_speaker_profiles(
+                        to_fetch, speakers_base_url, file_ending,
+                        workers=self.workers, limiter=self.limiter,
+                        client=self.client, cache=self.cache,
+                        engine=self.engine, callback=profile_checked,
+                        links=links)
+
+                # the speakers page is read to its end by now
+                if listing is not None:
+                    to_fetch = speakers.subset(done, exclude=True)
+                    total_speakers = len(speakers)
+                    print("{} speaker(s) found".format(total_speakers))
+                    if db:
+                        db_write(dir_path, db, table, speakers=speakers)
+
+                _metrics.observe('phase_seconds',
+                                 time.monotonic() - profiles_started,
+                                 phase='profiles')
+                _metrics.inc('profiles_total', len(to_fetch))
+
+                # handles are kept with the speakers' names
+                twitters = speakers.view('twitter')
+                twitters.update(found)
+                # add what the interrupted run found
+                for speaker_id, twitter_handle in done.items():
+                    if speaker_id in speakers:
+                        checked.add(speaker_id)
+                        links[speaker_id] = done_links[speaker_id]
+                        if twitter_handle:
+                            twitters[speaker_id] = twitter_handle
+
+            # skip handles of accounts found to not exist (anymore)
+            if self.handles and twitters:
+                invalid = self.handles.invalid(twitters.values())
+                for speaker_id, twitter in list(twitters.items()):
+                    if twitter in invalid:
+                        print(u"\u2717 Skipping invalid Twitter account "
+                              u"@{}".format(twitter))
+                        del twitters[speaker_id]
+
+            # display the no. of twitter handles provided;
+            # not the same as twitter handles inserted!
+            print("---")
+            if twitters:
+                print("{} Twitter handle(s) detected:".format(len(twitters)))
+                for speaker_id, twitter in twitters.items():
+                    print("@{}\t".format(twitter), end='')
+                print('')
+            else:
+                print("Found no Twitter handles in Fahrplan.")
+            # all accounts + websites, by platform
+            platforms = collections.Counter(
+                platform for profile_links in links.values()
+                for platform, account in profile_links)
+            if platforms:
+                print("Links found: {}".format(', '.join(
+                    "{} {}".format(count, platform)
+                    for platform, count in sorted(platforms.items()))))
+        else:
+            print("Found no speakers in Fahrplan.")
+
+        # DB – TWITTER BLOCK
+        # DB – STATUS MESSAGES
+
+        # start printing status messages now
+        print("---")
+        print("DB status: ", end='')
+
+        if count_s_b4:
+            print("{} speaker(s) currently saved.".format(count_s_b4))
+        else:
+            print("The database contains no speakers so far.")
+
+        # try to update db with new values
+        try:
+            if db:
+                # update table for speakers with twitter handles
+                # where applicable
+                db_write(dir_path, db, table, twitter=twitters)
+                # all accounts + websites found (replacing the ones saved
+                # for the profiles checked)
+                db_write_links(dir_path, db, table, links)
+                # remember when profiles were checked (for incremental runs)
+                db_checked(dir_path, db, table, checked,
+                           speakers=speakers)
+                # all results are saved, nothing left to resume
+                db_checkpoint_clear(dir_path, db, table)
+
+                count_s_aft = db_count(dir_path, db, table, column='name')
+                # update speakers count if there are more DB entries now
+                if count_s_aft > count_s_b4:
+                    print("Updating...")
+                    print("DB status: {} speaker(s) now saved.".format(
+                        count_s_aft))
+                else:
+                    print("No new speakers retrieved.")
+
+                # print count if there are more Twitter handles now
+                count_t_aft = db_count(dir_path, db, table, column='twitter')
+                if (count_t_aft > count_t_b4) and (count_t_b4 != 0):
+                    print(
+                        "DB status: {} new Twitter handle(s) saved.".format(
+                            count_t_aft - count_t_b4))
+
+                # record this congress's values in the archive as well
+                if self.archive_name:
+                    with self.archive_lock:
+                        archive_db = archive_connect(dir_path,
+                                                     self.archive_name,
+                                                     profile=self.db_profile)
+                        if archive_db:
+                            archive_write(dir_path, archive_db, year, c3_no,
+                                          speakers=speakers, twitter=twitters)
+
+                # compare values in DB with values obtained via request
+                s_changed, s_deleted, s_new, t_changed, t_deleted = db_diff(
+                    dir_path, db, table, speakers, twitters, checked=checked)
+                changes = (len(s_changed) + len(s_deleted) + len(t_changed) +
+                           len(t_deleted))
+
+                if s_changed or s_deleted or t_changed or t_deleted:
+                    print("---")
+                    print("ATTENTION:")
+                    for key, value in s_deleted.items():
+                        print(
+                            u"\u2717 Speaker {} (id {}) is not listed in the Fahrplan anymore.".format(
+                                value, key))
+                    for key, (value_db, value) in s_changed.items():
+                        print(
+                            u"\u2717 Speaker {} (id {}) has changed to {} in the current Fahrplan.".format(
+                                value_db, key, value))
+                    for key, value in t_deleted.items():
+                        if key not in s_deleted:
+                            print(
+                                u"\u2717 Twitter @{} (id {}) is not listed in the Fahrplan anymore.".format(
+                                    value, key))
+                    for key, (value_db, value) in t_changed.items():
+                        print(
+                            u"\u2717 Twitter @{} (id {}) has changed to @{} in the current Fahrplan.".format(
+                                value_db, key, value))
+                    print(
+                        "You might want to look into these changes and fix them manually.")
+
+        # unforseen exception
+        except Exception as err:
+            print("An unexpected error occurred on line {}:".format(
+                sys.exc_info()[-1].tb_lineno))
+            print(err)
+
+        seconds = time.monotonic() - started
+        # per congress, to compare runs across congresses
+        _metrics.observe('congress_seconds', seconds, year=year)
+        _metrics.inc('speakers_total', total_speakers, year=year)
+        _metrics.inc('twitters_total', len(twitters), year=year)
+        return {'year': year, 'c3_no': c3_no, 'speakers': total_speakers,
+                'new': max(0, count_s_aft - count_s_b4),
+                'twitters': len(twitters), 'changes': changes,
+                'seconds': seconds}
+
+    def batch(self, congresses, parallel=1):
+        """Crawl several congresses, up to `parallel` of them at once.
+        :param congresses: list of (year, congress no.)
+        :param parallel: max. no. of congresses crawled at the same time
+        :return: list of summaries, in the order of congresses
+        """
+        def crawl(congress):
+            year, c3_no = congress
+            print("=== {}C3 ({}) ===".format(c3_no, year))
+            # a congress which can't be crawled doesn't stop the others
+            try:
+                return self.congress(year, c3_no)
+            except SystemExit:
+                return {'year': year, 'c3_no': c3_no, 'failed': True}
+
+        with concurrent_futures.ThreadPoolExecutor(
+                max_workers=max(1, parallel)) as executor:
+            return list(executor.map(crawl, congresses))
 
 
 def main():
@@ -498,15 +3731,9 @@ def main():
     main function
     """
     c3 = 'C3'
-    urls = []
-    speakers = {}
-    twitters = {}
-    # default URL to use for CCC Fahrplan requests
-    base_url = "https://events.ccc.de/congress/"
+    congresses = []
     speakers_base_url = None
     file_ending = None
-    # file endings used for prev. c3 websites (.html being the most common)
-    file_endings = ('.html', '.en.html', '.de.html')
 
     # get (user-provided, user-editable) vars from config file
     # -> db name, db path, table name for speaker data
@@ -515,11 +3742,58 @@ def main():
     dir_path = config.get('db', 'dir_path')
     db_name = config.get('db', 'db_name')
     table = config.get('db', 'table')
+    # pragma profile for the speakers db: default or bulk (faster imports)
+    db_profile = config.get('db', 'pragma_profile', fallback='default')
+    # archive db holding all congresses
+    archive_name = config.get('db', 'archive_name', fallback='archive')
+    use_archive = False
+    import_archive = False
+    # crawl settings: concurrent fetchers + politeness budget per host
+    workers = config.getint('crawl', 'workers', fallback=4)
+    rate = config.getfloat('crawl', 'rate', fallback=1.0)
+    # adapt the rate to the server's responses, between min. rate and rate
+    adaptive = config.getboolean('crawl', 'adaptive', fallback=True)
+    min_rate = config.getfloat('crawl', 'min_rate', fallback=0.1)
+    burst = config.getint('crawl', 'burst', fallback=1)
+    # incremental mode: hours after which profiles are checked again
+    incremental = False
+    max_age = config.getfloat('crawl', 'max_age', fallback=24)
+    # continue an interrupted run
+    resume = False
+    # fetch, parse and save profiles as overlapping stages
+    pipeline = config.getboolean('crawl', 'pipeline', fallback=False)
+    # no. of processes parsing local Fahrplan mirrors (0: no. of CPUs)
+    processes = config.getint('crawl', 'processes', fallback=0)
+    # no. of congresses crawled at the same time in batch mode
+    parallel = config.getint('crawl', 'parallel', fallback=1)
+    # where to find speakers: machine-readable Fahrplan and/or speakers page
+    source = config.get('crawl', 'source', fallback='auto')
+    # html extraction engine: auto, soup, lxml or stream
+    engine = config.get('crawl', 'engine', fallback='auto')
+    # http settings: connection pool size + retry policy
+    pool_size = config.getint('http', 'pool_size', fallback=10)
+    retries = config.getint('http', 'retries', fallback=3)
+    backoff = config.getfloat('http', 'backoff', fallback=0.5)
+    # response cache: file name + eviction policy
+    cache_name = config.get('cache', 'cache_name', fallback='httpcache')
+    cache_size = config.getfloat('cache', 'max_size', fallback=50)
+    cache_ttl = config.getfloat('cache', 'ttl', fallback=30)
+    use_cache = True
+    clear_cache = False
+    # index of the file endings used by each Fahrplan
+    index_name = config.get('cache', 'index_name', fallback='endings')
+    # Twitter handles verified by twittering.py + how long they're trusted
+    handles_name = config.get('cache', 'handles_name', fallback='handles')
+    handles_ttl = config.getfloat('cache', 'handles_ttl', fallback=7)
 
     # use the current working directory to query DBs if no path was provided
     if not dir_path:
         dir_path = "{}/".format(os.getcwd())
 
+    # file to dump the run's metrics to (json or prometheus)
+    metrics_file = config.get('log', 'metrics_file', fallback='')
+    metrics_format = config.get('log', 'metrics_format', fallback='json')
+
     # define file for error logging
     # for future use
     # errlog_file = config.get('log', 'err_log')
@@ -537,13 +3811,129 @@ def main():
 
     # check if any command line arguments were provided by user
     try:
-        opts, args = getopt.getopt(sys.argv[1:], 'y:c:u:h',
-                                   ['year=', 'congress=', 'url=', 'help'])
+        opts, args = getopt.getopt(sys.argv[1:], 'y:c:u:hw:r:s:e:i',
+                                   ['year=', 'congress=', 'url=', 'help',
+                                    'workers=', 'rate=', 'source=',
+                                    'engine=', 'no-cache', 'clear-cache',
+                                    'bulk', 'archive', 'import-archive',
+                                    'range=', 'parallel=', 'incremental',
+                                    'max-age=', 'pipeline', 'processes=',
+                                    'resume', 'metrics=',
+                                    'metrics-format='])
     except getopt.GetoptError as err:
         print(usage())
         print(err)
         sys.exit(2)
 
+    # crawl settings can be combined with any of the other flags
+    for opt, arg in opts:
+        # no. of speaker profiles to fetch at the same time
+        if opt in ('-w', '--workers'):
+            try:
+                workers = int(arg)
+                if workers < 1:
+                    raise ValueError(arg)
+            except ValueError:
+                print("ERROR: Number of workers needs to be a positive "
+                      "integer:\n{}".format(arg))
+                sys.exit(1)
+        # max. requests per second and host
+        elif opt in ('-r', '--rate'):
+            try:
+                rate = float(arg)
+                if rate < 0:
+                    raise ValueError(arg)
+            except ValueError:
+                print("ERROR: Rate needs to be a non-negative number of "
+                      "requests per second:\n{}".format(arg))
+                sys.exit(1)
+        # no. of congresses to crawl at the same time
+        elif opt == '--parallel':
+            try:
+                parallel = int(arg)
+                if parallel < 1:
+                    raise ValueError(arg)
+            except ValueError:
+                print("ERROR: Number of parallel congresses needs to be a "
+                      "positive integer:\n{}".format(arg))
+                sys.exit(1)
+        # no. of processes parsing local Fahrplan mirrors
+        elif opt == '--processes':
+            try:
+                processes = int(arg)
+                if processes < 0:
+                    raise ValueError(arg)
+            except ValueError:
+                print("ERROR: No. of processes needs to be a non-negative "
+                      "integer:\n{}".format(arg))
+                sys.exit(1)
+        # dump the run's metrics to a file
+        elif opt == '--metrics':
+            metrics_file = arg
+        elif opt == '--metrics-format':
+            metrics_format = arg
+        # skip profiles done by an interrupted run
+        elif opt == '--resume':
+            resume = True
+        # fetch, parse and save profiles as overlapping stages
+        elif opt == '--pipeline':
+            pipeline = True
+        # only fetch profiles of new/changed/not recently checked speakers
+        elif opt in ('-i', '--incremental'):
+            incremental = True
+        # no. of hours after which profiles are checked again
+        elif opt == '--max-age':
+            try:
+                max_age = float(arg)
+                if max_age < 0:
+                    raise ValueError(arg)
+            except ValueError:
+                print("ERROR: Max. age needs to be a non-negative number of "
+                      "hours:\n{}".format(arg))
+                sys.exit(1)
+        # source for speakers: auto, schedule (machine-readable) or html
+        elif opt in ('-s', '--source'):
+            source = arg
+        # html extraction engine
+        elif opt in ('-e', '--engine'):
+            engine = arg
+        # faster (less durable) db settings for bulk imports
+        elif opt == '--bulk':
+            db_profile = 'bulk'
+        # also record the results in the archive db
+        elif opt == '--archive':
+            use_archive = True
+        # load all existing per-year dbs into the archive db and exit
+        elif opt == '--import-archive':
+            import_archive = True
+        # download all pages, don't read from or write to the cache
+        elif opt == '--no-cache':
+            use_cache = False
+        # empty the cache before starting
+        elif opt == '--clear-cache':
+            clear_cache = True
+
+    if source not in ('auto', 'schedule', 'html'):
+        print("ERROR: Source needs to be one of auto, schedule, html:\n"
+              "{}".format(source))
+        sys.exit(1)
+
+    try:
+        extraction_engine(engine)
+    except ValueError as err:
+        print(err)
+        sys.exit(1)
+
+    if metrics_format not in ('json', 'prometheus'):
+        print("ERROR: Metrics format needs to be one of json, prometheus:\n"
+              "{}".format(metrics_format))
+        sys.exit(1)
+
+    if db_profile not in DB_PRAGMAS:
+        print("ERROR: Pragma profile needs to be one of {}:\n{}".format(
+            ', '.join(sorted(DB_PRAGMAS)), db_profile))
+        sys.exit(1)
+
     for opt, arg in opts:
         # help menu requested
         if opt in ('-h', '--help'):
@@ -577,260 +3967,129 @@ def main():
             except ValueError as err:
                 print(err)
                 sys.exit(1)
-        # particular congress shortcut (xyC3) provided by user
+        # particular congress shortcut(s) (xyC3) provided by user
         elif opt in ('-c', '--congress'):
-            # check for validity of user-provided c3 shortcut
+            # check for validity of user-provided c3 shortcut(s)
             # and break (no further checks of flags)
             try:
-                year, c3_no = congress_data(c3_shortcut=arg)
-                print("{} > {}{} ... requested".format(year, c3_no, c3))
+                for c3_shortcut in arg.split(','):
+                    year, c3_no = congress_data(c3_shortcut=c3_shortcut)
+                    print("{} > {}{} ... requested".format(year, c3_no, c3))
+                    congresses.append((year, c3_no))
                 break
             except ValueError as err:
                 print(err)
                 sys.exit(1)
-
-    # debug
-    print("{}: {}{} ... this year".format(year, c3_no, c3))
-
-    # create base URL for Fahrplan page (which contains speaker page)
-    if not speakers_base_url:
-        speakers_base_url = "{}{}/Fahrplan/".format(base_url, year)
-
-    # make sure to account for possible different file endings
-    # used for previous congresses
-    if file_ending:
-        urls.append("{}speakers{}".format(speakers_base_url, file_ending))
-    else:
-        for ending in file_endings:
-            urls.append("{}speakers{}".format(speakers_base_url, ending))
-
-    # loop through possible URLs for speakers site until a match is found
-    loop_filendings = 0
-    for url in urls:
-        try:
-            # try to open speakers file/website
-            html_obj = open_website(url)
-            # time delay to appear less bot-like (3 is a good number)
-            time.sleep(3)
-            if html_obj:
-                # fetch speaker IDs from valid URL
-                try:
-                    speakers = find_speakers(html_obj)
-                    # determine file ending if it's not yet known
-                    if not file_ending:
-                        file_ending = file_endings[loop_filendings]
-                        print(file_ending)
-                # unforseen exception
-                except Exception as err:
-                    print("ERROR: Cannot fetch speakers from file.")
-                    print("An unexpected error occurred on line {}:".format(
-                        sys.exc_info()[-1].tb_lineno))
-                    print(err)
-                    sys.exit(1)
-                break
-            loop_filendings += 1
-        except ValueError as err:
-            print("ERROR: Value entered is not a valid URL.")
-            print(err)
-        except TypeError as err:
-            print(err)
-            sys.exit(1)
-
-    # print("---")
-
-    # variables for speakers/twitters before any inserts
-    count_s_b4 = 0
-    count_t_b4 = 0
-    db = None
-    db_speakers_b4 = None
-    db_speakers_after = None
-    db_twitter_before = None
-    db_twitter_after = None
-
-    # total no. of speakers
-    total_speakers = len(speakers)
-    # start counting up speakers
-    count_speakers = 1
-
-    # DB – SPEAKERS BLOCK
-    if total_speakers > 0:
-        # display no. of speakers found
-        print("{} speaker(s) found".format(total_speakers))
-        print("---")
-
-        # connect to the DB / create it if doesn't exist
-        try:
-            # connect to the DB / create it if doesn't exist
-            db = db_connect(dir_path, db_name, table, year)
-
-            # get current speaker values from DB
-            try:
-                # get speaker IDs + names
-                db_speakers_b4 = db_query(dir_path, db, table, column='name')
-            # unforseen exception
-            except Exception as err:
-                print("An unexpected error occurred on line {}:".format(
-                    sys.exc_info()[-1].tb_lineno))
-                print(err)
-
-            # try to update db with new values
-            try:
-                # fill table for speakers with IDs + name
-                db_write(dir_path, db, table, speakers=speakers)
-            # unforseen exception
-            except Exception as err:
-                print("An unexpected error occurred on line {}:".format(
-                    sys.exc_info()[-1].tb_lineno))
-                print(err)
-                sys.exit(1)
-
-            # get new speaker values from DB after write
+        # range of congresses provided by user
+        elif opt == '--range':
             try:
-                db_speakers_after = db_query(dir_path, db, table,
-                                             column='name')
-            # unforseen exception
-            except Exception as err:
-                print("An unexpected error occurred on line {}:".format(
-                    sys.exc_info()[-1].tb_lineno))
+                congresses = congress_range(arg)
+                # a range of one congress is crawled like a single one
+                year, c3_no = congresses[0]
+                print("{}{} - {}{} ... requested".format(
+                    congresses[0][1], c3, congresses[-1][1], c3))
+                break
+            except ValueError as err:
                 print(err)
                 sys.exit(1)
 
-        # unforseen exception
-        except Exception as err:
-            print("An unexpected error occurred on line {}:".format(
-                sys.exc_info()[-1].tb_lineno))
-            print(err)
+    # ARCHIVE IMPORT
+    if import_archive:
+        archive_db = archive_connect(dir_path, archive_name,
+                                     profile=db_profile)
+        if not archive_db:
             sys.exit(1)
-
-    # parse individual speaker pages
-    if total_speakers > 0:
-        # parse all speakers' profiles
-        for speaker_id, name in speakers.items():
-            # display the how-many-th speaker is queried
-            print("Speaker #{} of {}".format(count_speakers, total_speakers))
-            # time delay to appear less bot-like (3 is a good number)
-            time.sleep(3)
-            speaker_url = "{}speakers/{}{}".format(speakers_base_url,
-                                                   speaker_id, file_ending)
-            # return speaker's twitter handle if applicable
-            twitter_handle = parse_speaker_profile(speaker_url)
-            # and add it to the twitters dictionary
-            if twitter_handle:
-                print("Twitter: {}".format(twitter_handle))
-                twitters[speaker_id] = twitter_handle
-            count_speakers += 1
-
-        # display the no. of twitter handles provided;
-        # not the same as twitter handles inserted!
+        imported = archive_import(dir_path, db_name, table, archive_db)
+        for import_year, count in sorted(imported.items()):
+            print("{}: {} speaker(s) imported".format(import_year, count))
         print("---")
-        if twitters:
-            print("{} Twitter handle(s) detected:".format(len(twitters)))
-            for speaker_id, twitter in twitters.items():
-                print("@{}\t".format(twitter), end='')
-            print('')
-        else:
-            print("Found no Twitter handles in Fahrplan.")
-    else:
-        print("Found no speakers in Fahrplan.")
-
-    # DB – TWITTER BLOCK
-    # DB – STATUS MESSAGES
+        print("Year\tHandles\tNew\tDropped")
+        for row in archive_churn(dir_path, archive_db):
+            print("\t".join(str(value) for value in row))
+        db_close()
+        return
 
-    # start printing status messages now
-    print("---")
-    print("DB status: ", end='')
-
-    if db_speakers_b4:
-        count_s_b4 = len(db_speakers_b4)
-        print("{} speaker(s) currently saved.".format(count_s_b4))
+    # politeness budget + http connections shared by all requests of this run
+    # (the adaptive rate never exceeds the rate set)
+    limiter = RateLimiter(rate, burst=burst, adaptive=adaptive,
+                          min_rate=min(min_rate, rate), max_rate=rate)
+    # (there can't be more connections in use than fetchers)
+    client = FetchClient(pool_size=max(pool_size, workers * parallel),
+                         retries=retries, backoff=backoff, limiter=limiter)
 
-        # get current twitter values from DB
-        # this query only makes sense if there are speakers to begin with
+    # responses of previous runs
+    cache = None
+    if use_cache:
         try:
-            db_twitter_before = db_query(dir_path, db, table,
-                                         column='twitter')
-        # unforseen exception
-        except Exception as err:
-            print("An unexpected error occurred on line {}:".format(
-                sys.exc_info()[-1].tb_lineno))
+            cache = ResponseCache("{}{}.sqlite".format(dir_path, cache_name),
+                                  max_size=cache_size, ttl=cache_ttl)
+            if clear_cache:
+                cache.clear()
+                print("Cleared response cache.")
+        except sqlite3.Error as err:
+            print("ERROR: Cannot open response cache, continuing without.")
             print(err)
+            cache = None
 
-        if db_twitter_before:
-            count_t_b4 = len(db_twitter_before)
-    else:
-        print("The database contains no speakers so far.")
-
-    # try to update db with new values
+    # file endings found on previous runs
     try:
-        # update table for speakers with twitter handles where applicable
-        db_write(dir_path, db, table, twitter=twitters)
-
-        # if there are entries for speakers in the DB after speakers write, get them
-        if db_speakers_after:
-            count_s_aft = len(db_speakers_after)
-            # update speakers count if there are more DB entries now than before
-            if count_s_aft > count_s_b4:
-                print("Updating...")
-                print("DB status: {} speaker(s) now saved.".format(
-                    count_s_aft))
-            else:
-                print("No new speakers retrieved.")
-
-            # compare values in DB with values obtained via request
-            s_changed, s_deleted = compare_values(db_speakers_after,
-                                                  speakers)
-
-            # get new twitter values from DB after write
-            try:
-                db_twitter_after = db_query(dir_path, db, table,
-                                            column='twitter')
-            # unforseen exception
-            except Exception as err:
-                print("An unexpected error occurred on line {}:".format(
-                    sys.exc_info()[-1].tb_lineno))
-                print(err)
+        index = EndingIndex("{}{}.sqlite".format(dir_path, index_name))
+    except sqlite3.Error as err:
+        print("ERROR: Cannot open file ending index, continuing without.")
+        print(err)
+        index = None
 
-            # if there are Twitter handles in the DB, get them
-            if db_twitter_after:
-                count_t_aft = len(db_twitter_after)
-                # print count if there are more Twitter handles now than before
-                if (count_t_aft > count_t_b4) and (count_t_b4 != 0):
-                    print(
-                        "DB status: {} new Twitter handle(s) saved.".format(
-                            count_t_aft - count_t_b4))
+    # Twitter handles known to (not) belong to existing accounts
+    try:
+        handles = HandleCache("{}{}.sqlite".format(dir_path, handles_name),
+                              ttl=handles_ttl)
+    except sqlite3.Error as err:
+        print("ERROR: Cannot open Twitter handle cache, continuing without.")
+        print(err)
+        handles = None
 
-            # compare Twitter values currently in DB with new values
-            t_changed, t_deleted = compare_values(db_twitter_after,
-                                                  twitters)
+    crawler = Crawler(dir_path, db_name, table, client, limiter, cache=cache,
+                      workers=workers, source=source, engine=engine,
+                      db_profile=db_profile,
+                      archive_name=archive_name if use_archive else None,
+                      incremental=incremental, max_age=max_age,
+                      index=index, pipeline=pipeline,
+                      processes=processes or None, resume=resume,
+                      handles=handles)
 
-            if s_changed or s_deleted or t_changed or t_deleted:
-                print("---")
-                print("ATTENTION:")
-                for key, value in s_deleted.items():
-                    print(
-                        u"\u2717 Speaker {} (id {}) is not listed in the Fahrplan anymore.".format(
-                            value, key))
-                for key, value in s_changed.items():
-                    print(
-                        u"\u2717 Speaker {} (id {}) has changed to {} in the current Fahrplan.".format(
-                            db_speakers_after[key], key, value))
-                for key, value in t_deleted.items():
-                    if key not in s_deleted:
-                        print(
-                            u"\u2717 Twitter @{} (id {}) is not listed in the Fahrplan anymore.".format(
-                                value, key))
-                for key, value in t_changed.items():
-                    print(
-                        u"\u2717 Twitter @{} (id {}) has changed to @{} in the current Fahrplan.".format(
-                            db_twitter_after[key], key, value))
-                print(
-                    "You might want to look into these changes and fix them manually.")
+    # BATCH MODE – several congresses through the same pipeline
+    if len(congresses) > 1:
+        summaries = crawler.batch(congresses, parallel=parallel)
+        print("---")
+        for line in summary_table(summaries):
+            print(line)
+    else:
+        # debug
+        print("{}: {}{} ... this year".format(year, c3_no, c3))
+        crawler.congress(year, c3_no, speakers_base_url=speakers_base_url,
+                         file_ending=file_ending)
 
-    # unforseen exception
-    except Exception as err:
-        print("An unexpected error occurred on line {}:".format(
-            sys.exc_info()[-1].tb_lineno))
-        print(err)
+    # connection reuse of this run
+    print("---")
+    print("HTTP: {}".format(client.stats()))
+    print("Rate limit: {}".format(limiter.stats()))
+    client.close()
+    db_close()
+    if index:
+        index.close()
+    if handles:
+        handles.close()
+    if cache:
+        print("Cache: {} page(s) not modified".format(len(cache.revalidated)))
+        cache.close()
+    # timers + counters of this run
+    if metrics_file:
+        try:
+            metrics().dump(metrics_file, fmt=metrics_format)
+            print("Metrics written to {}".format(metrics_file))
+        except OSError as err:
+            print("ERROR: Cannot write metrics.")
+            print(err)
 
 
 if __name__ == "__main__":
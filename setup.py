@@ -28,6 +28,7 @@ setup(
     ],
     keywords='Chaos Communicaton Congress, CCC, C3, speakers',
     install_requires=['beautifulsoup4', 'requests', 'twitter'],
+    extras_require={'lxml': ['lxml']},
     tests_require=['pytest', 'requests'],
 
     cmdclass = {
@@ -1,3 +1,4 @@
+import os
 import pytest
 
 from c3speakers import *
@@ -185,3 +186,1663 @@ def test_url_foreign_invalid2():
     with pytest.raises(AttributeError) as excinfo:
         foreign_url(url)
     assert str(excinfo.value) == err_invalid_foreign_url()
+
+
+# TEST CONCURRENT CRAWLING
+
+# pass - requests to the same host are spaced out by the rate limit
+def test_ratelimiter_same_host():
+    limiter = RateLimiter(rate=20)
+    start = time.monotonic()
+    for i in range(3):
+        limiter.wait("https://events.ccc.de/congress/2015/Fahrplan/")
+    # first request is immediate, the other two wait 1/20 s each
+    assert time.monotonic() - start >= 0.09
+
+
+# pass - local files are not rate limited
+def test_ratelimiter_local_file():
+    limiter = RateLimiter(rate=0.1)
+    start = time.monotonic()
+    limiter.wait("/Users/JarJar/2010/Fahrplan/speakers/1.html")
+    limiter.wait("/Users/JarJar/2010/Fahrplan/speakers/2.html")
+    assert time.monotonic() - start < 1
+
+
+# pass - requests up to the burst size go out at once
+def test_ratelimiter_burst():
+    limiter = RateLimiter(rate=1, burst=3)
+    start = time.monotonic()
+    for i in range(3):
+        limiter.wait("https://events.ccc.de/congress/2015/Fahrplan/")
+    assert time.monotonic() - start < 0.5
+
+
+# pass - adaptive rate grows on fast responses and drops on throttling
+def test_ratelimiter_adaptive():
+    url = "https://events.ccc.de/congress/2015/Fahrplan/"
+    limiter = RateLimiter(rate=1, adaptive=True, min_rate=0.5, max_rate=1.2)
+    for i in range(5):
+        limiter.feedback(url, 200, 0.1)
+    assert limiter.rates['events.ccc.de'] == 1.2
+    limiter.feedback(url, 429, 0.1)
+    limiter.feedback(url, 503, 0.1)
+    assert limiter.rates['events.ccc.de'] == 0.5
+    assert limiter.stats() == "0.50 req/s (events.ccc.de), 2 throttle(s)"
+
+
+# pass - a host asking to retry later is paused for that long
+def test_ratelimiter_retry_after():
+    url = "https://events.ccc.de/congress/2015/Fahrplan/"
+    limiter = RateLimiter(rate=100)
+    limiter.feedback(url, 429, 0.1, retry_after=0.3)
+    start = time.monotonic()
+    limiter.wait(url)
+    assert time.monotonic() - start >= 0.25
+
+
+# pass - Retry-After is given in seconds or as http date
+def test_retry_after():
+    response = requests.models.Response()
+    assert retry_after(response) is None
+    response.headers['Retry-After'] = '120'
+    assert retry_after(response) == 120
+    response.headers['Retry-After'] = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    assert retry_after(response) == 0
+    response.headers['Retry-After'] = 'soon'
+    assert retry_after(response) is None
+
+
+# pass - profiles are fetched while the speakers are still being listed
+def test_crawl_speaker_profiles_records(monkeypatch):
+    import c3speakers
+    requested = []
+
+    def fake_profile(url, **kwargs):
+        requested.append(url)
+        return 'speaker2' if url.endswith('/2.html') else None
+
+    def records():
+        for speaker_id in ('1', '2', '1', '3'):
+            yield (speaker_id, 'Speaker {}'.format(speaker_id),
+                   "https://y.org/speakers/{}.html".format(speaker_id))
+
+    monkeypatch.setattr(c3speakers, 'parse_speaker_profile', fake_profile)
+    twitters = crawl_speaker_profiles(records(),
+                                      "https://x.org/2015/Fahrplan/", ".html",
+                                      workers=1, limiter=RateLimiter(rate=0))
+    assert twitters == {'2': 'speaker2'}
+    # speakers listed twice are fetched once, from the URL listed
+    assert sorted(requested) == [
+        "https://y.org/speakers/{}.html".format(i) for i in (1, 2, 3)]
+
+
+# pass - all profiles are fetched, handles end up in a dictionary
+def test_crawl_speaker_profiles(monkeypatch):
+    import c3speakers
+    requested = []
+
+    def fake_profile(url, **kwargs):
+        requested.append(url)
+        if url.endswith('/2.html'):
+            return 'speaker2'
+        return None
+
+    monkeypatch.setattr(c3speakers, 'parse_speaker_profile', fake_profile)
+    speakers = {'1': 'One', '2': 'Two', '3': 'Three'}
+    twitters = crawl_speaker_profiles(speakers,
+                                      "https://x.org/2015/Fahrplan/", ".html",
+                                      workers=3, limiter=RateLimiter(rate=0))
+    assert twitters == {'2': 'speaker2'}
+    assert sorted(requested) == [
+        "https://x.org/2015/Fahrplan/speakers/{}.html".format(i)
+        for i in (1, 2, 3)]
+
+
+# pass - profiles of a local mirror are parsed in several processes
+def test_crawl_local_mirror(tmp_path):
+    speakers_dir = tmp_path / "2015" / "Fahrplan" / "speakers"
+    speakers_dir.mkdir(parents=True)
+    (speakers_dir / "1.en.html").write_text(
+        fixture_html('speaker_twitter.html'), encoding='utf-8')
+    (speakers_dir / "2.en.html").write_text(
+        fixture_html('speaker_plain.html'), encoding='utf-8')
+    (speakers_dir / "3.html").write_text(
+        fixture_html('speaker_twitter.html'), encoding='utf-8')
+    base_url = "{}/2015/Fahrplan/".format(tmp_path)
+    assert local_mirror(base_url) == "{}speakers".format(base_url)
+    assert local_mirror("https://x.org/2015/Fahrplan/") is None
+    checked = []
+    twitters = crawl_local_mirror(
+        {'1': 'One', '2': 'Two', '3': 'Three'}, local_mirror(base_url),
+        '.en.html', processes=2, callback=lambda i, handle: checked.append(i))
+    assert twitters == {'1': 'alice_c3'}
+    assert sorted(checked) == ['1', '2']
+    # with all other links of the profiles
+    links = {}
+    crawl_local_mirror({'1': 'One', '2': 'Two'}, local_mirror(base_url),
+                       '.en.html', processes=1, links=links)
+    assert links['1'][:2] == [('website', 'https://alice.example.org'),
+                              ('twitter', 'alice_c3')]
+    assert links['2'] == [('website', 'https://carol.example.org')]
+
+
+# TEST SHARED FETCH CLIENT
+
+# local stand-in for the Fahrplan that keeps connections alive
+@pytest.fixture
+def fahrplan_server():
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            body = b"<html><body>hello</body></html>"
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:{}/2015/Fahrplan/".format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+# pass - declared charsets are used, others detected once per host
+def test_response_charset(monkeypatch):
+    import c3speakers
+    import requests
+
+    def response(body, content_type='text/html', url="https://x.org/1.html"):
+        r = requests.models.Response()
+        r._content = body
+        r.headers['Content-Type'] = content_type
+        r.url = url
+        return r
+
+    monkeypatch.setattr(c3speakers, '_charsets', {})
+    metrics().reset()
+    latin = u'<p>B\xf6b</p>'.encode('latin-1')
+    assert response_charset(
+        response(latin, 'text/html; charset=ISO-8859-1')) == 'iso8859-1'
+    assert response_charset(response(
+        b'<meta http-equiv="Content-Type" content="text/html; '
+        b'charset=utf-8">' + latin)) == 'utf-8'
+    assert response_charset(
+        response(b'<meta charset="unknown">', 'text/html; charset=UTF8')
+    ) == 'utf-8'
+    # no declaration: detected for the first page of a host only
+    detected = response_charset(response(u'<p>B\xf6b</p>'.encode('utf-8')))
+    assert response_charset(response(latin)) == detected
+    assert metrics().to_dict()['counters']['charset_detections_total'] == 1
+
+
+# pass - UTF-8 pages are handed over as bytes, others are decoded
+def test_open_website_raw(fahrplan_server):
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = u'<a href="https://twitter.com/b\xf6b">B\xf6b</a>'.encode(
+                'latin-1')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=latin-1')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    client = FetchClient()
+    html = open_website("{}speakers/1.html".format(fahrplan_server),
+                        client=client, raw=True)
+    assert html == b"<html><body>hello</body></html>"
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    html = open_website("http://127.0.0.1:{}/speakers/2.html".format(
+        server.server_port), client=client, raw=True)
+    server.shutdown()
+    server.server_close()
+    client.close()
+    assert html == u'<a href="https://twitter.com/b\xf6b">B\xf6b</a>'
+
+
+# pass - consecutive requests reuse one kept-alive connection
+def test_fetch_client_keepalive(fahrplan_server):
+    client = FetchClient(pool_size=2)
+    for i in range(3):
+        html = open_website("{}speakers/{}.html".format(fahrplan_server, i),
+                            client=client)
+        assert 'hello' in html
+    assert client.requests == 3
+    assert client.connections() == 1
+    assert client.stats() == "3 request(s) over 1 connection(s), 0 retried"
+    client.close()
+
+
+# local stand-in for an older Fahrplan which uses .en.html/.de.html pages
+# (and, at /nohead/, doesn't answer HEAD requests)
+@pytest.fixture
+def endings_server():
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    pages = ('speakers.en.html', 'speakers.de.html')
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def respond(self, send_body):
+            body = fixture_html('speakers.html').encode('utf-8')
+            if self.path.rsplit('/', 1)[-1] not in pages:
+                self.send_response(404)
+                body = b""
+            else:
+                self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            self.respond(True)
+
+        def do_HEAD(self):
+            if self.path.startswith('/nohead/'):
+                self.send_response(405)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.respond(False)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:{}/".format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+# pass - the most common existing ending wins
+def test_probe_file_ending(endings_server):
+    client = FetchClient()
+    ending = probe_file_ending("{}2012/Fahrplan/".format(endings_server),
+                               Crawler.file_endings, client=client)
+    client.close()
+    assert ending == '.en.html'
+
+
+# pass - servers without HEAD support are asked with GET instead
+def test_probe_file_ending_no_head(endings_server):
+    client = FetchClient()
+    ending = probe_file_ending("{}nohead/".format(endings_server),
+                               Crawler.file_endings, client=client)
+    client.close()
+    assert ending == '.en.html'
+
+
+# pass - every probe (and GET fallback) waits for the host's budget
+def test_probe_file_ending_limiter(endings_server):
+    class CountingLimiter(RateLimiter):
+        waits = []
+
+        def wait(self, url):
+            self.waits.append(url)
+
+    limiter = CountingLimiter(0)
+    client = FetchClient()
+    ending = probe_file_ending("{}nohead/".format(endings_server),
+                               Crawler.file_endings, client=client,
+                               limiter=limiter)
+    client.close()
+    assert ending == '.en.html'
+    probed = ["{}nohead/speakers{}".format(endings_server, ending)
+              for ending in Crawler.file_endings]
+    assert set(limiter.waits) <= set(probed)
+    assert limiter.waits.count(probed[1]) == 2
+
+
+# pass - local Fahrplan mirrors are probed on disk
+def test_probe_file_ending_local(tmp_path):
+    (tmp_path / "speakers.de.html").write_text("<html></html>")
+    assert probe_file_ending("{}/".format(tmp_path),
+                             Crawler.file_endings) == '.de.html'
+    assert probe_file_ending("{}/missing/".format(tmp_path),
+                             Crawler.file_endings) is None
+
+
+# pass - the ending found is remembered, later runs don't probe
+def test_crawler_ending_index(endings_server, tmp_path):
+    base_url = "{}2012/Fahrplan/".format(endings_server)
+    index = EndingIndex(str(tmp_path / "endings.sqlite"))
+    client = FetchClient()
+    crawler = Crawler('/tmp/', 'speakers', 'speakers', client,
+                      RateLimiter(0), source='html', index=index)
+    speakers, twitters, file_ending = crawler.find_speakers(base_url)
+    assert file_ending == '.en.html'
+    assert len(speakers) == 4
+    assert index.get(base_url) == '.en.html'
+    requests_before = client.requests
+    speakers, twitters, file_ending = crawler.find_speakers(base_url)
+    assert file_ending == '.en.html'
+    assert client.requests == requests_before + 1
+    client.close()
+    index.close()
+
+
+# pass - throttled requests are retried after the time the server asks for
+def test_fetch_client_retry():
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    responses = [503, 429, 200]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            status = responses.pop(0)
+            body = b"<html><body>hello</body></html>"
+            self.send_response(status)
+            if status != 200:
+                self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    limiter = RateLimiter(rate=100, adaptive=True)
+    client = FetchClient(retries=3, backoff=0.01, limiter=limiter)
+    html = open_website("http://127.0.0.1:{}/2015/Fahrplan/speakers.html"
+                        .format(server.server_port), client=client)
+    client.close()
+    server.shutdown()
+    server.server_close()
+    assert 'hello' in html
+    assert client.requests == 3
+    assert client.retried == 2
+    assert limiter.throttles == 2
+
+
+# TEST METRICS
+
+# pass - counters and histograms are dumped as JSON and Prometheus text
+def test_metrics_dump():
+    m = Metrics()
+    m.inc('responses_total', status=200)
+    m.inc('responses_total', 2, status=200)
+    m.observe('parse_seconds', 0.02, page='profile')
+    m.observe('parse_seconds', 3, page='profile')
+    data = m.to_dict()
+    assert data['counters'] == {'responses_total{status="200"}': 3}
+    histogram = data['histograms']['parse_seconds{page="profile"}']
+    assert histogram['count'] == 2
+    assert histogram['sum'] == 3.02
+    assert histogram['buckets']['0.025'] == 1
+    assert histogram['buckets']['5'] == 2
+    assert json.loads(m.to_json()) == data
+    prometheus = m.to_prometheus().splitlines()
+    assert "# TYPE c3speakers_responses_total counter" in prometheus
+    assert 'c3speakers_responses_total{status="200"} 3' in prometheus
+    assert 'c3speakers_parse_seconds_bucket{page="profile",le="+Inf"} 2' \
+        in prometheus
+    assert 'c3speakers_parse_seconds_count{page="profile"} 2' in prometheus
+
+
+# pass - fetching and parsing are recorded in the run's metrics
+def test_metrics_fetch_parse(fahrplan_server):
+    metrics().reset()
+    client = FetchClient()
+    html = open_website("{}speakers/1.html".format(fahrplan_server),
+                        client=client)
+    client.close()
+    find_twitter_handle(html)
+    data = metrics().to_dict()
+    assert data['counters']['download_bytes_total'] == len(html)
+    assert data['counters']['responses_total{status="200"}'] == 1
+    assert data['histograms']['request_seconds{method="GET"}']['count'] == 1
+    assert data['histograms']['parse_seconds{page="profile"}']['count'] == 1
+
+
+# pass - downloaded bytes are counted as transferred, i.e. compressed
+@pytest.mark.parametrize('stream', [False, True])
+def test_metrics_download_bytes(stream):
+    import gzip
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    body = b'<a href="https://twitter.com/speaker1">Twitter</a>' * 100
+    compressed = gzip.compress(body)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(compressed)))
+            self.end_headers()
+            self.wfile.write(compressed)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    metrics().reset()
+    client = FetchClient()
+    html = open_website("http://127.0.0.1:{}/2015/Fahrplan/speakers.html"
+                        .format(server.server_port), client=client,
+                        stream=stream, raw=True)
+    if stream:
+        html = b''.join(html)
+    client.close()
+    server.shutdown()
+    server.server_close()
+    assert html == body
+    assert metrics().to_dict()['counters']['download_bytes_total'] == \
+        len(compressed)
+
+
+# TEST IMPORT TIME
+
+# modules only imported once HTTP requests are sent/html is parsed/...
+HEAVY_MODULES = ('requests.sessions', 'urllib3.connectionpool', 'bs4.element',
+                 'lxml.etree', 'asyncio.base_events', 'http.client',
+                 'twitter.api')
+# max. time (microseconds) importing c3speakers may take
+IMPORT_BUDGET = 150000
+
+
+def run_python(tmp_path, code):
+    """Run Python code in a fresh interpreter in the repo's directory."""
+    import subprocess
+    import sys
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=str(tmp_path))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code], env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True, text=True, check=True)
+
+
+# pass - importing the scripts doesn't load heavy dependencies
+@pytest.mark.parametrize('script', ['c3speakers', 'twittering'])
+def test_import_lazy(tmp_path, script):
+    code = ("import sys, {}\n"
+            "print(' '.join(sys.modules))".format(script))
+    loaded = run_python(tmp_path, code).stdout.split()
+    assert [module for module in HEAVY_MODULES if module in loaded] == []
+
+
+# pass - -h and invalid years are answered without loading them either
+@pytest.mark.parametrize('args', [['-h'], ['-y', '1900']])
+def test_cli_lazy(tmp_path, args):
+    code = ("import sys, runpy\n"
+            "sys.argv = ['c3speakers.py'] + {!r}\n"
+            "try:\n"
+            "    runpy.run_path('c3speakers.py', run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(' '.join(sys.modules))".format(args))
+    loaded = run_python(tmp_path, code).stdout.split()
+    assert [module for module in HEAVY_MODULES if module in loaded] == []
+
+
+# pass - importing c3speakers stays within its time budget
+def test_import_time(tmp_path):
+    # the first run only writes the bytecode cache
+    run_python(tmp_path, "import c3speakers")
+    stderr = run_python(tmp_path, "import c3speakers").stderr
+    # lines look like: import time: self | cumulative | module
+    cumulative = [int(line.split('|')[1]) for line in stderr.splitlines()
+                  if line.split('|')[-1].strip() == 'c3speakers']
+    assert cumulative and cumulative[0] < IMPORT_BUDGET
+
+
+# TEST BENCHMARKS
+
+# pass - benchmarks run against a small synthetic Fahrplan
+def test_benchmark_small():
+    import benchmark
+    results = benchmark.bench_size(12, workers=2)
+    assert results['speakers'] == 12
+    assert results['end_to_end']['requests'] == 13
+    assert results['end_to_end']['twitters'] == 4
+    assert results['parse_speaker_profile']['pages'] == 12
+    assert results['db_write']['rows'] == 24
+    assert results['peak_rss_kb'] > 0
+
+
+# pass - a size which fails is reported instead of hanging the benchmark
+def test_benchmark_failing(monkeypatch):
+    import benchmark
+
+    def failing_bench_size(size, workers=8):
+        raise RuntimeError("no room")
+
+    monkeypatch.setattr(benchmark, 'bench_size', failing_bench_size)
+    results = benchmark.run([12], workers=2)
+    assert results['runs'] == [{'speakers': 12,
+                                'error': "RuntimeError: no room"}]
+
+
+# TEST RESPONSE CACHE
+
+# pass - stored responses can be looked up together with their result
+def test_cache_store_lookup(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    url = "https://x.org/2015/Fahrplan/speakers/1.html"
+    assert cache.lookup(url) is None
+    cache.store(url, "<html></html>", etag='"abc"')
+    cache.store_result(url, 'speaker1')
+    assert cache.lookup(url) == {'body': "<html></html>", 'etag': '"abc"',
+                                 'last_modified': None, 'result': 'speaker1'}
+    cache.close()
+
+
+# pass - oldest responses are evicted once max. size is exceeded
+def test_cache_evict_size(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_size=0.0005)
+    for i in range(3):
+        cache.store("https://x.org/{}.html".format(i), "x" * 500, etag='"e"')
+    cache.evict()
+    assert cache.lookup("https://x.org/0.html") is None
+    assert cache.lookup("https://x.org/1.html") is None
+    assert cache.lookup("https://x.org/2.html")
+    cache.close()
+
+
+# pass - expired responses are neither returned nor kept
+def test_cache_evict_ttl(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=0)
+    cache.store("https://x.org/1.html", "x", etag='"e"')
+    assert cache.lookup("https://x.org/1.html") is None
+    cache.evict()
+    count = cache.db.execute("SELECT count(*) FROM responses").fetchone()[0]
+    assert count == 0
+    cache.close()
+
+
+# local stand-in for the Fahrplan supporting conditional requests
+@pytest.fixture
+def revalidating_server():
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        hits = []
+
+        def do_GET(self):
+            Handler.hits.append(self.headers.get('If-None-Match'))
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = (b'<html><body><a href="https://twitter.com/speaker1">'
+                    b'Twitter</a></body></html>')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('ETag', '"v1"')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:{}/2015/Fahrplan/".format(server.server_port), \
+        Handler.hits
+    server.shutdown()
+    server.server_close()
+
+
+# pass - unchanged profiles are revalidated and not parsed again
+def test_cache_revalidate_profile(revalidating_server, tmp_path, monkeypatch):
+    import c3speakers
+    base_url, hits = revalidating_server
+    url = "{}speakers/1.html".format(base_url)
+    db_file = str(tmp_path / "cache.sqlite")
+
+    client = FetchClient()
+    cache = ResponseCache(db_file)
+    assert parse_speaker_profile(url, client=client, cache=cache) == 'speaker1'
+    cache.close()
+
+    # second run: 304, the soup must not be built at all
+    def no_parsing(*args, **kwargs):
+        raise AssertionError("page was parsed again")
+
+    monkeypatch.setattr(c3speakers, 'BeautifulSoup', no_parsing)
+    cache = ResponseCache(db_file)
+    assert parse_speaker_profile(url, client=client, cache=cache) == 'speaker1'
+    assert url in cache.revalidated
+    assert hits == [None, '"v1"']
+    cache.close()
+    client.close()
+
+
+# pass - streamed pages are cached once read and revalidated on later runs
+def test_cache_revalidate_stream(revalidating_server, tmp_path):
+    base_url, hits = revalidating_server
+    url = "{}speakers.html".format(base_url)
+    client = FetchClient()
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    body = b''.join(open_website(url, client=client, cache=cache,
+                                 stream=True, raw=True))
+    assert cache.lookup(url)['body'] == body
+    assert open_website(url, client=client, cache=cache, stream=True,
+                        raw=True) == body
+    assert hits == [None, '"v1"']
+    cache.close()
+    client.close()
+
+
+# TEST HANDLE CACHE
+
+# pass - the status of Twitter handles is cached until the TTL expires
+def test_handle_cache(tmp_path):
+    handles = HandleCache(str(tmp_path / "handles.sqlite"))
+    assert handles.get(['alice_c3']) == {}
+    handles.set([('alice_c3', '123', HandleCache.VALID),
+                 ('gone', None, HandleCache.INVALID)])
+    assert handles.get(['Alice_C3', 'bob']) == {
+        'Alice_C3': ('123', HandleCache.VALID)}
+    assert handles.invalid(['alice_c3', 'GONE', 'bob']) == {'GONE'}
+    handles.close()
+    # expired entries are evicted
+    handles = HandleCache(str(tmp_path / "handles.sqlite"), ttl=0)
+    assert handles.get(['alice_c3', 'gone']) == {}
+    handles.close()
+
+
+
+# TEST MACHINE-READABLE FAHRPLAN
+
+# pass - speakers.json lists speakers with their links
+def test_parse_speakers_json():
+    data = {'schedule_speakers': {'version': '1.0', 'speakers': [
+        {'id': 6112, 'public_name': 'Alice',
+         'links': [{'url': 'https://example.org', 'title': 'Blog'},
+                   {'url': 'https://twitter.com/alice_c3', 'title': 'Tw'}]},
+        {'id': 6113, 'full_name': 'Bob', 'links': []},
+    ]}}
+    assert parse_speakers_json(data) == (
+        {'6112': 'Alice', '6113': 'Bob'}, {'6112': 'alice_c3'}, True)
+
+
+# pass - schedule.json lists speakers per event, possibly without links
+def test_parse_schedule_json():
+    event1 = {'id': 1, 'persons': [{'id': 1, 'public_name': 'Alice'}]}
+    event2 = {'id': 2, 'persons': [{'id': 1, 'public_name': 'Alice'},
+                                   {'id': 2, 'public_name': 'Bob'}]}
+    data = {'schedule': {'conference': {'days': [
+        {'rooms': {'Saal 1': [event1]}},
+        {'rooms': {'Saal 2': [event2], 'Saal G': []}},
+    ]}}}
+    assert parse_schedule_json(data) == (
+        {'1': 'Alice', '2': 'Bob'}, {}, False)
+
+
+# pass - schedule.xml is parsed from chunks, faulty IDs are skipped
+def test_parse_schedule_xml():
+    xml = (b'<?xml version="1.0" encoding="utf-8"?><schedule><day><room>'
+           b'<event id="1"><persons><person id="1">Alice</person>'
+           b'<person id="2">B\xc3\xb6b</person></persons></event>'
+           b'<event id="2"><persons><person id="x">Eve</person>'
+           b'</persons></event></room></day></schedule>')
+    chunks = (xml[i:i + 16] for i in range(0, len(xml), 16))
+    assert parse_schedule_xml(chunks) == (
+        {'1': 'Alice', '2': u'B\xf6b'}, {}, False)
+
+
+# TEST HTML EXTRACTION ENGINES
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def fixture_html(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+# engines that can be used in this environment
+def available_engines():
+    engines = ['soup', 'stream']
+    if lxml_html:
+        engines.append('lxml')
+    return engines
+
+
+# pass - speakers are found by all engines alike
+@pytest.mark.parametrize('engine', available_engines())
+def test_find_speakers_engines(engine):
+    speakers = find_speakers(fixture_html('speakers.html'), engine=engine)
+    assert speakers == {'6112': 'Alice', '6217': u'Bob & B\xf6b',
+                        '6339': 'Carol', '7001': 'Dave'}
+
+
+# pass - speakers are streamed with absolute profile URLs by all engines
+@pytest.mark.parametrize('engine', available_engines())
+def test_iter_speakers_engines(engine):
+    records = iter_speakers(fixture_html('speakers.html'), engine=engine,
+                            base_url="https://x.org/2015/Fahrplan/")
+    assert list(records) == [
+        (6112, 'Alice',
+         "https://x.org/congress/2015/Fahrplan/speakers/6112.html"),
+        (6217, u'Bob & B\xf6b',
+         "https://x.org/congress/2015/Fahrplan/speakers/6217.html"),
+        (6339, 'Carol',
+         "https://x.org/congress/2015/Fahrplan/speakers/6339.html"),
+        (7001, 'Dave',
+         "https://x.org/congress/2015/Fahrplan/speakers/7001.html")]
+
+
+# pass - the first speaker is yielded before the listing is read entirely
+def test_iter_speakers_streaming():
+    html = fixture_html('speakers.html').encode('utf-8')
+    read = []
+
+    def chunks():
+        # split multi-byte characters on purpose
+        for i in range(0, len(html), 7):
+            read.append(i)
+            yield html[i:i + 7]
+
+    records = iter_speakers(chunks())
+    assert next(records)[:2] == (6112, 'Alice')
+    assert len(read) < len(html) // 7
+    assert [record[1] for record in records] == [
+        u'Bob & B\xf6b', 'Carol', 'Dave']
+
+
+# pass - malformed speaker URLs are skipped, the others are still found
+@pytest.mark.parametrize('engine', available_engines())
+def test_iter_speakers_faulty_url(engine):
+    html = ('<a href="/2015/Fahrplan/speakers/1.html">Alice</a>'
+            '<a href="/2015/Fahrplan/speakers/abc.html">Eve</a>'
+            '<a href="/2015/Fahrplan/speakers/2.html">Bob</a>')
+    records = iter_speakers(html, engine=engine)
+    assert [record[:2] for record in records] == [(1, 'Alice'), (2, 'Bob')]
+
+
+# pass - the first Twitter link on a profile is found by all engines alike
+@pytest.mark.parametrize('engine', available_engines())
+def test_find_twitter_handle_engines(engine):
+    html = fixture_html('speaker_twitter.html')
+    assert find_twitter_handle(html, engine=engine) == 'alice_c3'
+    html = fixture_html('speaker_plain.html')
+    assert find_twitter_handle(html, engine=engine) is None
+
+
+# pass - links to Twitter's own pages (share buttons etc.) aren't handles
+@pytest.mark.parametrize('engine', available_engines())
+def test_find_twitter_handle_share(engine):
+    html = ('<html><body>'
+            '<a href="https://twitter.com/intent/tweet?text=32C3">Tweet</a>'
+            '<a href="https://twitter.com/share">Share</a>'
+            '<a href="https://twitter.com/@alice_c3">Twitter</a>'
+            '</body></html>')
+    assert find_twitter_handle(html, engine=engine) == 'alice_c3'
+
+
+# pass - all accounts + websites on a profile are found in a single pass
+@pytest.mark.parametrize('engine', available_engines())
+def test_find_social_links_engines(engine):
+    html = fixture_html('speaker_links.html')
+    assert find_social_links(html, engine=engine) == [
+        ('website', 'https://bob.example.org'),
+        ('twitter', 'bob_c3'),
+        ('fediverse', 'bob@chaos.social'),
+        ('fediverse', 'bob@social.example.net'),
+        ('github', 'bob-c3'),
+        ('bluesky', 'bob.bsky.social')]
+    assert find_social_links(fixture_html('speaker_plain.html'),
+                             engine=engine) == [
+        ('website', 'https://carol.example.org')]
+
+
+# pass - links are sorted by platform, others are ignored
+def test_social_link():
+    assert social_link("https://x.com/@alice_c3") == ('twitter', 'alice_c3')
+    assert social_link("@alice@Chaos.Social") == (
+        'fediverse', 'alice@chaos.social')
+    assert social_link("https://github.com/orgs/c3") is None
+    assert social_link("https://media.ccc.de/v/32c3") is None
+    assert social_link("https://fox.com/alice") == (
+        'website', 'https://fox.com/alice')
+    assert social_link("https://chaos.social/@alice") == (
+        'fediverse', 'alice@chaos.social')
+    # pages of other platforms look like fediverse accounts, but aren't
+    assert social_link("https://www.youtube.com/@chan") == (
+        'website', 'https://www.youtube.com/@chan')
+    assert social_link("https://medium.com/@writer") == (
+        'website', 'https://medium.com/@writer')
+    assert social_link("https://www.tiktok.com/@dancer")[0] == 'website'
+    assert social_link("https://www.threads.net/@poster")[0] == 'website'
+    # results cached by older versions only hold the Twitter handle
+    assert decode_links('alice_c3') == [('twitter', 'alice_c3')]
+    assert decode_links('') == []
+    links = [('twitter', 'alice_c3'), ('github', 'alice')]
+    assert decode_links(encode_links(links)) == links
+
+
+# pass - only valid handles are matched in Twitter URLs
+def test_twitter_url_regex():
+    def handle(url):
+        twitter_data = TWITTER_URL_REGEX.match(url)
+        return twitter_data.group(1) if twitter_data else None
+
+    assert handle("https://twitter.com/alice_c3") == 'alice_c3'
+    assert handle("http://www.twitter.com/#!/bob") == 'bob'
+    assert handle("https://twitter.com/home_office") == 'home_office'
+    assert handle("https://twitter.com/intent/user?screen_name=x") is None
+    assert handle("https://twitter.com/search?q=32c3") is None
+    assert handle("https://twitter.com/Home") is None
+    # handles have max. 15 characters
+    assert handle("https://twitter.com/sixteen_letters_") is None
+
+
+# pass - bytes and file objects (local files) are accepted as well
+def test_find_speakers_stream_bytes():
+    with open(os.path.join(FIXTURES, 'speakers.html'), 'rb') as f:
+        speakers = find_speakers(f, engine='stream')
+    assert len(speakers) == 4
+
+
+# fail - malformed speaker URL
+@pytest.mark.parametrize('engine', available_engines())
+def test_find_speakers_faulty_url(engine):
+    html = '<a href="/2015/Fahrplan/speakers/abc.html">Eve</a>'
+    assert find_speakers(html, engine=engine) is None
+
+
+# fail - unknown engine
+def test_extraction_engine_unknown():
+    with pytest.raises(ValueError):
+        extraction_engine('regex')
+
+
+# TEST SPEAKER RECORDS
+
+# pass - speakers are found by ID (int or str) and by handle
+def test_speakers_lookup():
+    speakers = Speakers({'1': 'Alice', 2: 'Bob'})
+    twitters = speakers.view('twitter')
+    twitters['1'] = 'Alice_C3'
+    assert speakers[1] == speakers['1'] == 'Alice'
+    assert '2' in speakers and 3 not in speakers and 'abc' not in speakers
+    assert list(speakers) == [1, 2]
+    assert speakers == {'1': 'Alice', '2': 'Bob'}
+    assert twitters == {1: 'Alice_C3'}
+    assert speakers.by_handle('@alice_c3') == SpeakerRecord(1, 'Alice',
+                                                            'Alice_C3')
+    assert speakers.by_handle('bob') is None
+    # deleting a handle leaves the speaker's name
+    del twitters[1]
+    assert not twitters and speakers.by_handle('alice_c3') is None
+    assert speakers.record('1') == SpeakerRecord(1, 'Alice')
+    assert speakers.subset(['2']) == {'2': 'Bob'}
+    assert speakers.subset({2}, exclude=True) == {'1': 'Alice'}
+    with pytest.raises(KeyError):
+        twitters[2]
+
+
+# pass - handles recurring across congresses are stored once
+def test_speakers_interned():
+    handle = ''.join(['alice', '_c3'])
+    speakers_2014 = Speakers({'1': handle}, field='twitter')
+    speakers_2015 = Speakers({'7': ''.join(['alice', '_c3'])},
+                             field='twitter')
+    assert speakers_2014[1] is speakers_2015[7]
+
+
+# pass - DB values come back as one collection holding names + handles
+def test_db_query_speakers(speakers_db):
+    dir_path, db = speakers_db
+    db_write(dir_path, db, 'speakers',
+             speakers=Speakers({'1': 'Alice', '2': 'Bob'}))
+    db_write(dir_path, db, 'speakers',
+             twitter=Speakers({'2': 'bob'}, field='twitter'))
+    twitters = db_query(dir_path, db, 'speakers', column='twitter')
+    assert isinstance(twitters, Speakers)
+    assert list(twitters.records()) == [SpeakerRecord(2, 'Bob', 'bob')]
+    changed, deleted = compare_values(twitters, {'2': 'bob_c3'})
+    assert changed == {'2': 'bob_c3'} and deleted == {}
+    changed, deleted = compare_values(
+        db_query(dir_path, db, 'speakers', column='name'), {2: 'Robert'})
+    assert changed == {2: 'Robert'} and deleted == {1: 'Alice'}
+
+
+# TEST DATABASE
+
+# db in a temporary directory, closed again after the test
+@pytest.fixture
+def speakers_db(tmp_path):
+    dir_path = "{}/".format(tmp_path)
+    db = db_connect(dir_path, 'speakers', 'speakers', 2015)
+    yield dir_path, db
+    db_close()
+
+
+# pass - speakers are inserted once, names are not overwritten
+def test_db_write_speakers(speakers_db):
+    dir_path, db = speakers_db
+    db_write(dir_path, db, 'speakers', speakers={'1': 'Alice', '2': 'Bob'})
+    db_write(dir_path, db, 'speakers', speakers={'2': 'Robert', '3': 'Carol'})
+    assert db_query(dir_path, db, 'speakers', column='name') == {
+        '1': 'Alice', '2': 'Bob', '3': 'Carol'}
+
+
+# pass - existing Twitter handles are not overwritten
+def test_db_write_twitter(speakers_db):
+    dir_path, db = speakers_db
+    db_write(dir_path, db, 'speakers', speakers={'1': 'Alice', '2': 'Bob'})
+    db_write(dir_path, db, 'speakers', twitter={'1': 'alice'})
+    db_write(dir_path, db, 'speakers', twitter={'1': 'alice2', '2': 'bob'})
+    assert db_query(dir_path, db, 'speakers', column='twitter') == {
+        '1': 'alice', '2': 'bob'}
+
+
+# pass - empty table results in None
+def test_db_query_empty(speakers_db):
+    dir_path, db = speakers_db
+    assert db_query(dir_path, db, 'speakers', column='twitter') is None
+
+
+# pass - all calls of a run share one connection
+def test_db_connection_reused(speakers_db):
+    dir_path, db = speakers_db
+    assert db_connection(dir_path, db) is db_connection(dir_path, db)
+
+
+# pass - bulk profile switches the db to WAL mode
+def test_db_bulk_profile(tmp_path):
+    dir_path = "{}/".format(tmp_path)
+    db = db_connect(dir_path, 'speakers', 'speakers', 2015, profile='bulk')
+    mode = db_connection(dir_path, db).execute(
+        "PRAGMA journal_mode").fetchone()[0]
+    db_close()
+    assert mode == 'wal'
+
+
+# pass - changes between DB and new values are found inside the DB
+def test_db_diff(speakers_db):
+    dir_path, db = speakers_db
+    db_write(dir_path, db, 'speakers',
+             speakers={'1': 'Alice', '2': 'Bob', '3': 'Carol', '4': 'Dave'})
+    db_write(dir_path, db, 'speakers',
+             twitter={'1': 'alice', '2': 'bob', '4': 'dave'})
+    speakers = {'1': 'Alice', '2': 'Robert', '3': 'Carol', '5': 'Eve'}
+    twitters = {'1': 'alice_c3', '3': 'carol'}
+    s_changed, s_deleted, s_new, t_changed, t_deleted = db_diff(
+        dir_path, db, 'speakers', speakers, twitters)
+    assert s_changed == {2: ('Bob', 'Robert')}
+    assert s_deleted == {4: 'Dave'}
+    assert s_new == {5: 'Eve'}
+    assert t_changed == {1: ('alice', 'alice_c3')}
+    assert t_deleted == {2: 'bob', 4: 'dave'}
+    assert db_count(dir_path, db, 'speakers', column='twitter') == 3
+
+
+# pass - same changes as found by comparing dictionaries
+def test_db_diff_compare_values(speakers_db):
+    dir_path, db = speakers_db
+    db_write(dir_path, db, 'speakers',
+             speakers={'1': 'Alice', '2': 'Bob', '3': 'Carol'})
+    speakers = {'1': 'Alicia', '3': 'Carol'}
+    s_changed, s_deleted = compare_values(
+        db_query(dir_path, db, 'speakers', column='name'), speakers)
+    diff = db_diff(dir_path, db, 'speakers', speakers, {})
+    assert {k: v[1] for k, v in diff[0].items()} == s_changed
+    assert diff[1] == s_deleted
+
+
+# pass - only checked speakers' handles are compared in incremental runs
+def test_db_diff_checked(speakers_db):
+    dir_path, db = speakers_db
+    db_write(dir_path, db, 'speakers', speakers={'1': 'Alice', '2': 'Bob'})
+    db_write(dir_path, db, 'speakers', twitter={'1': 'alice', '2': 'bob'})
+    speakers = {'1': 'Alice', '2': 'Bob'}
+    diff = db_diff(dir_path, db, 'speakers', speakers, {'1': 'alice_c3'},
+                   checked={'1'})
+    assert diff[3] == {1: ('alice', 'alice_c3')}
+    assert diff[4] == {}
+
+
+# pass - a speaker's links replace the ones saved before
+def test_db_links(speakers_db):
+    dir_path, db = speakers_db
+    db_write_links(dir_path, db, 'speakers', {
+        '1': [('twitter', 'alice_c3'), ('github', 'alice')],
+        '2': [('fediverse', 'bob@chaos.social')]})
+    db_write_links(dir_path, db, 'speakers', {'1': [('github', 'alice')]})
+    assert db_query_links(dir_path, db, 'speakers') == {
+        1: [('github', 'alice')], 2: [('fediverse', 'bob@chaos.social')]}
+    assert db_query_links(dir_path, db, 'speakers', platform='github') == {
+        1: [('github', 'alice')]}
+
+
+# pass - new, renamed and unchecked speakers are due for a check
+def test_db_stale(speakers_db):
+    dir_path, db = speakers_db
+    db_write(dir_path, db, 'speakers',
+             speakers={'1': 'Alice', '2': 'Bob', '3': 'Carol'})
+    db_checked(dir_path, db, 'speakers', {'1', '2'})
+    speakers = {'1': 'Alice', '2': 'Robert', '3': 'Carol', '4': 'Dave'}
+    assert db_stale(dir_path, db, 'speakers', speakers) == {2, 3, 4}
+    assert db_stale(dir_path, db, 'speakers', speakers,
+                    max_age=0) == {1, 2, 3, 4}
+
+
+# pass - renamed speakers are only due for a check until they are checked
+def test_db_stale_renamed(speakers_db):
+    dir_path, db = speakers_db
+    db_write(dir_path, db, 'speakers', speakers={'1': 'Alice', '2': 'Bob'})
+    db_checked(dir_path, db, 'speakers', {'1', '2'})
+    speakers = {'1': 'Alice', '2': 'Robert'}
+    assert db_stale(dir_path, db, 'speakers', speakers) == {2}
+    db_checked(dir_path, db, 'speakers', {'2'}, speakers=speakers)
+    assert db_stale(dir_path, db, 'speakers', speakers) == set()
+    # the name saved first is kept, for the rename to be reported
+    assert db_query(dir_path, db, 'speakers', column='name') == {
+        '1': 'Alice', '2': 'Bob'}
+
+
+# pass - dbs from before incremental runs get the last_checked column
+def test_db_connect_migration(tmp_path):
+    dir_path = "{}/".format(tmp_path)
+    old = sqlite3.connect("{}speakers2015.sqlite".format(dir_path))
+    old.execute("CREATE TABLE speakers (id INTEGER PRIMARY KEY, "
+                "name TEXT, twitter TEXT)")
+    old.execute("INSERT INTO speakers VALUES (1, 'Alice', 'alice')")
+    old.commit()
+    old.close()
+    db = db_connect(dir_path, 'speakers', 'speakers', 2015)
+    stale = db_stale(dir_path, db, 'speakers', {'1': 'Alice'})
+    db_close()
+    assert stale == {1}
+
+
+# pass - checkpointed profiles can be read back until cleared
+def test_db_checkpoint(speakers_db):
+    dir_path, db = speakers_db
+    db_checkpoint(dir_path, db, 'speakers', [('1', 'alice'), ('2', None)])
+    assert db_resume(dir_path, db, 'speakers') == {1: 'alice', 2: None}
+    db_checkpoint_clear(dir_path, db, 'speakers')
+    assert db_resume(dir_path, db, 'speakers') == {}
+
+
+# pass - the links found are checkpointed along with the handles
+def test_db_checkpoint_links(speakers_db):
+    dir_path, db = speakers_db
+    db_checkpoint(dir_path, db, 'speakers', [('1', 'alice'), ('2', None)],
+                  links={'1': [('twitter', 'alice'),
+                               ('website', 'https://alice.example')]})
+    links = {}
+    done = db_resume(dir_path, db, 'speakers', links=links)
+    # (profiles checkpointed without their links are fetched again)
+    assert done == {1: 'alice'}
+    assert links == {1: [('twitter', 'alice'),
+                           ('website', 'https://alice.example')]}
+
+
+# pass - a resumed run only fetches the profiles the interrupted run missed
+def test_crawler_resume(monkeypatch, tmp_path):
+    import c3speakers
+    dir_path = "{}/".format(tmp_path)
+    speakers = {str(i): 'Speaker {}'.format(i) for i in range(1, 6)}
+    requested = []
+    interrupted = []
+
+    def fake_find_speakers(self, speakers_base_url, file_ending=None,
+                           stream=False):
+        return speakers, None, '.html'
+
+    def fake_profile(url, **kwargs):
+        speaker_id = url.rsplit('/', 1)[-1].split('.')[0]
+        # the first run dies at speaker 4
+        if speaker_id == '4' and not interrupted:
+            interrupted.append(speaker_id)
+            sys.exit(1)
+        if interrupted:
+            requested.append(speaker_id)
+        return 'user{}'.format(speaker_id)
+
+    monkeypatch.setattr(Crawler, 'find_speakers', fake_find_speakers)
+    monkeypatch.setattr(c3speakers, 'parse_speaker_profile', fake_profile)
+    crawler = Crawler(dir_path, 'speakers', 'speakers', FetchClient(),
+                      RateLimiter(0), workers=1)
+    with pytest.raises(SystemExit):
+        crawler.congress(2015, 32)
+    # (profiles still in flight when the run died are fetched again)
+    del requested[:]
+    crawler.resume = True
+    summary = crawler.congress(2015, 32)
+    db = 'speakers2015.sqlite'
+    twitters = db_query(dir_path, db, 'speakers', column='twitter')
+    checkpoint = db_resume(dir_path, db, 'speakers')
+    db_close()
+    assert sorted(requested) == ['4', '5']
+    assert summary['twitters'] == 5
+    assert twitters == {i: 'user{}'.format(i) for i in speakers}
+    assert checkpoint == {}
+
+
+# pass - links found by an interrupted run are saved by the resumed one
+@pytest.mark.parametrize('pipeline', [False, True])
+def test_crawler_resume_links(monkeypatch, tmp_path, pipeline):
+    import c3speakers
+    dir_path = "{}/".format(tmp_path)
+    speakers = {str(i): 'Speaker {}'.format(i) for i in range(1, 6)}
+    interrupted = []
+
+    def fake_find_speakers(self, speakers_base_url, file_ending=None,
+                           stream=False):
+        return speakers, None, '.html'
+
+    def fake_fetch(url, **kwargs):
+        speaker_id = url.rsplit('/', 1)[-1].split('.')[0]
+        # the first run dies at speaker 4
+        if speaker_id == '4' and not interrupted:
+            interrupted.append(speaker_id)
+            sys.exit(1)
+        return ('<a href="https://twitter.com/user{0}">@user{0}</a>'
+                '<a href="https://{0}.example">Website</a>'
+                .format(speaker_id)), None
+
+    monkeypatch.setattr(Crawler, 'find_speakers', fake_find_speakers)
+    monkeypatch.setattr(c3speakers, 'fetch_speaker_profile', fake_fetch)
+    crawler = Crawler(dir_path, 'speakers', 'speakers', FetchClient(),
+                      RateLimiter(0), workers=1, pipeline=pipeline)
+    with pytest.raises(SystemExit):
+        crawler.congress(2015, 32)
+    crawler.resume = True
+    crawler.congress(2015, 32)
+    links = db_query_links(dir_path, 'speakers2015.sqlite', 'speakers')
+    db_close()
+    assert links == {int(i): [('twitter', 'user{}'.format(i)),
+                              ('website', 'https://{}.example'.format(i))]
+                     for i in speakers}
+
+
+# pass - profiles are fetched while the speakers page is still being read
+def test_crawler_streams_listing(monkeypatch, tmp_path):
+    import c3speakers
+    dir_path = "{}/".format(tmp_path)
+    events = []
+
+    def fake_open_website(url, stream=False, **kwargs):
+        assert stream
+
+        def chunks():
+            for i in range(1, 21):
+                events.append('listing')
+                yield ('<a href="/2015/Fahrplan/speakers/{0}.html">'
+                       'Speaker {0}</a>'.format(i)).encode('utf-8')
+        return chunks()
+
+    def fake_fetch(url, **kwargs):
+        events.append('profile')
+        speaker_id = url.rsplit('/', 1)[-1].split('.')[0]
+        return ('<a href="https://twitter.com/user{0}">@user{0}</a>'
+                .format(speaker_id)), None
+
+    monkeypatch.setattr(c3speakers, 'open_website', fake_open_website)
+    monkeypatch.setattr(c3speakers, 'fetch_speaker_profile', fake_fetch)
+    crawler = Crawler(dir_path, 'speakers', 'speakers', FetchClient(),
+                      RateLimiter(0), source='html', workers=1)
+    summary = crawler.congress(2015, 32, file_ending='.html')
+    speakers = db_query(dir_path, 'speakers2015.sqlite', 'speakers')
+    db_close()
+    assert events.index('profile') < len(events) - events[::-1].index(
+        'listing') - 1
+    assert summary['speakers'] == 20
+    assert summary['twitters'] == 20
+    assert len(speakers) == 20
+    assert speakers.by_handle('user20').name == 'Speaker 20'
+
+
+# TEST PIPELINE
+
+# pass - handles are parsed and saved while profiles are being fetched
+def test_crawl_pipeline(monkeypatch, speakers_db):
+    import c3speakers
+    import time
+    dir_path, db = speakers_db
+    speakers = {str(i): 'Speaker {}'.format(i) for i in range(1, 7)}
+    db_write(dir_path, db, 'speakers', speakers=speakers)
+    saved_early = []
+
+    def fake_fetch(url, **kwargs):
+        # the last profile is only fetched once earlier handles are saved
+        if url.endswith('/6.html'):
+            for i in range(50):
+                if db_count(dir_path, db, 'speakers', column='twitter') >= 2:
+                    saved_early.append(url)
+                    break
+                time.sleep(0.1)
+        speaker_id = url.rsplit('/', 1)[-1].split('.')[0]
+        if int(speaker_id) % 2:
+            return None, None
+        return fixture_html('speaker_twitter.html').replace(
+            'alice_c3', 'user{}'.format(speaker_id)), None
+
+    monkeypatch.setattr(c3speakers, 'fetch_speaker_profile', fake_fetch)
+    checked = []
+    twitters = run_pipeline(speakers, "https://x.org/2015/Fahrplan/", ".html",
+                            dir_path, db, 'speakers', workers=1, parsers=2,
+                            batch_size=1, limiter=RateLimiter(rate=0),
+                            callback=lambda i, handle: checked.append(i))
+    assert twitters == {'2': 'user2', '4': 'user4', '6': 'user6'}
+    assert sorted(checked) == sorted(speakers)
+    assert saved_early
+    assert db_query(dir_path, db, 'speakers', column='twitter') == twitters
+    assert db_stale(dir_path, db, 'speakers', speakers) == set()
+    # progress is saved by the writer along with the handles
+    assert db_resume(dir_path, db, 'speakers') == {
+        1: None, 2: 'user2', 3: None, 4: 'user4', 5: None, 6: 'user6'}
+
+
+# pass - only the pipeline's writer thread uses the db connection
+def test_crawl_pipeline_writer_thread(monkeypatch, tmp_path):
+    import c3speakers
+    import threading
+    dir_path = "{}/".format(tmp_path)
+    speakers = {str(i): 'Speaker {}'.format(i) for i in range(1, 5)}
+    # threads using the db while the pipeline runs
+    threads = set()
+    running = []
+    db_connection = c3speakers.db_connection
+    run_pipeline = c3speakers.run_pipeline
+
+    def fake_connection(*args, **kwargs):
+        if running:
+            threads.add(threading.get_ident())
+        return db_connection(*args, **kwargs)
+
+    def fake_run_pipeline(*args, **kwargs):
+        running.append(True)
+        try:
+            return run_pipeline(*args, **kwargs)
+        finally:
+            running.pop()
+
+    def fake_find_speakers(self, speakers_base_url, file_ending=None,
+                           stream=False):
+        return speakers, None, '.html'
+
+    def fake_fetch(url, **kwargs):
+        return fixture_html('speaker_twitter.html'), None
+
+    monkeypatch.setattr(Crawler, 'find_speakers', fake_find_speakers)
+    monkeypatch.setattr(c3speakers, 'fetch_speaker_profile', fake_fetch)
+    monkeypatch.setattr(c3speakers, 'db_connection', fake_connection)
+    monkeypatch.setattr(c3speakers, 'run_pipeline', fake_run_pipeline)
+    crawler = Crawler(dir_path, 'speakers', 'speakers', FetchClient(),
+                      RateLimiter(0), workers=2, pipeline=True)
+    summary = crawler.congress(2015, 32)
+    db_close()
+    assert summary['twitters'] == 4
+    assert len(threads) == 1 and threading.get_ident() not in threads
+
+
+# pass - parsers using lazily imported modules for the first time at once
+# all succeed (in a fresh interpreter, where nothing is imported yet)
+@pytest.mark.parametrize('engine', available_engines())
+def test_crawl_pipeline_fresh_imports(tmp_path, engine):
+    profiles = tmp_path / 'Fahrplan' / 'speakers'
+    profiles.mkdir(parents=True)
+    for i in range(1, 7):
+        (profiles / '{}.html'.format(i)).write_text(
+            fixture_html('speaker_twitter.html'), encoding='utf-8')
+    code = (
+        "import functools, threading\n"
+        "from http.server import ThreadingHTTPServer, "
+        "SimpleHTTPRequestHandler\n"
+        "from c3speakers import *\n"
+        "handler = functools.partial(SimpleHTTPRequestHandler, "
+        "directory={root!r})\n"
+        "handler.log_message = lambda *args: None\n"
+        "server = ThreadingHTTPServer(('127.0.0.1', 0), handler)\n"
+        "threading.Thread(target=server.serve_forever, daemon=True).start()\n"
+        "base_url = 'http://127.0.0.1:{{}}/Fahrplan/'.format("
+        "server.server_port)\n"
+        "db = db_connect({dir_path!r}, 'speakers', 'speakers', 2015)\n"
+        "speakers = {{str(i): 'Speaker {{}}'.format(i) for i in range(1, 7)}}\n"
+        "db_write({dir_path!r}, db, 'speakers', speakers=speakers)\n"
+        "twitters = run_pipeline(speakers, base_url, '.html', {dir_path!r}, "
+        "db, 'speakers', workers=6, limiter=RateLimiter(0), "
+        "engine={engine!r})\n"
+        "print('found', len(twitters))\n").format(
+            root=str(tmp_path), dir_path="{}/".format(tmp_path),
+            engine=engine)
+    stdout = run_python(tmp_path, code).stdout
+    assert 'Could not parse' not in stdout
+    assert 'found 6' in stdout
+
+
+# TEST ARCHIVE
+
+# pass - per-year dbs are imported, cross-year questions can be answered
+def test_archive_import(tmp_path):
+    dir_path = "{}/".format(tmp_path)
+    for year, speakers, twitter in (
+            (2013, {'1': 'Alice', '2': 'Bob'}, {'1': 'alice', '2': 'bob'}),
+            (2014, {'1': 'Alice', '3': 'Carol'}, {'1': 'alice_c3'}),
+            (2015, {'1': 'Alice', '2': 'Bob'}, {'1': 'alice_c3'})):
+        db = db_connect(dir_path, 'speakers', 'speakers', year)
+        db_write(dir_path, db, 'speakers', speakers=speakers)
+        db_write(dir_path, db, 'speakers', twitter=twitter)
+
+    archive_db = archive_connect(dir_path, 'archive')
+    imported = archive_import(dir_path, 'speakers', 'speakers', archive_db)
+    assert imported == {2013: 2, 2014: 2, 2015: 2}
+    # importing twice doesn't duplicate anything
+    archive_import(dir_path, 'speakers', 'speakers', archive_db)
+
+    assert archive_returning(dir_path, archive_db, 2014) == {1: [2014, 2015]}
+    assert archive_churn(dir_path, archive_db) == [
+        (2013, 2, 0, 0), (2014, 1, 1, 2), (2015, 1, 0, 0)]
+    db_close()
+
+
+# pass - DBs named after years without a congress are skipped
+def test_archive_import_invalid_year(tmp_path, capsys):
+    dir_path = "{}/".format(tmp_path)
+    db = db_connect(dir_path, 'speakers', 'speakers', 2015)
+    db_write(dir_path, db, 'speakers', speakers={'1': 'Alice'})
+    future = sqlite3.connect("{}speakers2099.sqlite".format(dir_path))
+    future.execute("CREATE TABLE speakers (id INTEGER PRIMARY KEY, "
+                   "name TEXT, twitter TEXT)")
+    future.execute("INSERT INTO speakers VALUES (1, 'Zoe', 'zoe')")
+    future.commit()
+    future.close()
+
+    archive_db = archive_connect(dir_path, 'archive')
+    imported = archive_import(dir_path, 'speakers', 'speakers', archive_db)
+    db_close()
+    assert imported == {2015: 1}
+    assert "Skipping speakers2099.sqlite" in capsys.readouterr().out
+
+# pass - runs update when speakers were last seen
+def test_archive_write_seen(tmp_path):
+    dir_path = "{}/".format(tmp_path)
+    archive_db = archive_connect(dir_path, 'archive')
+    archive_write(dir_path, archive_db, 2015, 32, speakers={'1': 'Alice'},
+                  twitter={'1': 'alice'}, seen='2015-12-01')
+    archive_write(dir_path, archive_db, 2015, 32, speakers={'1': 'Alicia'},
+                  twitter={'1': 'alice'}, seen='2015-12-27')
+    db = db_connection(dir_path, archive_db)
+    assert db.execute("SELECT name, first_seen, last_seen FROM speakers"
+                      ).fetchall() == [('Alicia', '2015-12-01', '2015-12-27')]
+    assert db.execute("SELECT handle, first_seen, last_seen FROM handles"
+                      ).fetchall() == [('alice', '2015-12-01', '2015-12-27')]
+    db_close()
+
+
+# TEST BATCH MODE
+
+# pass - range of years
+def test_congress_range_years():
+    assert congress_range('2013-2015') == [(2013, 30), (2014, 31), (2015, 32)]
+
+
+# pass - range of c3 shortcuts
+def test_congress_range_c3():
+    assert congress_range('27c3-28C3') == [(2010, 27), (2011, 28)]
+
+
+# fail - range in the wrong order
+def test_congress_range_reversed():
+    with pytest.raises(ValueError):
+        congress_range('2015-2013')
+
+
+# fail - no range
+def test_congress_range_invalid():
+    with pytest.raises(ValueError):
+        congress_range('2015')
+
+
+# pass - a range of a single congress crawls that congress
+def test_main_range_single(monkeypatch, tmp_path):
+    import sys
+    import configparser
+    crawled = []
+
+    def fake_congress(self, year, c3_no, **kwargs):
+        crawled.append((year, c3_no))
+
+    config = configparser.ConfigParser()
+    config.read(os.path.join(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))), 'config.txt'))
+    config.set('db', 'dir_path', "{}/".format(tmp_path))
+    with open(tmp_path / 'config.txt', 'w') as config_file:
+        config.write(config_file)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Crawler, 'congress', fake_congress)
+    monkeypatch.setattr(sys, 'argv', ['c3speakers.py', '--range',
+                                      '2013-2013'])
+    main()
+    assert crawled == [(2013, 30)]
+
+
+# pass - all congresses go through the same crawler, failures are reported
+def test_crawler_batch(monkeypatch):
+    crawled = []
+
+    def fake_congress(self, year, c3_no, **kwargs):
+        crawled.append(year)
+        if year == 2014:
+            sys.exit(1)
+        return {'year': year, 'c3_no': c3_no, 'speakers': 10, 'new': 2,
+                'twitters': 5, 'changes': 1, 'seconds': 1.25}
+
+    monkeypatch.setattr(Crawler, 'congress', fake_congress)
+    crawler = Crawler('/tmp/', 'speakers', 'speakers', FetchClient(),
+                      RateLimiter(0))
+    summaries = crawler.batch(congress_range('2013-2015'), parallel=2)
+    assert sorted(crawled) == [2013, 2014, 2015]
+    assert summary_table(summaries) == [
+        "Congress\tSpeakers\tNew\tTwitter\tChanges\tSeconds",
+        "30C3 (2013)\t10\t2\t5\t1\t1.2",
+        "31C3 (2014)\tfailed",
+        "32C3 (2015)\t10\t2\t5\t1\t1.2"]
+
+
+# TEST TWITTER LIST SYNC
+
+# pass - only the difference to the list's members is sent, in batches
+def test_sync_delta():
+    twittering = pytest.importorskip('twittering')
+    to_add, to_remove = twittering.sync_delta(['Alice', 'bob', 'carol'],
+                                              {'alice', 'dave'})
+    assert to_add == ['bob', 'carol']
+    assert to_remove == ['dave']
+    handles = ['user{}'.format(i) for i in range(250)]
+    assert [len(batch) for batch in twittering.member_batches(handles)] == [
+        100, 100, 50]
+
+
+# pass - the synced state of a list is kept in the DB
+def test_synced_state(speakers_db):
+    twittering = pytest.importorskip('twittering')
+    dir_path, db = speakers_db
+    slug = 'CCC-32C3-speakers'
+    assert twittering.synced_state(dir_path, db, slug) is None
+    twittering.record_synced(dir_path, db, slug, added=['alice', 'bob'])
+    twittering.record_synced(dir_path, db, slug, removed=['BOB'])
+    assert twittering.synced_state(dir_path, db, slug) == {'alice'}
+    twittering.record_synced(dir_path, db, slug, added=['carol'],
+                             replace=True)
+    assert twittering.synced_state(dir_path, db, slug) == {'carol'}
+    # synced to an empty list: nothing to fetch from Twitter again
+    twittering.record_synced(dir_path, db, slug, removed=['carol'])
+    assert twittering.synced_state(dir_path, db, slug) == set()
+    twittering.record_synced(dir_path, db, 'empty', replace=True)
+    assert twittering.synced_state(dir_path, db, 'empty') == set()
+
+
+# pass - calls wait for the reset of a used-up rate limit window
+def test_twitter_client_window(monkeypatch):
+    twittering = pytest.importorskip('twittering')
+    import types
+    clock = [1000.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(twittering, 'time', types.SimpleNamespace(
+        time=lambda: clock[0], sleep=sleep))
+
+    class Response(dict):
+        rate_limit_reset = 1010
+
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        response = Response()
+        # window of 2 calls, reset at 1010
+        response.rate_limit_remaining = max(0, 2 - len(calls))
+        return response
+
+    t = types.SimpleNamespace(lists=types.SimpleNamespace(create=create))
+    client = twittering.TwitterClient(t)
+    client.call('lists.create', name='a')
+    # one call left in the window, then it's used up until 1010
+    client.call('lists.create', name='b')
+    assert sleeps == []
+    client.call('lists.create', name='c')
+    assert sleeps == [11.0]
+    assert [call['name'] for call in calls] == ['a', 'b', 'c']
+    assert client.calls == 3
+
+
+# local stand-in for the Twitter API: answers the first two calls of
+# create_all with 429 + 503, and lists.list with rate-limit headers
+@pytest.fixture
+def twitter_server():
+    import json
+    import threading
+    import time
+    from urllib.parse import parse_qs
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    state = {'errors': [429, 503], 'members': [], 'calls': []}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def answer(self, status, body):
+            body = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('x-rate-limit-remaining', '5')
+            self.send_header('x-rate-limit-reset', str(int(time.time())))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            state['calls'].append(self.path.split('?')[0])
+            self.answer(200, [{'slug': 'CCC-32C3-speakers'}])
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            params = parse_qs(self.rfile.read(length).decode('utf-8'))
+            with lock:
+                state['calls'].append(self.path)
+                status = state['errors'].pop(0) if state['errors'] else 200
+            if status != 200:
+                self.answer(status, {'errors': [{'code': status}]})
+                return
+            with lock:
+                state['members'].extend(params['screen_name'][0].split(', '))
+            self.answer(200, {'slug': params['slug'][0]})
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield '127.0.0.1:{}'.format(server.server_port), state
+    server.shutdown()
+    server.server_close()
+
+
+# pass - failed batches are retried, all batches reach the list
+def test_twitter_client_batches(twitter_server):
+    twittering = pytest.importorskip('twittering')
+    twitter = pytest.importorskip('twitter')
+    domain, state = twitter_server
+    t = twitter.Twitter(auth=twitter.NoAuth(), domain=domain, secure=False)
+    client = twittering.TwitterClient(t, workers=2, retries=3, backoff=0)
+    result = client.call('lists.list', screen_name='c3')
+    assert result[0]['slug'] == 'CCC-32C3-speakers'
+    assert client.limits['lists.list'][0] == 5
+
+    handles = ['user{}'.format(i) for i in range(250)]
+    done = list(client.submit_all('lists.members.create_all',
+                                  twittering.member_batches(handles),
+                                  slug='CCC-32C3-speakers',
+                                  owner_screen_name='c3'))
+    assert [err for batch, response, err in done] == [None, None, None]
+    assert sorted(state['members']) == sorted(handles)
+    # 3 batches + 2 retries, plus lists.list
+    assert len(state['calls']) == 6
+
+
+# pass - handles are looked up once (100 per call), then taken from the cache
+def test_verify_handles(tmp_path):
+    twittering = pytest.importorskip('twittering')
+    import types
+    calls = []
+
+    def lookup(screen_name, include_entities):
+        calls.append(screen_name.split(','))
+        return [{'screen_name': handle.upper(), 'id_str': handle[4:]}
+                for handle in screen_name.split(',')
+                if not handle.endswith('7')]
+
+    t = types.SimpleNamespace(users=types.SimpleNamespace(lookup=lookup))
+    client = twittering.TwitterClient(t)
+    cache = HandleCache(str(tmp_path / "handles.sqlite"))
+    handles = ['user{}'.format(i) for i in range(150)]
+    invalid = twittering.verify_handles(client, cache, handles)
+    assert invalid == {handle for handle in handles if handle.endswith('7')}
+    assert sorted(len(batch) for batch in calls) == [50, 100]
+    assert cache.get(['user1']) == {'user1': ('1', HandleCache.VALID)}
+    assert twittering.verify_handles(client, cache, handles) == invalid
+    assert len(calls) == 2
+    cache.close()
@@ -24,20 +24,347 @@ https://en.wikipedia.org/wiki/Chaos_Communication_Congress
 """
 
 import configparser
+import getopt
 import os
 import sys
 import urllib
+import sqlite3
+import time
+import random
+import threading
 import c3speakers
-from twitter import *
 from datetime import date
-from config_twitter import *
+
+# the Twitter API client is only loaded once Twitter is contacted,
+# syncs without changes never need it
+twitter = c3speakers.lazy_import('twitter')
+concurrent_futures = c3speakers.lazy_import('concurrent.futures')
+
+# max amount of twitter users to add to/remove from a list at once
+TMAX = 100
+
+
+def usage():
+    howto = ("Usage: python3 {} "
+             "[-s] "
+             "[--refresh]".format(sys.argv[0]))
+    return howto
+
+
+class TwitterClient(object):
+    """
+    Wrapper around a Twitter connection which keeps within Twitter's
+    rate limits and retries transient failures.
+
+    The rate-limit headers of every response (remaining calls + reset
+    time of the current window, per endpoint) are remembered; once an
+    endpoint's window is used up, further calls wait for its reset.
+    Calls failing with 429 wait for the reset as well, network errors and
+    5xx errors are retried with jittered exponential backoff. Batches can
+    be submitted by several workers at once.
+    """
+
+    # status codes worth trying again
+    retry_codes = (500, 502, 503, 504)
+
+    def __init__(self, t, workers=2, retries=3, backoff=1.0,
+                 max_wait=15 * 60):
+        """
+        :param t: Twitter connection (twitter.Twitter or an equivalent)
+        :param workers: max. no. of batches submitted at the same time
+        :param retries: max. no. of retries of a failed call
+        :param backoff: backoff factor (seconds) between retries
+        :param max_wait: longest wait (seconds) for a rate limit window
+        """
+        self.t = t
+        self.workers = max(1, workers)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_wait = max_wait
+        # per endpoint: calls remaining + reset time (epoch seconds)
+        self.limits = {}
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def reserve(self, endpoint):
+        """Wait until a call to endpoint fits into its rate limit window.
+        :param endpoint: dotted name of the endpoint, e.g. lists.create
+        """
+        while True:
+            with self.lock:
+                remaining, reset = self.limits.get(endpoint, (None, None))
+                now = time.time()
+                if remaining is None or remaining > 0 or reset <= now:
+                    if remaining is not None and reset > now:
+                        # count the call against the window right away,
+                        # so parallel calls don't overshoot it
+                        self.limits[endpoint] = (remaining - 1, reset)
+                    else:
+                        self.limits.pop(endpoint, None)
+                    self.calls += 1
+                    return
+                delay = min(reset - now, self.max_wait) + 1
+            print("Rate limit of {} reached, waiting {:.0f}s".format(
+                endpoint, delay))
+            time.sleep(delay)
+
+    def update(self, endpoint, headers):
+        """Remember an endpoint's rate limit window.
+        :param endpoint: dotted name of the endpoint
+        :param headers: rate-limit values/headers of the response
+        """
+        try:
+            remaining = int(headers.get('x-rate-limit-remaining'))
+            reset = int(headers.get('x-rate-limit-reset'))
+        except (TypeError, ValueError):
+            return
+        with self.lock:
+            self.limits[endpoint] = (remaining, reset)
+
+    def call(self, endpoint, **kwargs):
+        """Call a Twitter API endpoint within its rate limits.
+        :param endpoint: dotted name of the endpoint, e.g. lists.create
+        :param kwargs: parameters of the call
+        :return: the response
+        """
+        method = self.t
+        for name in endpoint.split('.'):
+            method = getattr(method, name)
+
+        attempt = 0
+        while True:
+            self.reserve(endpoint)
+            try:
+                response = method(**kwargs)
+                self.update(endpoint, {
+                    'x-rate-limit-remaining': getattr(
+                        response, 'rate_limit_remaining', None),
+                    'x-rate-limit-reset': getattr(
+                        response, 'rate_limit_reset', None)})
+                return response
+            except twitter.TwitterHTTPError as err:
+                code = err.e.code
+                headers = err.e.headers or {}
+                # window used up: wait for its reset, then try again
+                if code == 429:
+                    self.update(endpoint, {
+                        'x-rate-limit-remaining': 0,
+                        'x-rate-limit-reset': headers.get(
+                            'x-rate-limit-reset',
+                            int(time.time() + self.backoff * 60))})
+                    if attempt >= self.retries:
+                        raise
+                    attempt += 1
+                    continue
+                if code not in self.retry_codes or attempt >= self.retries:
+                    raise
+            # no connection to Twitter
+            except urllib.error.URLError:
+                if attempt >= self.retries:
+                    raise
+            # full jitter keeps workers from retrying in lockstep
+            time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+            attempt += 1
+
+    def submit_all(self, endpoint, batches, separator=', ', **kwargs):
+        """Submit batches to an endpoint, several at once.
+        :param endpoint: dotted name of the endpoint
+        :param batches: lists of screen names (one call each)
+        :param separator: string joining the screen names of a batch
+        :param kwargs: parameters shared by all calls
+        :return: generator of (batch, response, error) as calls complete
+        (response None on errors, error None otherwise)
+        """
+        with concurrent_futures.ThreadPoolExecutor(
+                max_workers=self.workers) as executor:
+            futures = {executor.submit(self.call, endpoint,
+                                       screen_name=separator.join(batch),
+                                       **kwargs): batch
+                       for batch in batches}
+            for future in concurrent_futures.as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as err:
+                    yield futures[future], None, err
+
+
+def member_batches(handles, size=TMAX):
+    """Split Twitter handles into sublists of max. size handles each,
+    as Twitter only accepts max. 100 per create_all/destroy_all call.
+    :param handles: list of Twitter handles
+    :param size: max. no. of handles per sublist
+    """
+    return (handles[x:x + size] for x in range(0, len(handles), size))
+
+
+def verify_handles(client, cache, handles):
+    """Find out which handles belong to existing Twitter accounts.
+
+    Handles verified within the cache's TTL are taken from the cache,
+    all others are looked up via users/lookup (100 per call) and cached.
+    :param client: TwitterClient
+    :param cache: c3speakers.HandleCache
+    :param handles: Twitter handles
+    :return: set of the handles of non-existent/suspended accounts
+    """
+    known = cache.get(handles)
+    invalid = {handle for handle, (user_id, status) in known.items()
+               if status == cache.INVALID}
+    unknown = [handle for handle in handles if handle not in known]
+    if not unknown:
+        return invalid
+
+    batches = client.submit_all('users.lookup', member_batches(unknown),
+                                separator=',', include_entities='false')
+    for batch, users, err in batches:
+        if err is not None:
+            # none of the batch's accounts exist
+            if isinstance(err, twitter.TwitterHTTPError) \
+                    and err.e.code == 404:
+                users = []
+            # handles which couldn't be verified are tried again next time
+            else:
+                print("Could not verify Twitter accounts:\n{}".format(
+                    ', '.join(batch)))
+                print(err)
+                continue
+        found = {user['screen_name'].lower(): user['id_str']
+                 for user in users}
+        entries = []
+        for handle in batch:
+            user_id = found.get(handle.lower())
+            if user_id:
+                entries.append((handle, user_id, cache.VALID))
+            else:
+                entries.append((handle, None, cache.INVALID))
+                invalid.add(handle)
+        cache.set(entries)
+    return invalid
+
+
+def list_members(client, list_slug, owner):
+    """Fetch the current members of a Twitter list (page by page).
+    :param client: TwitterClient
+    :param list_slug: slug of the list
+    :param owner: screen name of the list's owner
+    :return: set of the members' screen names
+    """
+    members = set()
+    cursor = -1
+    while cursor:
+        result = client.call('lists.members', slug=list_slug,
+                             owner_screen_name=owner, count=5000,
+                             cursor=cursor, include_entities='false',
+                             skip_status='true')
+        members.update(user['screen_name'] for user in result['users'])
+        cursor = result['next_cursor']
+    return members
+
+
+def sync_delta(handles, members):
+    """Compare the wanted members of a Twitter list with its current ones
+    (Twitter handles are case-insensitive).
+    :param handles: Twitter handles which should be members
+    :param members: Twitter handles which are members
+    :return: sorted lists of handles to add + handles to remove
+    """
+    wanted = {handle.lower(): handle for handle in handles}
+    current = {member.lower(): member for member in members}
+    to_add = sorted(wanted[handle]
+                    for handle in wanted.keys() - current.keys())
+    to_remove = sorted(current[handle]
+                       for handle in current.keys() - wanted.keys())
+    return to_add, to_remove
+
+
+def synced_db(dir_path, db_name):
+    """Return the connection to the DB holding the synced state of
+    Twitter lists (creating its table if necessary).
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB holding the synced state
+    """
+    db = c3speakers.db_connection(dir_path, db_name)
+    with db:
+        db.execute("CREATE TABLE IF NOT EXISTS twitter_list "
+                   "(slug TEXT, handle TEXT COLLATE NOCASE, synced TEXT, "
+                   "PRIMARY KEY (slug, handle))")
+        # lists synced at least once (their members may all be gone)
+        db.execute("CREATE TABLE IF NOT EXISTS twitter_list_synced "
+                   "(slug TEXT PRIMARY KEY, synced TEXT)")
+    return db
+
+
+def synced_state(dir_path, db_name, list_slug):
+    """Return the members of a Twitter list as of the last sync.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB holding the synced state
+    :param list_slug: slug of the list
+    :return: set of Twitter handles, None if the list was never synced
+    """
+    db = synced_db(dir_path, db_name)
+    rows = db.execute("SELECT handle FROM twitter_list WHERE slug = ?",
+                      (list_slug,)).fetchall()
+    # a list synced to no members at all is still synced
+    # (states recorded by older versions have members only)
+    if not rows and not db.execute(
+            "SELECT 1 FROM twitter_list_synced WHERE slug = ?",
+            (list_slug,)).fetchone():
+        return None
+    return {row[0] for row in rows}
+
+
+def record_synced(dir_path, db_name, list_slug, added=(), removed=(),
+                  replace=False):
+    """Record members added to/removed from a Twitter list.
+    :param dir_path: path to the directory containing the sqlite db
+    :param db_name: name of the DB holding the synced state
+    :param list_slug: slug of the list
+    :param added: Twitter handles added to the list
+    :param removed: Twitter handles removed from the list
+    :param replace: forget all members recorded before
+    """
+    db = synced_db(dir_path, db_name)
+    with db:
+        if replace:
+            db.execute("DELETE FROM twitter_list WHERE slug = ?",
+                       (list_slug,))
+        db.executemany("INSERT OR REPLACE INTO twitter_list "
+                       "(slug, handle, synced) "
+                       "VALUES (?, ?, datetime('now'))",
+                       ((list_slug, handle) for handle in added))
+        db.executemany("DELETE FROM twitter_list "
+                       "WHERE slug = ? AND handle = ?",
+                       ((list_slug, handle) for handle in removed))
+        db.execute("INSERT OR REPLACE INTO twitter_list_synced "
+                   "(slug, synced) VALUES (?, datetime('now'))",
+                   (list_slug,))
 
 
 def main():
     c3 = 'C3'
-    # max amount of twitter users to add to one list
-    tmax = 100
     year = date.today().year
+    # only send the difference between the list and the DB
+    sync = False
+    # fetch the list's members from Twitter instead of using the synced state
+    refresh = False
+
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], 'hs', ['help', 'sync',
+                                                        'refresh'])
+    except getopt.GetoptError as err:
+        print(err)
+        print(usage())
+        sys.exit(1)
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):
+            print(usage())
+            sys.exit(1)
+        elif opt in ('-s', '--sync'):
+            sync = True
+        elif opt == '--refresh':
+            sync = True
+            refresh = True
 
     # get vars from config file
     config = configparser.ConfigParser()
@@ -45,6 +372,15 @@ def main():
     dir_path = config.get('db', 'dir_path')
     db_name = config.get('db', 'db_name')
     table = config.get('db', 'table')
+    # Twitter API endpoint + how to handle its rate limits
+    domain = config.get('twitter', 'domain', fallback='api.twitter.com')
+    secure = config.getboolean('twitter', 'secure', fallback=True)
+    workers = config.getint('twitter', 'workers', fallback=2)
+    retries = config.getint('twitter', 'retries', fallback=3)
+    backoff = config.getfloat('twitter', 'backoff', fallback=1.0)
+    # Twitter handles verified before + how long they're trusted
+    handles_name = config.get('cache', 'handles_name', fallback='handles')
+    handles_ttl = config.getfloat('cache', 'handles_ttl', fallback=7)
 
     # congress data for specified year
     try:
@@ -79,10 +415,18 @@ def main():
         print("ERROR: No Twitter handles available to add to Twitter list.")
         sys.exit(1)
 
-    # split list into smaller sublists + turn into comma-delimited strings
-    # as Twitter only accepts max. 100 elements per create_all call
-    composite_list = (', '.join(twitters_list[x:x + tmax]) for x in
-                      range(0, len(twitters_list), tmax))
+    # skip handles of accounts known to not exist (anymore);
+    # they're removed from the list in sync mode
+    handle_cache = None
+    try:
+        handle_cache = c3speakers.HandleCache(
+            "{}{}.sqlite".format(dir_path, handles_name), ttl=handles_ttl)
+        invalid = handle_cache.invalid(twitters_list)
+        twitters_list = [handle for handle in twitters_list
+                         if handle not in invalid]
+    except sqlite3.Error as err:
+        print("Could not open the Twitter handle cache.")
+        print(err)
 
     list_count = 0
     exists = 0
@@ -92,9 +436,45 @@ def main():
     # debug
     print("List slug: {}".format(list_slug))
 
+    # sync mode: compare the DB with the list's members as of the last sync
+    synced = None
+    if sync and not refresh:
+        try:
+            synced = synced_state(dir_path, db, list_slug)
+        except sqlite3.Error as err:
+            print("Could not read the synced state of the Twitter list.")
+            print(err)
+    to_add = twitters_list
+    to_remove = []
+    if synced is not None:
+        to_add, to_remove = sync_delta(twitters_list, synced)
+        # nothing changed since the last sync: no need to contact Twitter
+        if not to_add and not to_remove:
+            print("Twitter list {} is up to date.".format(list_slug))
+            if handle_cache:
+                handle_cache.close()
+            return
+
+    if twitter is None:
+        print("ERROR: The Python Twitter Tools (twitter) are not installed.")
+        sys.exit(1)
+    # user-provided Twitter credentials
+    try:
+        from config_twitter import (atoken, atoken_secret, ckey, ckey_secret,
+                                    username)
+    except ImportError as err:
+        print("ERROR: Cannot read Twitter credentials from config_twitter.py "
+              "(see config_twitter.py.template).")
+        print(err)
+        sys.exit(1)
+
     # connect to/authenticate with Twitter
     try:
-        t = Twitter(auth=OAuth(atoken, atoken_secret, ckey, ckey_secret))
+        t = twitter.Twitter(auth=twitter.OAuth(atoken, atoken_secret, ckey,
+                                               ckey_secret),
+                            domain=domain, secure=secure)
+        client = TwitterClient(t, workers=workers, retries=retries,
+                               backoff=backoff)
     # unforseen exception
     except Exception as err:
         print("An unexpected error occurred on line {}:".format(
@@ -102,9 +482,15 @@ def main():
         print(err)
         sys.exit(1)
 
+    # the list existed at the last sync, no need to look for it
+    find_list = synced is None
+    result = []
+
     # retrieve users lists (includes private lists)
     try:
-        result = t.lists.list(screen_name=username, reversed='true')
+        if find_list:
+            result = client.call('lists.list', screen_name=username,
+                                 reversed='true')
     # raise exception in case connecting to Twitter is impossible
     except urllib.error.URLError:
         print("ERROR: Cannot connect to Twitter at this time.")
@@ -130,9 +516,9 @@ def main():
 
     # if the list does not exist yet, create it
     # and make it a private list for now
-    if exists == 0:
+    if find_list and exists == 0:
         try:
-            t.lists.create(name=list_slug, mode='private')
+            client.call('lists.create', name=list_slug, mode='private')
             print("Created Twitter list {}".format(list_slug))
         # raise exception in case connecting to Twitter is impossible
         except urllib.error.URLError:
@@ -146,30 +532,89 @@ def main():
             print("Exiting program.")
             sys.exit(1)
 
+    # sync mode without synced state: ask Twitter for the list's members
+    # (once, page by page) and start the synced state from them
+    if sync and find_list:
+        members = set()
+        try:
+            if exists:
+                members = list_members(client, list_slug, username)
+            record_synced(dir_path, db, list_slug, added=members,
+                          replace=True)
+        # raise exception in case connecting to Twitter is impossible
+        except urllib.error.URLError:
+            print("ERROR: Cannot connect to Twitter at this time.")
+            sys.exit(1)
+        # unforseen exception
+        except Exception as err:
+            print("An unexpected error occurred on line {}:".format(
+                sys.exc_info()[-1].tb_lineno))
+            print(err)
+            print("Exiting program.")
+            sys.exit(1)
+        to_add, to_remove = sync_delta(twitters_list, members)
+
+    # verify handles not verified within the TTL (100 per call)
+    if handle_cache:
+        try:
+            invalid = verify_handles(client, handle_cache, to_add)
+            if invalid:
+                print("Skipping {} invalid Twitter account(s):\n{}".format(
+                    len(invalid), ', '.join(sorted(invalid))))
+                to_add = [handle for handle in to_add
+                          if handle not in invalid]
+        except sqlite3.Error as err:
+            print("Could not update the Twitter handle cache.")
+            print(err)
+        handle_cache.close()
+
     print("---")
+    if sync:
+        print("{} member(s) to add, {} member(s) to remove".format(
+            len(to_add), len(to_remove)))
 
     # update the list with new list members
-    # (non-existent Twitter accounts will be ignored)
-    try:
-        for sublist in composite_list:
-            # use create_all to add up to 100 members at once
-            # via comma-delimited string
-            t.lists.members.create_all(slug=list_slug,
-                                       owner_screen_name=username,
-                                       screen_name=sublist)
-            print(
-                "Added new members to twitter list {}:\n{}".format(list_slug,
-                                                                   sublist))
-    # raise exception in case connecting to Twitter is impossible
-    except urllib.error.URLError:
-        print("ERROR: Cannot connect to Twitter at this time.")
-        sys.exit(1)
-    # unforseen exception
-    except Exception as err:
-        print("An unexpected error occurred on line {}:".format(
-            sys.exc_info()[-1].tb_lineno))
-        print(err)
-        print("Exiting program.")
+    # (non-existent Twitter accounts will be ignored by Twitter as well);
+    # use create_all/destroy_all to add/remove up to 100 members at once
+    # via comma-delimited string, several batches at the same time
+    failed = 0
+    for endpoint, handles, done in (
+            ('lists.members.create_all', to_add, "Added new members to"),
+            ('lists.members.destroy_all', to_remove,
+             "Removed members from")):
+        batches = client.submit_all(endpoint, member_batches(handles),
+                                    slug=list_slug,
+                                    owner_screen_name=username)
+        for sublist, response, err in batches:
+            # a failed batch does not stop the others
+            if err is not None:
+                failed += len(sublist)
+                print("ERROR: Could not update twitter list {}:\n{}".format(
+                    list_slug, ', '.join(sublist)))
+                print(err)
+                continue
+            print("{} twitter list {}:\n{}".format(
+                done, list_slug, ', '.join(sublist)))
+            # remember every batch done, so a failed sync can resume
+            if sync:
+                try:
+                    if endpoint.endswith('create_all'):
+                        record_synced(dir_path, db, list_slug, added=sublist)
+                    else:
+                        record_synced(dir_path, db, list_slug,
+                                      removed=sublist)
+                except sqlite3.Error as err:
+                    print("Could not record the synced state of the Twitter "
+                          "list.")
+                    print(err)
+
+    print("{} call(s) to the Twitter API".format(client.calls))
+    if failed:
+        print("{} member(s) could not be updated.".format(failed))
+        if sync:
+            print("Run again with -s to resume the sync.")
+        else:
+            print("Run again with -s to only send the missing updates.")
         sys.exit(1)
 
 